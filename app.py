@@ -1,22 +1,59 @@
 import os
+import re
 import csv
+import gzip
+import hashlib
+import json
+import socket
 import requests
-from flask import Flask, jsonify, request, send_from_directory
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from urllib.parse import unquote, urlsplit
+from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Database imports
 from database import (
-    get_db, search_companies, count_companies, get_company_by_number,
-    add_director, add_email, add_phone, update_enrichment_status,
-    update_company_website, update_company_phone, update_email_verification,
+    DB_PATH, schema_is_current, get_db, search_companies, page_cursor, count_companies, get_company_by_number, find_companies_by_names,
+    add_directors_bulk, save_company_contacts, update_enrichment_status_bulk,
+    update_company_phone, update_email_verifications,
     get_db_stats
 )
 
 load_dotenv()
 
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() backed by orjson - serialises search pages of company dicts in C"""
+    
+    option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS) if orjson else 0
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )
+
+
 app = Flask(__name__, static_folder='static')
+if orjson:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
 HUNTER_API_KEY = os.getenv('HUNTER_API_KEY')
@@ -24,6 +61,73 @@ COMPANIES_HOUSE_API_KEY = os.getenv('COMPANIES_HOUSE_API_KEY')
 CSV_PATH = os.getenv('CSV_PATH', 'BasicCompanyDataAsOneFile-2025-11-01.csv')
 USE_DATABASE = os.getenv('USE_DATABASE', 'true').lower() == 'true'  # Default to database
 
+# Migrations run with `python database.py`, not in the app. An older database would serve
+# searches and then fail every email write, so refuse to start on one
+if USE_DATABASE and os.path.exists(DB_PATH) and not schema_is_current():
+    raise SystemExit("❌ Database schema is out of date - run: python database.py")
+
+# Shared session for the Companies House / Hunter.io APIs - keeps TCP+TLS connections
+# alive between calls, and retries transient gateway errors
+api_session = requests.Session()
+api_session.mount('https://', HTTPAdapter(
+    pool_connections=20, pool_maxsize=100,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+
+# Session for website scraping - the scrapers fetch several pages from the same site
+# back to back, so keep-alive saves a TCP+TLS handshake per page (no retries: best effort)
+scrape_session = requests.Session()
+scrape_session.headers['User-Agent'] = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+scrape_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+scrape_session.mount('https://', scrape_adapter)
+scrape_session.mount('http://', scrape_adapter)  # Sites that redirect down to plain http
+
+# (connect, read) - a guessed domain that resolves but never answers is dropped after 3s
+# instead of holding the thread for the full read timeout
+SCRAPE_TIMEOUT = (3, 5)
+
+# Circuit breaker: after this many consecutive failures (errors, timeouts, 5xx) a host is
+# skipped for CIRCUIT_RESET_TIMEOUT seconds, so an outage fails requests fast instead of
+# tying up every worker thread for the full timeout
+CIRCUIT_FAIL_MAX = 5
+CIRCUIT_RESET_TIMEOUT = 30
+
+_circuit_failures = {}  # host -> consecutive failures
+_circuit_open_until = {}  # host -> time.monotonic() when calls are let through again
+
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of calling an API whose circuit is open"""
+
+
+def _record_api_failure(host):
+    failures = _circuit_failures.get(host, 0) + 1
+    _circuit_failures[host] = failures
+    if failures >= CIRCUIT_FAIL_MAX:
+        # Stays at the limit until a success, so one failed trial call re-opens it
+        _circuit_open_until[host] = time.monotonic() + CIRCUIT_RESET_TIMEOUT
+
+
+def api_get(url, **kwargs):
+    """api_session.get behind a per-host circuit breaker"""
+    host = urlsplit(url).hostname
+    if _circuit_open_until.get(host, 0) > time.monotonic():
+        raise UpstreamUnavailable(f"{host} is failing - skipped for up to {CIRCUIT_RESET_TIMEOUT}s")
+    
+    try:
+        response = api_session.get(url, **kwargs)
+    except requests.RequestException:
+        _record_api_failure(host)
+        raise
+    
+    if response.status_code >= 500:
+        _record_api_failure(host)
+    else:
+        _circuit_failures.pop(host, None)
+    return response
+
 # SIC Code mappings
 SIC_CODES = {
     'accountants': ['69201', '69203'],
@@ -40,18 +144,73 @@ SIC_DESCRIPTIONS = {
     '70229': 'Management consultancy activities'
 }
 
+# Favorites shown first in the SIC filter (separate items, not bundled)
+SIC_FAVORITES = [
+    {'id': 'all_target', 'name': '⭐ All My Target SIC Codes', 'codes': ['82990', '69201', '69203', '82110', '70229']},
+    {'id': '69201', 'name': '⭐ 69201 - Accounting & Auditing', 'codes': ['69201']},
+    {'id': '69203', 'name': '⭐ 69203 - Tax Consultancy', 'codes': ['69203']},
+    {'id': '70229', 'name': '⭐ 70229 - Management Consultancy', 'codes': ['70229']},
+    {'id': '82990', 'name': '⭐ 82990 - Business Support Services', 'codes': ['82990']},
+    {'id': '82110', 'name': '⭐ 82110 - Office Admin Services', 'codes': ['82110']},
+]
+
+
+def load_sic_descriptions():
+    """Load the full SIC code -> description map from sic_codes.json"""
+    try:
+        with open('sic_codes.json', 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading SIC descriptions: {e}")
+        return {}
+
+
+# Static, so parsed once at startup rather than on every /api/sic-codes request
+SIC_CODE_DESCRIPTIONS = load_sic_descriptions()
+
+
+def parse_json(response):
+    """Decode an API response body - with orjson when available, straight from the raw bytes"""
+    if orjson:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# Definite "nothing there" answers from Companies House (no active directors, no name
+# match) are remembered for a while, so retried batches and re-imports skip the API call
+NEGATIVE_CACHE_TTL = 3600
+NEGATIVE_CACHE_MAX = 10000
+
+_negative_cache = {}  # (lookup, key) -> expires_at
+
+
+def known_missing(lookup, key):
+    """True if lookup(key) recently came back empty"""
+    expires_at = _negative_cache.get((lookup, key))
+    return expires_at is not None and expires_at > time.monotonic()
+
+
+def remember_missing(lookup, key):
+    """Record an empty answer for lookup(key) for NEGATIVE_CACHE_TTL seconds"""
+    if len(_negative_cache) >= NEGATIVE_CACHE_MAX:
+        _negative_cache.clear()
+    _negative_cache[(lookup, key)] = time.monotonic() + NEGATIVE_CACHE_TTL
+
 
 def get_officers(company_number):
     """Fetch officers/directors from Companies House API"""
+    if known_missing('officers', company_number):
+        return []
+    
     url = f"https://api.company-information.service.gov.uk/company/{company_number}/officers"
     try:
-        response = requests.get(
+        response = api_get(
             url,
             auth=(COMPANIES_HOUSE_API_KEY, ''),
             timeout=10
         )
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             directors = []
             for officer in data.get('items', []):
                 if officer.get('officer_role') in ['director', 'corporate-director']:
@@ -61,6 +220,8 @@ def get_officers(company_number):
                             'role': officer.get('officer_role', ''),
                             'appointed': officer.get('appointed_on', '')
                         })
+            if not directors:
+                remember_missing('officers', company_number)
             return directors
         elif response.status_code == 429:
             return {'error': 'rate_limited'}
@@ -71,6 +232,28 @@ def get_officers(company_number):
         return []
 
 
+HUNTER_CACHE_TTL = 600  # Seconds a Hunter.io domain search answer is reused
+
+
+@lru_cache(maxsize=10000)
+def _fetch_hunter_domain_search(domain, ttl_bucket):
+    """Cached Hunter.io Domain Search 'data' - ttl_bucket expires it like _fetch_company_profile.
+    Non-200 answers raise, so errors and exhausted credits aren't cached."""
+    response = api_get(
+        "https://api.hunter.io/v2/domain-search",
+        params={'domain': domain, 'api_key': HUNTER_API_KEY},
+        timeout=10
+    )
+    if response.status_code != 200:
+        raise requests.HTTPError(f"Hunter domain search for {domain} returned {response.status_code}")
+    return parse_json(response).get('data', {})
+
+
+def hunter_domain_search(domain):
+    """Hunter.io Domain Search for a domain - the email, phone and domain lookups all share one answer"""
+    return _fetch_hunter_domain_search(domain, int(time.monotonic() // HUNTER_CACHE_TTL))
+
+
 def get_email_from_hunter(domain):
     """Find email addresses using Hunter.io Domain Search"""
     if not domain or not HUNTER_API_KEY:
@@ -79,31 +262,30 @@ def get_email_from_hunter(domain):
     # Clean the domain
     domain = domain.replace('http://', '').replace('https://', '').replace('www.', '').split('/')[0]
     
-    url = f"https://api.hunter.io/v2/domain-search"
     try:
-        response = requests.get(
-            url,
-            params={'domain': domain, 'api_key': HUNTER_API_KEY},
-            timeout=10
-        )
-        if response.status_code == 200:
-            data = response.json()
-            emails = []
-            for email in data.get('data', {}).get('emails', [])[:3]:
-                emails.append({
-                    'email': email.get('value', ''),
-                    'first_name': email.get('first_name', ''),
-                    'last_name': email.get('last_name', ''),
-                    'position': email.get('position', ''),
-                    'confidence': email.get('confidence', 0)
-                })
-            return emails
-        return []
+        data = hunter_domain_search(domain)
+        emails = []
+        for email in data.get('emails', [])[:3]:
+            emails.append({
+                'email': email.get('value', ''),
+                'first_name': email.get('first_name', ''),
+                'last_name': email.get('last_name', ''),
+                'position': email.get('position', ''),
+                'confidence': email.get('confidence', 0)
+            })
+        return emails
     except Exception as e:
         print(f"Error fetching emails for {domain}: {e}")
         return []
 
 
+# Characters dropped from company names to make domain slugs / comparison keys,
+# as str.translate() tables - one C-level pass instead of a chain of replace() calls
+_NAME_PUNCT_DELETE = str.maketrans('', '', ' ,.')
+_NAME_SLUG_DELETE = str.maketrans('', '', ' ,.&\'-')
+_SLUG_DELETE = str.maketrans('', '', ' ,.&\'-()"')
+
+
 def find_email_for_person(first_name, last_name, company_name):
     """Find email for a specific person using Hunter.io Email Finder"""
     if not HUNTER_API_KEY or not first_name or not last_name:
@@ -116,12 +298,12 @@ def find_email_for_person(first_name, last_name, company_name):
     for suffix in [' limited', ' ltd', ' llp', ' plc', ' inc', ' corporation', ' corp', ' & co', ' and co']:
         domain = domain.replace(suffix, '')
     # Clean and format as domain
-    domain = domain.strip().replace(' ', '').replace(',', '').replace('.', '')
+    domain = domain.strip().translate(_NAME_PUNCT_DELETE)
     domain = f"{domain}.co.uk"  # UK companies typically use .co.uk
     
     url = "https://api.hunter.io/v2/email-finder"
     try:
-        response = requests.get(
+        response = api_get(
             url,
             params={
                 'domain': domain,
@@ -132,7 +314,7 @@ def find_email_for_person(first_name, last_name, company_name):
             timeout=10
         )
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             email_data = data.get('data', {})
             if email_data.get('email'):
                 return {
@@ -142,7 +324,7 @@ def find_email_for_person(first_name, last_name, company_name):
                 }
         # Try .com as fallback
         domain_com = domain.replace('.co.uk', '.com')
-        response = requests.get(
+        response = api_get(
             url,
             params={
                 'domain': domain_com,
@@ -153,7 +335,7 @@ def find_email_for_person(first_name, last_name, company_name):
             timeout=10
         )
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             email_data = data.get('data', {})
             if email_data.get('email'):
                 return {
@@ -172,13 +354,11 @@ def search_company_domain(company_name):
     if not HUNTER_API_KEY or not company_name:
         return None
     
-    url = "https://api.hunter.io/v2/domain-search"
-    
     # Try common domain patterns
     clean_name = company_name.lower()
     for suffix in [' limited', ' ltd', ' llp', ' plc', ' inc', ' corporation', ' corp', ' & co', ' and co']:
         clean_name = clean_name.replace(suffix, '')
-    clean_name = clean_name.strip().replace(' ', '').replace(',', '').replace('.', '')
+    clean_name = clean_name.strip().translate(_NAME_PUNCT_DELETE)
     
     domains_to_try = [
         f"{clean_name}.co.uk",
@@ -188,19 +368,13 @@ def search_company_domain(company_name):
     
     for domain in domains_to_try:
         try:
-            response = requests.get(
-                url,
-                params={'domain': domain, 'api_key': HUNTER_API_KEY},
-                timeout=10
-            )
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('data', {}).get('emails'):
-                    return {
-                        'domain': domain,
-                        'emails': data['data']['emails'][:5],
-                        'pattern': data['data'].get('pattern', '')
-                    }
+            data = hunter_domain_search(domain)
+            if data.get('emails'):
+                return {
+                    'domain': domain,
+                    'emails': data['emails'][:5],
+                    'pattern': data.get('pattern', '')
+                }
         except:
             continue
     
@@ -219,13 +393,10 @@ def find_company_domain(company_name):
     clean_name = clean_name.strip()
     
     # Try Hunter.io Domain Search with company name
-    url = "https://api.hunter.io/v2/domain-search"
     try:
         # First, try to find via company name pattern matching
         # Generate potential domains
-        name_slug = clean_name.lower()
-        for char in [' ', ',', '.', '&', "'", '-']:
-            name_slug = name_slug.replace(char, '')
+        name_slug = clean_name.lower().translate(_NAME_SLUG_DELETE)
         
         potential_domains = [
             f"{name_slug}.co.uk",
@@ -237,21 +408,15 @@ def find_company_domain(company_name):
         
         for domain in potential_domains:
             try:
-                response = requests.get(
-                    url,
-                    params={'domain': domain, 'api_key': HUNTER_API_KEY},
-                    timeout=5
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    # Check if domain exists and has data
-                    if data.get('data', {}).get('domain'):
-                        return {
-                            'domain': data['data']['domain'],
-                            'organization': data['data'].get('organization', ''),
-                            'pattern': data['data'].get('pattern', ''),
-                            'emails_count': len(data['data'].get('emails', []))
-                        }
+                data = hunter_domain_search(domain)
+                # Check if domain exists and has data
+                if data.get('domain'):
+                    return {
+                        'domain': data['domain'],
+                        'organization': data.get('organization', ''),
+                        'pattern': data.get('pattern', ''),
+                        'emails_count': len(data.get('emails', []))
+                    }
             except:
                 continue
         
@@ -262,27 +427,38 @@ def find_company_domain(company_name):
         return None
 
 
+PROFILE_CACHE_TTL = 600  # Seconds a company profile is reused
+
+
+@lru_cache(maxsize=10000)
+def _fetch_company_profile(company_number, ttl_bucket):
+    """Cached profile fetch - ttl_bucket moves on every PROFILE_CACHE_TTL seconds, expiring old
+    profiles. Errors raise, so only real answers (a profile, or None for 404) are cached."""
+    url = f"https://api.company-information.service.gov.uk/company/{company_number}"
+    response = api_get(
+        url,
+        auth=(COMPANIES_HOUSE_API_KEY, ''),
+        timeout=10
+    )
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    data = parse_json(response)
+    return {
+        'company_name': data.get('company_name', ''),
+        'company_status': data.get('company_status', ''),
+        'type': data.get('type', ''),
+        'sic_codes': data.get('sic_codes', []),
+        'links': data.get('links', {}),
+        'external_registration_number': data.get('external_registration_number', ''),
+        'registered_office_address': data.get('registered_office_address', {})
+    }
+
+
 def get_company_profile(company_number):
     """Fetch company profile from Companies House API to get any available web links"""
-    url = f"https://api.company-information.service.gov.uk/company/{company_number}"
     try:
-        response = requests.get(
-            url,
-            auth=(COMPANIES_HOUSE_API_KEY, ''),
-            timeout=10
-        )
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                'company_name': data.get('company_name', ''),
-                'company_status': data.get('company_status', ''),
-                'type': data.get('type', ''),
-                'sic_codes': data.get('sic_codes', []),
-                'links': data.get('links', {}),
-                'external_registration_number': data.get('external_registration_number', ''),
-                'registered_office_address': data.get('registered_office_address', {})
-            }
-        return None
+        return _fetch_company_profile(company_number, int(time.monotonic() // PROFILE_CACHE_TTL))
     except Exception as e:
         print(f"Error fetching company profile {company_number}: {e}")
         return None
@@ -292,14 +468,14 @@ def get_company_filing_description(company_number):
     """Check company filings for website mentions - FREE via Companies House"""
     url = f"https://api.company-information.service.gov.uk/company/{company_number}/filing-history"
     try:
-        response = requests.get(
+        response = api_get(
             url,
             auth=(COMPANIES_HOUSE_API_KEY, ''),
             params={'items_per_page': 10},
             timeout=10
         )
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             return data.get('items', [])
         return []
     except Exception as e:
@@ -309,10 +485,31 @@ def get_company_filing_description(company_number):
 
 
 
+# Scraping patterns, compiled once - they run over every page fetched
+_MAILTO_PREFIX_RE = re.compile(r'mailto:', re.IGNORECASE)
+_NBSP_RE = re.compile(r'&nbsp;', re.IGNORECASE)
+_HTML_ENTITY_RE = re.compile(r'&#\d+;')  # HTML entities like &#64;
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_MAILTO_EMAIL_RE = re.compile(r'mailto:([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+_TEL_LINK_RE = re.compile(r'tel:([+\d\s\-\(\)]+)')
+_PHONE_PUNCTUATION_RE = re.compile(r'[\s\-\(\)]')
+
+# UK phone number patterns
+# Matches: 020 1234 5678, 0207 123 4567, +44 20 1234 5678, 01onal 123456, etc.
+_PHONE_RES = [re.compile(pattern) for pattern in (
+    # UK landlines with area code: 020 1234 5678, 0121 123 4567
+    r'0\d{2,4}[\s\-]?\d{3,4}[\s\-]?\d{3,4}',
+    # Mobile: 07xxx xxxxxx
+    r'07\d{3}[\s\-]?\d{3}[\s\-]?\d{3}',
+    # International format: +44 ...
+    r'\+44[\s\-]?\(?\d{1,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}',
+    # With brackets: (020) 1234 5678
+    r'\(\d{2,5}\)[\s\-]?\d{3,4}[\s\-]?\d{3,4}',
+)]
+
+
 def extract_emails_from_text(text):
     """Extract email addresses from text using regex"""
-    import re
-    from urllib.parse import unquote
     if not text:
         return []
     
@@ -320,12 +517,11 @@ def extract_emails_from_text(text):
     text = unquote(text)
     
     # Remove common HTML artifacts that might prefix emails
-    text = re.sub(r'mailto:', ' ', text, flags=re.IGNORECASE)
-    text = re.sub(r'&nbsp;', ' ', text, flags=re.IGNORECASE)
-    text = re.sub(r'&#\d+;', ' ', text)  # HTML entities like &#64;
+    text = _MAILTO_PREFIX_RE.sub(' ', text)
+    text = _NBSP_RE.sub(' ', text)
+    text = _HTML_ENTITY_RE.sub(' ', text)
     
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    emails = list(set(re.findall(email_pattern, text.lower())))
+    emails = list(set(_EMAIL_RE.findall(text.lower())))
     
     # Filter out common false positives and clean emails
     filtered = []
@@ -352,33 +548,19 @@ def extract_emails_from_text(text):
 
 def extract_phones_from_text(text):
     """Extract UK phone numbers from text using regex"""
-    import re
     if not text:
         return []
     
     # Clean the text
-    text = re.sub(r'&nbsp;', ' ', text, flags=re.IGNORECASE)
-    text = re.sub(r'&#\d+;', ' ', text)
-    
-    # UK phone number patterns
-    # Matches: 020 1234 5678, 0207 123 4567, +44 20 1234 5678, 01onal 123456, etc.
-    patterns = [
-        # UK landlines with area code: 020 1234 5678, 0121 123 4567
-        r'0\d{2,4}[\s\-]?\d{3,4}[\s\-]?\d{3,4}',
-        # Mobile: 07xxx xxxxxx
-        r'07\d{3}[\s\-]?\d{3}[\s\-]?\d{3}',
-        # International format: +44 ...
-        r'\+44[\s\-]?\(?\d{1,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}',
-        # With brackets: (020) 1234 5678
-        r'\(\d{2,5}\)[\s\-]?\d{3,4}[\s\-]?\d{3,4}',
-    ]
+    text = _NBSP_RE.sub(' ', text)
+    text = _HTML_ENTITY_RE.sub(' ', text)
     
     phones_found = set()
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
+    for pattern in _PHONE_RES:
+        matches = pattern.findall(text)
         for match in matches:
             # Clean and normalize the number
-            phone = re.sub(r'[\s\-\(\)]', '', match)
+            phone = _PHONE_PUNCTUATION_RE.sub('', match)
             # Validate length (UK numbers are 10-11 digits, or 12-13 with +44)
             if phone.startswith('+44'):
                 if 12 <= len(phone) <= 14:
@@ -406,13 +588,9 @@ def scrape_website_for_emails(domain):
         f"https://www.{domain}/contact",
     ]
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     for url in pages_to_try[:4]:  # Limit to 4 pages to be respectful
         try:
-            response = requests.get(url, headers=headers, timeout=5, allow_redirects=True)
+            response = scrape_session.get(url, timeout=SCRAPE_TIMEOUT, allow_redirects=True)
             if response.status_code == 200:
                 # Extract emails from HTML
                 page_emails = extract_emails_from_text(response.text)
@@ -430,9 +608,7 @@ def scrape_website_for_emails(domain):
                             })
                 
                 # Also check for mailto: links
-                import re
-                mailto_pattern = r'mailto:([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-                mailto_emails = re.findall(mailto_pattern, response.text.lower())
+                mailto_emails = _MAILTO_EMAIL_RE.findall(response.text.lower())
                 for email in mailto_emails:
                     email_domain = email.split('@')[-1]
                     if domain in email_domain or email_domain in domain:
@@ -468,13 +644,9 @@ def scrape_website_for_phones(domain):
         f"https://www.{domain}/contact",
     ]
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     for url in pages_to_try[:3]:  # Limit to 3 pages
         try:
-            response = requests.get(url, headers=headers, timeout=5, allow_redirects=True)
+            response = scrape_session.get(url, timeout=SCRAPE_TIMEOUT, allow_redirects=True)
             if response.status_code == 200:
                 # Extract phones from HTML
                 page_phones = extract_phones_from_text(response.text)
@@ -488,11 +660,9 @@ def scrape_website_for_phones(domain):
                         })
                 
                 # Also check for tel: links (higher confidence)
-                import re
-                tel_pattern = r'tel:([+\d\s\-\(\)]+)'
-                tel_phones = re.findall(tel_pattern, response.text)
+                tel_phones = _TEL_LINK_RE.findall(response.text)
                 for phone_raw in tel_phones:
-                    phone = re.sub(r'[\s\-\(\)]', '', phone_raw)
+                    phone = _PHONE_PUNCTUATION_RE.sub('', phone_raw)
                     if phone and len(phone) >= 10:
                         if phone not in [p['phone'] for p in phones_found]:
                             phones_found.append({
@@ -527,13 +697,9 @@ def scrape_website_for_all(domain):
         f"https://www.{domain}/contact",
     ]
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     for url in pages_to_try[:4]:
         try:
-            response = requests.get(url, headers=headers, timeout=5, allow_redirects=True)
+            response = scrape_session.get(url, timeout=SCRAPE_TIMEOUT, allow_redirects=True)
             if response.status_code == 200:
                 html = response.text
                 
@@ -552,9 +718,7 @@ def scrape_website_for_all(domain):
                             })
                 
                 # Check mailto: links
-                import re
-                mailto_pattern = r'mailto:([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-                mailto_emails = re.findall(mailto_pattern, html.lower())
+                mailto_emails = _MAILTO_EMAIL_RE.findall(html.lower())
                 for email in mailto_emails:
                     email_domain = email.split('@')[-1]
                     if domain in email_domain or email_domain in domain:
@@ -579,10 +743,9 @@ def scrape_website_for_all(domain):
                         })
                 
                 # Check tel: links
-                tel_pattern = r'tel:([+\d\s\-\(\)]+)'
-                tel_phones = re.findall(tel_pattern, html)
+                tel_phones = _TEL_LINK_RE.findall(html)
                 for phone_raw in tel_phones:
-                    phone = re.sub(r'[\s\-\(\)]', '', phone_raw)
+                    phone = _PHONE_PUNCTUATION_RE.sub('', phone_raw)
                     if phone and len(phone) >= 10:
                         if phone not in [p['phone'] for p in phones_found]:
                             phones_found.append({
@@ -614,7 +777,7 @@ def check_email_domain_match(email, company_name):
     clean_name = company_name.lower()
     for suffix in [' limited', ' ltd', ' llp', ' plc', ' inc', ' corp', ' & co', ' and co']:
         clean_name = clean_name.replace(suffix, '')
-    clean_name = clean_name.strip().replace(' ', '').replace(',', '').replace('.', '')
+    clean_name = clean_name.strip().translate(_NAME_PUNCT_DELETE)
     
     # Check for match
     if domain_base in clean_name or clean_name in domain_base:
@@ -651,10 +814,7 @@ def find_free_emails(company_number, company_name, directors=None, company_domai
         # Try to find/verify a domain
         potential_domains = infer_domain_from_company_name(company_name)
         if potential_domains:
-            for domain in potential_domains[:2]:
-                if verify_domain_exists(domain):
-                    verified_domain = domain
-                    break
+            verified_domain = first_existing_domain(potential_domains[:2])
     
     # Step 2: Scrape the website for emails - COMPLETELY FREE
     if verified_domain:
@@ -680,9 +840,7 @@ def infer_domain_from_company_name(company_name):
         clean_name = clean_name.replace(suffix, '')
     
     # Remove special characters and create slug
-    clean_name = clean_name.strip().lower()
-    for char in [' ', ',', '.', '&', "'", '-', '(', ')', '"']:
-        clean_name = clean_name.replace(char, '')
+    clean_name = clean_name.strip().lower().translate(_SLUG_DELETE)
     
     if not clean_name or len(clean_name) < 2:
         return None
@@ -696,29 +854,54 @@ def infer_domain_from_company_name(company_name):
     ]
 
 
-def verify_domain_exists(domain):
-    """Quick check if domain exists using DNS/HTTP - FREE"""
-    import socket
+DNS_CACHE_TTL = 3600  # Seconds a DNS answer is reused
+
+# Candidate domains are resolved side by side instead of one blocking lookup after another
+_dns_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='dns')
+
+
+@lru_cache(maxsize=4096)
+def _domain_resolves(domain, ttl_bucket):
+    """Cached DNS lookup - ttl_bucket moves on every DNS_CACHE_TTL seconds, expiring old answers"""
     try:
-        socket.gethostbyname(domain)
+        socket.getaddrinfo(domain, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
         return True
     except socket.gaierror:
         return False
 
 
+def verify_domain_exists(domain):
+    """Quick check if domain exists using DNS/HTTP - FREE"""
+    return _domain_resolves(domain, int(time.monotonic() // DNS_CACHE_TTL))
+
+
+def first_existing_domain(domains):
+    """First of the domains (in priority order) that resolves - all lookups run concurrently"""
+    futures = [_dns_pool.submit(verify_domain_exists, domain) for domain in domains]
+    for domain, future in zip(domains, futures):
+        if future.result():
+            for pending in futures:
+                pending.cancel()
+            return domain
+    return None
+
+
+# A domain written into the company name itself, e.g. 'EXAMPLE.CO.UK LIMITED'
+_DOMAIN_IN_NAME_RE = re.compile(r'[\w-]+\.(co\.uk|com|uk|org)')
+
+
 def find_domain_free(company_name, company_number):
     """Find company domain using FREE methods only (Companies House + DNS)"""
     
     # Method 1: Infer domain from company name and verify via DNS
     potential_domains = infer_domain_from_company_name(company_name)
-    if potential_domains:
-        for domain in potential_domains:
-            if verify_domain_exists(domain):
-                return {
-                    'domain': domain,
-                    'source': 'inferred',
-                    'verified': True
-                }
+    domain = first_existing_domain(potential_domains) if potential_domains else None
+    if domain:
+        return {
+            'domain': domain,
+            'source': 'inferred',
+            'verified': True
+        }
     
     # Method 2: Check if we can find hints in company profile
     profile = get_company_profile(company_number)
@@ -727,8 +910,7 @@ def find_domain_free(company_name, company_number):
         company_name_lower = profile.get('company_name', '').lower()
         if '.co.uk' in company_name_lower or '.com' in company_name_lower:
             # Extract domain from company name
-            import re
-            domain_match = re.search(r'[\w-]+\.(co\.uk|com|uk|org)', company_name_lower)
+            domain_match = _DOMAIN_IN_NAME_RE.search(company_name_lower)
             if domain_match:
                 domain = domain_match.group(0)
                 if verify_domain_exists(domain):
@@ -831,9 +1013,123 @@ def filter_csv(sic_filter, postcode_filter, limit, year_filter=''):
     return results
 
 
+def _field_checker(spec):
+    """Type check for one field spec, built once per route - a one-item list spec, e.g. [dict],
+    means a list of that type"""
+    if isinstance(spec, list):
+        item_type = spec[0]
+        return lambda value: isinstance(value, list) and all(isinstance(item, item_type) for item in value)
+    return lambda value: isinstance(value, spec)
+
+
+def validate_json(**fields):
+    """
+    Reject a request with a 400 unless its body is a JSON object and each named field,
+    when present, has the given type - so malformed calls fail here, not mid-enrichment
+    """
+    checks = [(name, _field_checker(spec)) for name, spec in fields.items()]
+    
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({'error': 'Request body must be a JSON object'}), 400
+            for name, check in checks:
+                if name in data and not check(data[name]):
+                    return jsonify({'error': f"Invalid '{name}' parameter"}), 400
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# The page's stylesheet and script, served from /assets/ with a ?v= content hash in the URL.
+# A new version is a new URL, so browsers may keep them for a year without revalidating
+STATIC_ASSETS = {'app.css': 'text/css', 'app.js': 'text/javascript'}
+ASSET_MAX_AGE = 31536000
+
+
+# Comments in the stylesheet and page - stripped before serving, along with indentation
+_CSS_COMMENT_RE = re.compile(rb'/\*.*?\*/', re.S)
+_HTML_COMMENT_RE = re.compile(rb'<!--.*?-->', re.S)
+
+
+def _minify(name, body):
+    """Drop comments, indentation and blank lines from CSS/HTML (neither has <pre>, <textarea> or
+    inline scripts, so line-leading whitespace is never significant). JS is served as written."""
+    if name.endswith('.css'):
+        body = _CSS_COMMENT_RE.sub(b'', body)
+    elif name.endswith('.html'):
+        body = _HTML_COMMENT_RE.sub(b'', body)
+    else:
+        return body
+    return b'\n'.join(line.strip() for line in body.splitlines() if line.strip()) + b'\n'
+
+
+@lru_cache(maxsize=16)
+def _load_static(name, mtime):
+    """(body, gzipped body, content hash) for a file in static/, built once per version on disk
+    (minified, and gzip level 9: the cost is paid once, not per request)"""
+    with open(os.path.join(app.static_folder, name), 'rb') as f:
+        body = _minify(name, f.read())
+    return body, gzip.compress(body, compresslevel=9), hashlib.sha1(body).hexdigest()
+
+
+def load_static(name):
+    return _load_static(name, os.path.getmtime(os.path.join(app.static_folder, name)))
+
+
+def asset_version():
+    """Short hash over the stylesheet and script - changes whenever either does"""
+    return hashlib.sha1(''.join(load_static(name)[2] for name in STATIC_ASSETS).encode()).hexdigest()[:12]
+
+
+@lru_cache(maxsize=1)
+def _render_index(index_hash, version):
+    """(body, gzipped body, ETag) for index.html with the asset URLs' version filled in"""
+    body = load_static('index.html')[0].replace(b'__ASSET_VERSION__', version.encode())
+    return body, gzip.compress(body, compresslevel=9), f'{index_hash}-{version}'
+
+
+def static_response(body, gzipped, etag, mimetype, max_age=None):
+    """A cached static body, gzipped if the client accepts it and answered with a 304 when the
+    ETag matches. Without max_age it is no-cache: browsers keep it but revalidate each load."""
+    if 'gzip' in request.accept_encodings:
+        response = app.response_class(gzipped, mimetype=mimetype)
+        response.headers['Content-Encoding'] = 'gzip'
+        etag = f'{etag}-gzip'
+    else:
+        response = app.response_class(body, mimetype=mimetype)
+    response.vary.add('Accept-Encoding')
+    
+    if max_age:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
 @app.route('/')
 def index():
-    return send_from_directory('static', 'index.html')
+    return static_response(*_render_index(load_static('index.html')[2], asset_version()), 'text/html')
+
+
+@app.route('/assets/<name>')
+def static_asset(name):
+    if name not in STATIC_ASSETS:
+        return jsonify({'error': 'Not found'}), 404
+    
+    body, gzipped, content_hash = load_static(name)
+    # Only a URL with the current version is cached for good - a stale ?v= revalidates
+    max_age = ASSET_MAX_AGE if request.args.get('v') == asset_version() else None
+    return static_response(body, gzipped, content_hash, STATIC_ASSETS[name], max_age)
+
+
+_ACSP_SUFFIX_RE = re.compile(r'\s+ACSP\s*$')
+_ACSP_BRACKETED_SUFFIX_RE = re.compile(r'\s+ACSP\s*\)$')
 
 
 def clean_company_name_for_search(name):
@@ -845,9 +1141,8 @@ def clean_company_name_for_search(name):
     name = name.upper().strip()
     
     # Remove ACSP suffix with various spacing patterns
-    import re
-    name = re.sub(r'\s+ACSP\s*$', '', name)
-    name = re.sub(r'\s+ACSP\s*\)$', ')', name)
+    name = _ACSP_SUFFIX_RE.sub('', name)
+    name = _ACSP_BRACKETED_SUFFIX_RE.sub(')', name)
     
     return name.strip()
 
@@ -859,24 +1154,26 @@ def search_companies_house_by_name(company_name):
     
     # Clean the name for search
     search_name = clean_company_name_for_search(company_name)
+    if known_missing('name_search', search_name):
+        return None
     
     url = "https://api.company-information.service.gov.uk/search/companies"
     try:
-        response = requests.get(
+        response = api_get(
             url,
             params={'q': search_name, 'items_per_page': 5},
             auth=(COMPANIES_HOUSE_API_KEY, ''),
             timeout=10
         )
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             items = data.get('items', [])
             
             # Try to find exact or close match
-            search_clean = search_name.upper().replace(' ', '').replace('.', '').replace(',', '')
+            search_clean = search_name.upper().translate(_NAME_PUNCT_DELETE)
             
             for item in items:
-                item_name = item.get('title', '').upper().replace(' ', '').replace('.', '').replace(',', '')
+                item_name = item.get('title', '').upper().translate(_NAME_PUNCT_DELETE)
                 # Check for exact match or very close match
                 if item_name == search_clean or search_clean in item_name or item_name in search_clean:
                     return {
@@ -890,7 +1187,7 @@ def search_companies_house_by_name(company_name):
             # If no exact match, return first result if it looks close enough
             if items and len(items) > 0:
                 first = items[0]
-                first_name = first.get('title', '').upper().replace(' ', '').replace('.', '').replace(',', '')
+                first_name = first.get('title', '').upper().translate(_NAME_PUNCT_DELETE)
                 # Only accept if significant overlap
                 if len(set(search_clean) & set(first_name)) > len(search_clean) * 0.7:
                     return {
@@ -900,13 +1197,54 @@ def search_companies_house_by_name(company_name):
                         'address': first.get('address', {}),
                         'date_of_creation': first.get('date_of_creation', '')
                     }
+            remember_missing('name_search', search_name)
         return None
     except Exception as e:
         print(f"Error searching Companies House for {company_name}: {e}")
         return None
 
 
+def add_imported_contacts(result, imported_data):
+    """Carry an imported row's email / website over to its matched result"""
+    if imported_data.get('import_email'):
+        result['emails'] = [{
+            'email': imported_data['import_email'],
+            'source': 'imported',
+            'source_label': 'Imported',
+            'match_type': 'unknown',
+            'confidence': 100
+        }]
+    
+    if imported_data.get('import_website'):
+        domain = imported_data['import_website']
+        # Clean the domain
+        domain = domain.replace('https://', '').replace('http://', '').replace('www.', '').split('/')[0]
+        result['domain'] = domain
+        result['domain_source'] = 'imported'
+
+
+def db_match_result(company):
+    """import-match result for a company matched in the database"""
+    return {
+        'company_name': company['company_name'],
+        'company_number': company['company_number'],
+        'address_line1': company['address_line1'] or '',
+        'address_line2': company['address_line2'] or '',
+        'town': company['post_town'] or '',
+        'county': company['county'] or '',
+        'postcode': company['postcode'] or '',
+        'status': company['company_status'] or '',
+        'sic_code': company['sic_code'] or '',
+        'sic_description': SIC_DESCRIPTIONS.get(company['sic_code'] or '', ''),
+        'incorporation_date': company['incorporation_date'] or '',
+        'directors': [],
+        'emails': [],
+        'domain': ''
+    }
+
+
 @app.route('/api/import-match', methods=['POST'])
+@validate_json(companies=[dict])
 def import_match():
     """Match imported company names against Companies House data"""
     data = request.json
@@ -929,78 +1267,79 @@ def import_match():
     matched = 0
     not_found_list = []
     
-    try:
-        with open(CSV_PATH, 'r', encoding='utf-8', errors='ignore') as f:
-            reader = csv.DictReader(f)
-            
-            for row in reader:
-                if not names_to_find:
-                    break  # Found all companies
-                
-                company_name = row.get('CompanyName', '').strip().strip('"').upper()
+    # Names already in the database are matched on the upper(company_name) index, so the
+    # full CSV scan below only runs for whatever is left
+    if USE_DATABASE and names_to_find:
+        try:
+            db_matches = find_companies_by_names(list(names_to_find))
+        except Exception as e:
+            print(f"Database error, matching names against CSV: {e}")
+            db_matches = {}
+        for name, company in db_matches.items():
+            imported_data = names_to_find.pop(name)
+            original_names.pop(name, None)
+            result = db_match_result(company)
+            add_imported_contacts(result, imported_data)
+            results.append(result)
+            matched += 1
+    
+    if names_to_find:  # Anything left to look for in the CSV
+        try:
+            with open(CSV_PATH, 'r', encoding='utf-8', errors='ignore') as f:
+                reader = csv.DictReader(f)
                 
-                # Try to match against clean names
-                if company_name in names_to_find:
-                    imported_data = names_to_find.pop(company_name)
-                    if company_name in original_names:
-                        del original_names[company_name]
-                    
-                    # Check if active
-                    status = row.get('CompanyStatus', '').strip().strip('"')
-                    
-                    company_number = row.get(' CompanyNumber', row.get('CompanyNumber', '')).strip().strip('"')
-                    
-                    # Build result with imported data
-                    result = {
-                        'company_name': row.get('CompanyName', '').strip().strip('"'),
-                        'company_number': company_number,
-                        'address_line1': row.get('RegAddress.AddressLine1', row.get(' RegAddress.AddressLine1', '')).strip().strip('"'),
-                        'address_line2': row.get(' RegAddress.AddressLine2', row.get('RegAddress.AddressLine2', '')).strip().strip('"'),
-                        'town': row.get('RegAddress.PostTown', '').strip().strip('"'),
-                        'county': row.get('RegAddress.County', '').strip().strip('"'),
-                        'postcode': row.get('RegAddress.PostCode', '').strip().strip('"'),
-                        'status': status,
-                        'sic_code': '',
-                        'sic_description': '',
-                        'incorporation_date': row.get('IncorporationDate', '').strip().strip('"'),
-                        'directors': [],
-                        'emails': [],
-                        'domain': ''
-                    }
-                    
-                    # Get SIC code
-                    for i in range(1, 5):
-                        sic_col = f'SICCode.SicText_{i}'
-                        if sic_col in row and row[sic_col]:
-                            sic_value = row[sic_col].strip().strip('"')
-                            if sic_value:
-                                result['sic_code'] = sic_value.split(' - ')[0] if ' - ' in sic_value else sic_value
-                                result['sic_description'] = SIC_DESCRIPTIONS.get(result['sic_code'], '')
-                                break
+                for row in reader:
+                    if not names_to_find:
+                        break  # Found all companies
                     
-                    # Add imported email if provided
-                    if imported_data.get('import_email'):
-                        result['emails'] = [{
-                            'email': imported_data['import_email'],
-                            'source': 'imported',
-                            'source_label': 'Imported',
-                            'match_type': 'unknown',
-                            'confidence': 100
-                        }]
+                    company_name = row.get('CompanyName', '').strip().strip('"').upper()
                     
-                    # Add imported website if provided
-                    if imported_data.get('import_website'):
-                        domain = imported_data['import_website']
-                        # Clean the domain
-                        domain = domain.replace('https://', '').replace('http://', '').replace('www.', '').split('/')[0]
-                        result['domain'] = domain
-                        result['domain_source'] = 'imported'
-                    
-                    results.append(result)
-                    matched += 1
-    
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+                    # Try to match against clean names
+                    if company_name in names_to_find:
+                        imported_data = names_to_find.pop(company_name)
+                        if company_name in original_names:
+                            del original_names[company_name]
+                        
+                        # Check if active
+                        status = row.get('CompanyStatus', '').strip().strip('"')
+                        
+                        company_number = row.get(' CompanyNumber', row.get('CompanyNumber', '')).strip().strip('"')
+                        
+                        # Build result with imported data
+                        result = {
+                            'company_name': row.get('CompanyName', '').strip().strip('"'),
+                            'company_number': company_number,
+                            'address_line1': row.get('RegAddress.AddressLine1', row.get(' RegAddress.AddressLine1', '')).strip().strip('"'),
+                            'address_line2': row.get(' RegAddress.AddressLine2', row.get('RegAddress.AddressLine2', '')).strip().strip('"'),
+                            'town': row.get('RegAddress.PostTown', '').strip().strip('"'),
+                            'county': row.get('RegAddress.County', '').strip().strip('"'),
+                            'postcode': row.get('RegAddress.PostCode', '').strip().strip('"'),
+                            'status': status,
+                            'sic_code': '',
+                            'sic_description': '',
+                            'incorporation_date': row.get('IncorporationDate', '').strip().strip('"'),
+                            'directors': [],
+                            'emails': [],
+                            'domain': ''
+                        }
+                        
+                        # Get SIC code
+                        for i in range(1, 5):
+                            sic_col = f'SICCode.SicText_{i}'
+                            if sic_col in row and row[sic_col]:
+                                sic_value = row[sic_col].strip().strip('"')
+                                if sic_value:
+                                    result['sic_code'] = sic_value.split(' - ')[0] if ' - ' in sic_value else sic_value
+                                    result['sic_description'] = SIC_DESCRIPTIONS.get(result['sic_code'], '')
+                                    break
+                        
+                        add_imported_contacts(result, imported_data)
+                        
+                        results.append(result)
+                        matched += 1
+        
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
     
     # For companies not found in CSV, try Companies House API search
     api_found = 0
@@ -1030,20 +1369,7 @@ def import_match():
                 'domain': ''
             }
             
-            if imported_data.get('import_email'):
-                result['emails'] = [{
-                    'email': imported_data['import_email'],
-                    'source': 'imported',
-                    'source_label': 'Imported',
-                    'match_type': 'unknown',
-                    'confidence': 100
-                }]
-            
-            if imported_data.get('import_website'):
-                domain = imported_data['import_website']
-                domain = domain.replace('https://', '').replace('http://', '').replace('www.', '').split('/')[0]
-                result['domain'] = domain
-                result['domain_source'] = 'imported'
+            add_imported_contacts(result, imported_data)
             
             results.append(result)
             matched += 1
@@ -1072,20 +1398,7 @@ def import_match():
             'domain': ''
         }
         
-        if imported_data.get('import_email'):
-            result['emails'] = [{
-                'email': imported_data['import_email'],
-                'source': 'imported',
-                'source_label': 'Imported',
-                'match_type': 'unknown',
-                'confidence': 100
-            }]
-        
-        if imported_data.get('import_website'):
-            domain = imported_data['import_website']
-            domain = domain.replace('https://', '').replace('http://', '').replace('www.', '').split('/')[0]
-            result['domain'] = domain
-            result['domain_source'] = 'imported'
+        add_imported_contacts(result, imported_data)
         
         results.append(result)
     
@@ -1099,7 +1412,56 @@ def import_match():
     })
 
 
+def filter_payload(sic_codes, postcode_prefix, year_filter, enrichment_filter,
+                   include_enriched, limit, after):
+    """/api/filter response body for a database search"""
+    results = search_companies(
+        sic_codes=list(sic_codes),
+        postcode_prefix=postcode_prefix,
+        year_filter=year_filter,
+        status_filter='Active',
+        enrichment_filter=enrichment_filter,
+        include_enriched=include_enriched,
+        limit=limit,
+        after=after
+    )
+    
+    # Transform to match frontend expected format. Every key is present in a search row
+    # (SEARCH_COLUMNS + the child lists), so plain indexing replaces .get() with defaults
+    formatted = [
+        {
+            'company_name': company['company_name'],
+            'company_number': company['company_number'],
+            'address_line1': company['address_line1'],
+            'address_line2': company['address_line2'],
+            'town': company['post_town'],
+            'county': company['county'],
+            'postcode': company['postcode'],
+            'status': company['company_status'],
+            'sic_code': company['sic_code_1'],
+            'sic_description': SIC_DESCRIPTIONS.get(company['sic_code_1'], ''),
+            'incorporation_date': company['incorporation_date'],
+            'domain': company['website'],
+            'domain_source': company['website_source'],
+            'directors': company['directors'],
+            'emails': company['emails'],
+            'phones': company['phones'],
+            'enrichment_status': company['enrichment_status']
+        }
+        for company in results
+    ]
+    
+    return {
+        'count': len(formatted),
+        'companies': formatted,
+        'next_cursor': page_cursor(results[-1]) if len(results) == limit else None,
+        'source': 'database'
+    }
+
+
 @app.route('/api/filter', methods=['POST'])
+@validate_json(sic=str, postcode=str, year=str, enrichment=str,
+               include_enriched=bool, limit=int, after=(list, type(None)))
 def filter_companies():
     """Filter companies based on criteria - uses database or CSV"""
     data = request.json
@@ -1108,7 +1470,13 @@ def filter_companies():
     year_filter = data.get('year', '')
     enrichment_filter = data.get('enrichment', 'not_attempted')  # New: enrichment status filter
     include_enriched = data.get('include_enriched', False)  # Override for retry mode
-    limit = min(int(data.get('limit', 100)), 5000)  # Max 5000 at a time
+    limit = max(1, min(data.get('limit', 100), 5000))  # 1 to 5000 at a time (SQL LIMIT -1 means no limit)
+    after = data.get('after')  # Keyset cursor from a previous response's next_cursor
+    
+    # A next_cursor is exactly [enrichment_status, company_name, id] - anything else would
+    # fail inside the search and silently fall back to scanning the CSV
+    if after is not None and tuple(map(type, after)) != (str, str, int):
+        return jsonify({'error': "Invalid 'after' parameter"}), 400
     
     if USE_DATABASE:
         # Use database for much faster queries
@@ -1126,44 +1494,12 @@ def filter_companies():
             elif enrichment_filter == 'all':
                 include_enriched = True
             
-            results = search_companies(
-                sic_codes=sic_codes,
-                postcode_prefix=postcode_filter if postcode_filter else None,
-                year_filter=year_filter if year_filter else None,
-                status_filter='Active',
-                enrichment_filter=enrichment_filter,
-                include_enriched=include_enriched,
-                limit=limit
-            )
-            
-            # Transform to match frontend expected format
-            formatted = []
-            for company in results:
-                formatted.append({
-                    'company_name': company.get('company_name', ''),
-                    'company_number': company.get('company_number', ''),
-                    'address_line1': company.get('address_line1', ''),
-                    'address_line2': company.get('address_line2', ''),
-                    'town': company.get('post_town', ''),
-                    'county': company.get('county', ''),
-                    'postcode': company.get('postcode', ''),
-                    'status': company.get('company_status', ''),
-                    'sic_code': company.get('sic_code_1', ''),
-                    'sic_description': SIC_DESCRIPTIONS.get(company.get('sic_code_1', ''), ''),
-                    'incorporation_date': company.get('incorporation_date', ''),
-                    'domain': company.get('website', ''),
-                    'domain_source': company.get('website_source', ''),
-                    'directors': company.get('directors', []),
-                    'emails': company.get('emails', []),
-                    'phones': company.get('phones', []),
-                    'enrichment_status': company.get('enrichment_status', 'not_attempted')
-                })
-            
-            return jsonify({
-                'count': len(formatted),
-                'companies': formatted,
-                'source': 'database'
-            })
+            # Always read fresh: import_csv / update_from_csv / import_enriched write from outside
+            # the app, so a cached page could offer already-enriched companies again
+            return jsonify(filter_payload(
+                sic_codes, postcode_filter or None, year_filter or None,
+                enrichment_filter, include_enriched, limit, after
+            ))
             
         except Exception as e:
             print(f"Database error, falling back to CSV: {e}")
@@ -1182,48 +1518,65 @@ def filter_companies():
     })
 
 
+OFFICERS_CALL_INTERVAL = 0.5  # Seconds between officer lookups started by /api/enrich
+
+_api_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='api')
+
+
+def fetch_officers(company_number):
+    """get_officers with one retry after a pause when Companies House rate limits us"""
+    directors = get_officers(company_number)
+    if isinstance(directors, dict) and directors.get('error') == 'rate_limited':
+        time.sleep(1)  # Wait if rate limited
+        directors = get_officers(company_number)
+    return directors
+
+
 @app.route('/api/enrich', methods=['POST'])
+@validate_json(company_numbers=[str])
 def enrich_companies():
     """Enrich selected companies with director information"""
     data = request.json
     company_numbers = data.get('company_numbers', [])
     
-    enriched = []
+    # Calls are started OFFICERS_CALL_INTERVAL apart and run side by side, so each one's
+    # latency overlaps the pacing instead of adding to it (answers cached as missing skip the wait)
+    futures = []
     for company_number in company_numbers[:50]:  # Limit to 50 per request
-        directors = get_officers(company_number)
-        
-        if isinstance(directors, dict) and directors.get('error') == 'rate_limited':
-            time.sleep(1)  # Wait if rate limited
-            directors = get_officers(company_number)
-        
+        if futures and not known_missing('officers', company_number):
+            time.sleep(OFFICERS_CALL_INTERVAL)  # Rate limiting - Companies House allows 600/5min
+        futures.append((company_number, _api_pool.submit(fetch_officers, company_number)))
+    
+    enriched = []
+    directors_to_save = {}
+    for company_number, future in futures:
+        directors = future.result()
         director_list = directors if isinstance(directors, list) else []
         
-        # Save to database if enabled
+        # Saved to the database after the loop
         if USE_DATABASE and director_list:
-            try:
-                with get_db() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute('SELECT id FROM companies WHERE company_number = ?', (company_number,))
-                    row = cursor.fetchone()
-                    if row:
-                        company_id = row['id']
-                        for director in director_list:
-                            add_director(company_id, company_number, director)
-                        update_enrichment_status(company_number, 'success', 'fetch_directors')
-            except Exception as e:
-                print(f"Error saving directors for {company_number}: {e}")
+            directors_to_save[company_number] = director_list
         
         enriched.append({
             'company_number': company_number,
             'directors': director_list
         })
-        
-        time.sleep(0.5)  # Rate limiting - Companies House allows 600/5min
+    
+    # One lookup and one transaction for every company's directors, then one for the statuses
+    if directors_to_save:
+        try:
+            saved = add_directors_bulk(directors_to_save)
+            update_enrichment_status_bulk([
+                (company_number, 'success', 'fetch_directors') for company_number in saved
+            ])
+        except Exception as e:
+            print(f"Error saving directors: {e}")
     
     return jsonify({'enriched': enriched})
 
 
 @app.route('/api/enrich-domains', methods=['POST'])
+@validate_json(companies=[dict], use_hunter=bool)
 def enrich_domains():
     """Enrich companies with website domains - FREE methods first, Hunter.io as fallback"""
     data = request.json
@@ -1287,7 +1640,29 @@ def enrich_domains():
     })
 
 
+SCRAPE_CALL_INTERVAL = 0.3  # Seconds between company website scrapes started by /api/enrich-emails-free
+
+_scrape_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='scrape')
+
+
+def scrape_company_contacts(company):
+    """(domain, emails, phones) scraped from a company's website - its known domain, else the first inferred one that resolves"""
+    company_domain = company.get('domain', '')
+    domain = company_domain
+    if not domain:
+        potential_domains = infer_domain_from_company_name(company.get('company_name', ''))
+        domain = first_existing_domain(potential_domains[:2]) if potential_domains else None
+    if not domain:
+        return company_domain, [], []
+    
+    scraped = scrape_website_for_all(domain)
+    for email in scraped['emails']:
+        email['match_type'] = 'company'
+    return domain, scraped['emails'], scraped['phones']
+
+
 @app.route('/api/enrich-emails-free', methods=['POST'])
+@validate_json(companies=[dict])
 def enrich_emails_free():
     """Enrich companies with emails AND phones using FREE methods (Website scraping)"""
     data = request.json
@@ -1299,63 +1674,30 @@ def enrich_emails_free():
     scraped_count = 0
     website_count = 0
     ch_count = 0
+    status_updates = []
     
+    # Each company's site is scraped on the pool - scrapes start SCRAPE_CALL_INTERVAL apart
+    # (pages within one site are still fetched one after another) and are collected in order
+    futures = []
     for company in companies[:50]:  # Limit due to website scraping time
-        company_name = company.get('company_name', '')
+        if futures:
+            time.sleep(SCRAPE_CALL_INTERVAL)  # Be respectful when scraping
+        futures.append((company, _scrape_pool.submit(scrape_company_contacts, company)))
+    
+    for company, future in futures:
         company_number = company.get('company_number', '')
-        directors = company.get('directors', [])
         company_domain = company.get('domain', '')  # Use existing domain if we have it
-        
-        company_emails = []
-        company_phones = []
-        found_domain = company_domain
-        
-        # If we have a domain, scrape for both emails AND phones in one pass
-        if company_domain:
-            scraped = scrape_website_for_all(company_domain)
-            for email in scraped['emails']:
-                email['match_type'] = 'company'
-                company_emails.append(email)
-            company_phones = scraped['phones']
-        else:
-            # Try to find/verify a domain first
-            potential_domains = infer_domain_from_company_name(company_name)
-            if potential_domains:
-                for domain in potential_domains[:2]:
-                    if verify_domain_exists(domain):
-                        found_domain = domain
-                        scraped = scrape_website_for_all(domain)
-                        for email in scraped['emails']:
-                            email['match_type'] = 'company'
-                            company_emails.append(email)
-                        company_phones = scraped['phones']
-                        break
+        found_domain, company_emails, company_phones = future.result()
         
         # Save to database if enabled
         if USE_DATABASE and company_number:
             try:
-                with get_db() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute('SELECT id FROM companies WHERE company_number = ?', (company_number,))
-                    row = cursor.fetchone()
-                    if row:
-                        company_id = row['id']
-                        
-                        # Save website if found
-                        if found_domain and not company_domain:
-                            update_company_website(company_number, found_domain, 'inferred')
-                        
-                        # Save emails
-                        for email_data in company_emails:
-                            add_email(company_id, company_number, email_data)
-                        
-                        # Save phones
-                        for phone_data in company_phones:
-                            add_phone(company_id, company_number, phone_data)
-                        
-                        # Update status
-                        status = 'success' if (company_emails or company_phones) else 'failed'
-                        update_enrichment_status(company_number, status, 'scrape_emails')
+                # Website, emails and phones go in one transaction
+                website = found_domain if found_domain and not company_domain else None
+                if save_company_contacts(company_number, company_emails, company_phones,
+                                         website=website, website_source='inferred'):
+                    status = 'success' if (company_emails or company_phones) else 'failed'
+                    status_updates.append((company_number, status, 'scrape_emails'))
             except Exception as e:
                 print(f"Error saving enrichment for {company_number}: {e}")
         
@@ -1372,8 +1714,12 @@ def enrich_emails_free():
             'emails': company_emails,
             'phones': company_phones
         })
-        
-        time.sleep(0.3)  # Be respectful when scraping
+    
+    if status_updates:
+        try:
+            update_enrichment_status_bulk(status_updates)
+        except Exception as e:
+            print(f"Error updating enrichment status: {e}")
     
     return jsonify({
         'enriched': enriched,
@@ -1386,6 +1732,7 @@ def enrich_emails_free():
 
 
 @app.route('/api/enrich-phones', methods=['POST'])
+@validate_json(companies=[dict], use_hunter=bool)
 def enrich_phones():
     """Enrich companies with phone numbers - Free first, Hunter fallback"""
     data = request.json
@@ -1433,7 +1780,8 @@ def enrich_phones():
             'phones': company_phones
         })
         
-        time.sleep(0.3)
+        if company_domain:  # No domain means nothing was fetched - no need to pace
+            time.sleep(0.3)
     
     return jsonify({
         'enriched': enriched,
@@ -1451,30 +1799,51 @@ def get_phone_from_hunter(domain):
     # Clean the domain
     domain = domain.replace('http://', '').replace('https://', '').replace('www.', '').split('/')[0]
     
-    url = "https://api.hunter.io/v2/domain-search"
     try:
-        response = requests.get(
-            url,
-            params={'domain': domain, 'api_key': HUNTER_API_KEY},
-            timeout=10
-        )
-        if response.status_code == 200:
-            data = response.json().get('data', {})
-            # Hunter sometimes includes phone in domain search results
-            phone = data.get('phone')
-            if phone:
-                return {
-                    'phone': phone,
-                    'phone_type': 'main',
-                    'source': 'hunter'
-                }
+        data = hunter_domain_search(domain)
+        # Hunter sometimes includes phone in domain search results
+        phone = data.get('phone')
+        if phone:
+            return {
+                'phone': phone,
+                'phone_type': 'main',
+                'source': 'hunter'
+            }
     except Exception as e:
         print(f"Error getting phone from Hunter for {domain}: {e}")
     
     return None
 
 
+# Generic email prefixes - these are inboxes, not personal emails
+# (a tuple, so str.startswith checks them all in one call)
+GENERIC_EMAIL_PREFIXES = (
+    'info@', 'office@', 'contact@', 'hello@', 'enquiries@', 'enquiry@',
+    'admin@', 'accounts@', 'finance@', 'sales@', 'support@', 'help@',
+    'mail@', 'email@', 'general@', 'reception@', 'team@', 'company@',
+    'billing@', 'invoices@', 'hr@', 'jobs@', 'careers@', 'press@',
+    'media@', 'marketing@', 'service@', 'services@', 'customerservice@'
+)
+
+
+def is_personal_email(email):
+    """Check if email looks like a personal email (firstname.lastname pattern)"""
+    email_lower = email.lower()
+    # Check if it's a generic prefix
+    if email_lower.startswith(GENERIC_EMAIL_PREFIXES):
+        return False
+    # Check if it contains a dot before @ (likely firstname.lastname)
+    local_part = email_lower.split('@')[0]
+    if '.' in local_part and len(local_part) > 3:
+        return True
+    # Check if local part is a single name (could be firstname@)
+    if local_part.isalpha() and len(local_part) > 2:
+        return True
+    return False
+
+
 @app.route('/api/enrich-emails', methods=['POST'])
+@validate_json(companies=[dict])
 def enrich_emails():
     """Enrich companies with email addresses using Hunter.io - ONLY for companies with inferred emails or no emails"""
     data = request.json
@@ -1490,31 +1859,6 @@ def enrich_emails():
         company_domain = company.get('domain', '')
         existing_emails = company.get('emails', [])
         
-        # Generic email prefixes - these are inboxes, not personal emails
-        GENERIC_PREFIXES = [
-            'info@', 'office@', 'contact@', 'hello@', 'enquiries@', 'enquiry@',
-            'admin@', 'accounts@', 'finance@', 'sales@', 'support@', 'help@',
-            'mail@', 'email@', 'general@', 'reception@', 'team@', 'company@',
-            'billing@', 'invoices@', 'hr@', 'jobs@', 'careers@', 'press@',
-            'media@', 'marketing@', 'service@', 'services@', 'customerservice@'
-        ]
-        
-        def is_personal_email(email):
-            """Check if email looks like a personal email (firstname.lastname pattern)"""
-            email_lower = email.lower()
-            # Check if it's a generic prefix
-            for prefix in GENERIC_PREFIXES:
-                if email_lower.startswith(prefix):
-                    return False
-            # Check if it contains a dot before @ (likely firstname.lastname)
-            local_part = email_lower.split('@')[0]
-            if '.' in local_part and len(local_part) > 3:
-                return True
-            # Check if local part is a single name (could be firstname@)
-            if local_part.isalpha() and len(local_part) > 2:
-                return True
-            return False
-        
         # Only skip if we have PERSONAL emails (not generic ones)
         has_personal_emails = any(
             is_personal_email(e.get('email', ''))
@@ -1538,24 +1882,17 @@ def enrich_emails():
         # If we have a domain, use it directly for domain search
         if company_domain:
             try:
-                response = requests.get(
-                    "https://api.hunter.io/v2/domain-search",
-                    params={'domain': company_domain, 'api_key': HUNTER_API_KEY},
-                    timeout=10
-                )
-                if response.status_code == 200:
-                    data_resp = response.json()
-                    for email_data in data_resp.get('data', {}).get('emails', [])[:3]:
-                        company_emails.append({
-                            'email': email_data.get('value', ''),
-                            'first_name': email_data.get('first_name', ''),
-                            'last_name': email_data.get('last_name', ''),
-                            'position': email_data.get('position', ''),
-                            'confidence': email_data.get('confidence', 0),
-                            'source': 'domain_search',
-                            'source_label': 'Hunter',
-                            'match_type': 'company'
-                        })
+                for email_data in hunter_domain_search(company_domain).get('emails', [])[:3]:
+                    company_emails.append({
+                        'email': email_data.get('value', ''),
+                        'first_name': email_data.get('first_name', ''),
+                        'last_name': email_data.get('last_name', ''),
+                        'position': email_data.get('position', ''),
+                        'confidence': email_data.get('confidence', 0),
+                        'source': 'domain_search',
+                        'source_label': 'Hunter',
+                        'match_type': 'company'
+                    })
             except:
                 pass
         
@@ -1620,6 +1957,7 @@ def enrich_emails():
 
 
 @app.route('/api/export', methods=['POST'])
+@validate_json(companies=[dict], filename=str)
 def export_csv():
     """Export enriched data to CSV - excludes invalid emails, includes phones"""
     data = request.json
@@ -1722,6 +2060,7 @@ def export_csv():
 
 
 @app.route('/api/export-clean', methods=['POST'])
+@validate_json(companies=[dict], filename=str)
 def export_clean_csv():
     """Export clean CSV - one row per email, CRM-ready format with phone"""
     data = request.json
@@ -1830,60 +2169,83 @@ def export_clean_csv():
     })
 
 
+# Read-mostly summaries (SIC counts, DB stats) are reused for this long; any POST clears them
+SUMMARY_CACHE_TTL = 300
+SUMMARY_CACHE_MAX = 256  # Entries kept before the cache is cleared
+
+_summary_cache = {}  # key -> (expires_at, value)
+
+
+def _ttl_cached(key, build):
+    """Return build() memoised under key for SUMMARY_CACHE_TTL seconds (errors are not cached)"""
+    now = time.monotonic()
+    hit = _summary_cache.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+    value = build()
+    if len(_summary_cache) >= SUMMARY_CACHE_MAX:
+        _summary_cache.clear()
+    _summary_cache[key] = (now + SUMMARY_CACHE_TTL, value)
+    return value
+
+
+@app.after_request
+def drop_cached_summaries(response):
+    """Enrichment, import and verification endpoints are all POSTs - their writes invalidate the summaries
+    (/api/filter is a read-only POST, so it leaves them alone)"""
+    if request.method == 'POST' and request.endpoint != 'filter_companies':
+        _summary_cache.clear()
+    return response
+
+
+ACTIVE_SIC_COUNTS_SQL = '''
+    SELECT DISTINCT sic_code_1 as sic, COUNT(*) as count 
+    FROM companies 
+    WHERE sic_code_1 IS NOT NULL AND sic_code_1 != ''
+    AND company_status = 'Active'
+    GROUP BY sic_code_1
+    ORDER BY sic_code_1
+'''
+
+
+def get_active_sic_counts():
+    """(sic_code, count) for every primary SIC code among active companies"""
+    with get_db(persistent=True) as conn:
+        return [tuple(row) for row in conn.execute(ACTIVE_SIC_COUNTS_SQL)]
+
+
+def sic_codes_payload(sic_counts):
+    """/api/sic-codes response body - favorites + all SIC codes in use with descriptions"""
+    all_sics = [
+        {'code': code, 'count': count, 'description': SIC_CODE_DESCRIPTIONS.get(code, 'Unknown')}
+        for code, count in sic_counts
+    ]
+    return {
+        'favorites': SIC_FAVORITES,
+        'all_sics': all_sics,
+        'total_sic_codes': len(all_sics),
+        'descriptions': SIC_CODE_DESCRIPTIONS
+    }
+
+
+def render_sic_codes():
+    """Serialise (and gzip) the /api/sic-codes body once - it is ~100KB, mostly static descriptions.
+    The ETag is a hash of the body, so it only changes when the counts do."""
+    body = app.json.dumps(sic_codes_payload(get_active_sic_counts() if USE_DATABASE else [])).encode()
+    return body, gzip.compress(body, compresslevel=6), hashlib.sha1(body).hexdigest()
+
+
 @app.route('/api/sic-codes', methods=['GET'])
 def get_sic_codes():
     """Return available SIC code filters - favorites + all from database with descriptions"""
-    import json
-    
-    # Load SIC descriptions from JSON file
-    sic_descriptions = {}
     try:
-        with open('sic_codes.json', 'r') as f:
-            sic_descriptions = json.load(f)
+        body, gzipped, etag = _ttl_cached('sic_codes', render_sic_codes)
     except Exception as e:
-        print(f"Error loading SIC descriptions: {e}")
-    
-    # Get all unique SIC codes from database with counts
-    all_sics = []
-    if USE_DATABASE:
-        try:
-            with get_db() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT DISTINCT sic_code_1 as sic, COUNT(*) as count 
-                    FROM companies 
-                    WHERE sic_code_1 IS NOT NULL AND sic_code_1 != ''
-                    AND company_status = 'Active'
-                    GROUP BY sic_code_1
-                    ORDER BY sic_code_1
-                ''')
-                for row in cursor.fetchall():
-                    code = row['sic']
-                    desc = sic_descriptions.get(code, 'Unknown')
-                    all_sics.append({
-                        'code': code, 
-                        'count': row['count'],
-                        'description': desc
-                    })
-        except Exception as e:
-            print(f"Error fetching SIC codes: {e}")
-    
-    # Favorites as separate items (not bundled)
-    favorites = [
-        {'id': 'all_target', 'name': '⭐ All My Target SIC Codes', 'codes': ['82990', '69201', '69203', '82110', '70229']},
-        {'id': '69201', 'name': '⭐ 69201 - Accounting & Auditing', 'codes': ['69201']},
-        {'id': '69203', 'name': '⭐ 69203 - Tax Consultancy', 'codes': ['69203']},
-        {'id': '70229', 'name': '⭐ 70229 - Management Consultancy', 'codes': ['70229']},
-        {'id': '82990', 'name': '⭐ 82990 - Business Support Services', 'codes': ['82990']},
-        {'id': '82110', 'name': '⭐ 82110 - Office Admin Services', 'codes': ['82110']},
-    ]
+        print(f"Error fetching SIC codes: {e}")
+        return jsonify(sic_codes_payload([]))
     
-    return jsonify({
-        'favorites': favorites,
-        'all_sics': all_sics,
-        'total_sic_codes': len(all_sics),
-        'descriptions': sic_descriptions
-    })
+    # Page reloads revalidate, and get a 304 with no body while the counts are unchanged
+    return static_response(body, gzipped, etag, 'application/json')
 
 
 @app.route('/api/stats', methods=['GET'])
@@ -1891,7 +2253,7 @@ def get_stats():
     """Return database statistics"""
     if USE_DATABASE:
         try:
-            stats = get_db_stats()
+            stats = _ttl_cached('db_stats', get_db_stats)
             return jsonify({
                 'source': 'database',
                 'stats': stats
@@ -1912,13 +2274,13 @@ def verify_email_hunter(email):
     
     url = "https://api.hunter.io/v2/email-verifier"
     try:
-        response = requests.get(
+        response = api_get(
             url,
             params={'email': email, 'api_key': HUNTER_API_KEY},
             timeout=15
         )
         if response.status_code == 200:
-            data = response.json().get('data', {})
+            data = parse_json(response).get('data', {})
             return {
                 'email': email,
                 'status': data.get('status', 'unknown'),  # valid, invalid, accept_all, webmail, disposable, unknown
@@ -1946,6 +2308,7 @@ def verify_email_hunter(email):
 
 
 @app.route('/api/verify-emails', methods=['POST'])
+@validate_json(emails=list)
 def verify_emails():
     """Verify email addresses using Hunter.io Email Verifier API"""
     data = request.json
@@ -1989,17 +2352,17 @@ def verify_emails():
                 result['first_name'] = email_data.get('first_name', '')
                 result['last_name'] = email_data.get('last_name', '')
             
-            # Save verification to database
-            if USE_DATABASE:
-                try:
-                    update_email_verification(email, result)
-                except Exception as e:
-                    print(f"Error saving verification for {email}: {e}")
-            
             results.append(result)
         
         time.sleep(0.2)  # Rate limiting
     
+    # Save all verifications to database in one transaction
+    if USE_DATABASE and results:
+        try:
+            update_email_verifications(results)
+        except Exception as e:
+            print(f"Error saving email verifications: {e}")
+    
     return jsonify({
         'results': results,
         'verified_count': verified_count,
@@ -2010,5 +2373,8 @@ def verify_emails():
 
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    # Local development only - production runs under gunicorn (see Dockerfile). The debugger
+    # and reloader (a second copy of the app and its caches, polling every module file) are
+    # opt-in with FLASK_DEBUG=1, as the docker-compose dev service sets
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1', port=5000, threaded=True)
 
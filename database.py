@@ -22,16 +22,206 @@ Override Logic:
 
 import sqlite3
 import os
+import json
+import re
+import threading
 from datetime import datetime
+from itertools import islice
 from contextlib import contextmanager
+from functools import lru_cache
 
 DB_PATH = os.getenv('DB_PATH', 'companies.db')
 
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 512
+
+# Stored in PRAGMA user_version by init_db() - bump it when init_db() gains a migration
+# the app depends on, so the app refuses a database that hasn't been migrated
+SCHEMA_VERSION = 1
+
+# Settings for the long-lived per-thread connections. WAL lets request threads read
+# while another writes; cache_size is negative = KiB, so 64 MB of page cache
+PERSISTENT_PRAGMAS = '''
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -65536;
+    PRAGMA mmap_size = 268435456;
+'''
+
+_thread_local = threading.local()
+
+# SQLite allows one writer at a time; writers in this process queue on this lock
+# instead of spinning in SQLite's busy handler (re-entrant for nested helper calls)
+_write_lock = threading.RLock()
+
+# Secondary indexes on companies - kept in one place so bulk loads can
+# drop them before the insert and rebuild them once at the end
+COMPANY_INDEXES = {
+    'idx_company_name': 'companies(company_name)',
+    'idx_company_name_upper': 'companies(upper(company_name))',  # Case-insensitive name matching
+    'idx_postcode': 'companies(postcode)',
+    'idx_status_postcode': 'companies(company_status, postcode)',  # Active + postcode prefix
+    'idx_incorporation_year': 'companies(incorporation_year)',
+    'idx_company_status': 'companies(company_status)',
+    'idx_enrichment_status': 'companies(enrichment_status)',
+    'idx_sic_code_1': 'companies(sic_code_1)',
+    'idx_sic_code_2': 'companies(sic_code_2)',
+    'idx_sic_code_3': 'companies(sic_code_3)',  # search_companies matches all four SIC columns;
+    'idx_sic_code_4': 'companies(sic_code_4)',  # one unindexed OR branch forces a full scan
+}
+
+# Triggers keeping companies_stats current - bulk loads drop them and call
+# rebuild_companies_stats() once instead of paying for an upsert per row
+COMPANIES_STATS_TRIGGERS = {
+    'trg_companies_stats_insert': '''
+        AFTER INSERT ON companies
+        BEGIN
+            INSERT INTO companies_stats (company_status, enrichment_status, cnt)
+            VALUES (IFNULL(NEW.company_status, ''), IFNULL(NEW.enrichment_status, ''), 1)
+            ON CONFLICT(company_status, enrichment_status) DO UPDATE SET cnt = cnt + 1;
+        END
+    ''',
+    'trg_companies_stats_delete': '''
+        AFTER DELETE ON companies
+        BEGIN
+            UPDATE companies_stats SET cnt = cnt - 1
+            WHERE company_status = IFNULL(OLD.company_status, '')
+              AND enrichment_status = IFNULL(OLD.enrichment_status, '');
+        END
+    ''',
+    'trg_companies_stats_update': '''
+        AFTER UPDATE OF company_status, enrichment_status ON companies
+        WHEN OLD.company_status IS NOT NEW.company_status
+          OR OLD.enrichment_status IS NOT NEW.enrichment_status
+        BEGIN
+            UPDATE companies_stats SET cnt = cnt - 1
+            WHERE company_status = IFNULL(OLD.company_status, '')
+              AND enrichment_status = IFNULL(OLD.enrichment_status, '');
+            INSERT INTO companies_stats (company_status, enrichment_status, cnt)
+            VALUES (IFNULL(NEW.company_status, ''), IFNULL(NEW.enrichment_status, ''), 1)
+            ON CONFLICT(company_status, enrichment_status) DO UPDATE SET cnt = cnt + 1;
+        END
+    ''',
+}
+
+# Insert a company_row tuple as a new, not yet enriched company (shared by both CSV loaders)
+INSERT_COMPANY_SQL = '''
+    INSERT INTO companies (
+        company_number, company_name,
+        address_line1, address_line2, post_town, county, postcode,
+        company_status, incorporation_date, incorporation_year,
+        sic_code_1, sic_code_2, sic_code_3, sic_code_4,
+        enrichment_status, csv_source, csv_import_date
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'not_attempted', ?, CURRENT_TIMESTAMP)
+'''
+
+# Insert a company, or refresh its basic fields if it already exists and any changed
+# (unchanged rows aren't rewritten). Enrichment columns are never touched on conflict.
+UPSERT_COMPANY_SQL = INSERT_COMPANY_SQL + '''
+    ON CONFLICT(company_number) DO UPDATE SET
+        company_name = excluded.company_name,
+        address_line1 = excluded.address_line1,
+        address_line2 = excluded.address_line2,
+        post_town = excluded.post_town,
+        county = excluded.county,
+        postcode = excluded.postcode,
+        company_status = excluded.company_status,
+        incorporation_date = excluded.incorporation_date,
+        incorporation_year = excluded.incorporation_year,
+        sic_code_1 = excluded.sic_code_1,
+        sic_code_2 = excluded.sic_code_2,
+        sic_code_3 = excluded.sic_code_3,
+        sic_code_4 = excluded.sic_code_4,
+        updated_at = CURRENT_TIMESTAMP,
+        csv_source = excluded.csv_source,
+        csv_import_date = CURRENT_TIMESTAMP
+    WHERE companies.company_name IS NOT excluded.company_name
+       OR companies.address_line1 IS NOT excluded.address_line1
+       OR companies.address_line2 IS NOT excluded.address_line2
+       OR companies.post_town IS NOT excluded.post_town
+       OR companies.county IS NOT excluded.county
+       OR companies.postcode IS NOT excluded.postcode
+       OR companies.company_status IS NOT excluded.company_status
+       OR companies.incorporation_date IS NOT excluded.incorporation_date
+       OR companies.incorporation_year IS NOT excluded.incorporation_year
+       OR companies.sic_code_1 IS NOT excluded.sic_code_1
+       OR companies.sic_code_2 IS NOT excluded.sic_code_2
+       OR companies.sic_code_3 IS NOT excluded.sic_code_3
+       OR companies.sic_code_4 IS NOT excluded.sic_code_4
+'''
+
+# Resume mode: insert only companies that aren't in the database yet
+INSERT_COMPANY_IF_NEW_SQL = INSERT_COMPANY_SQL + '    ON CONFLICT(company_number) DO NOTHING\n'
+
+# How many of a JSON array of company numbers already exist (one statement per batch)
+COUNT_EXISTING_COMPANIES_SQL = '''
+    SELECT COUNT(*) FROM companies WHERE company_number IN (SELECT value FROM json_each(?))
+'''
+
+
+def _prefix_range(prefix):
+    """Turn a prefix into a [low, high) range, e.g. 'SW1' -> ('SW1', 'SW2').
+    
+    Range comparisons always use the index; LIKE 'SW1%' only does when the
+    LIKE optimization applies (case_sensitive_like / collation dependent).
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _sic_prefixes(sic_codes):
+    """Normalise a sic_codes argument to a list of prefixes, dropping blanks
+    
+    An empty prefix has no range (LIKE '%' matched everything), so it adds no predicate.
+    """
+    if isinstance(sic_codes, str):
+        sic_codes = [sic_codes]
+    return [sic for sic in sic_codes or () if sic]
+
+
+def _thread_connection():
+    """This thread's long-lived connection, opened on first use (and again after a fork)"""
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is None or _thread_local.pid != os.getpid():
+        conn = sqlite3.connect(DB_PATH, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.executescript(PERSISTENT_PRAGMAS)
+        _thread_local.conn, _thread_local.pid = conn, os.getpid()
+    return conn
+
+
+def close_thread_db():
+    """Close this thread's long-lived connection, if it has one"""
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is not None and _thread_local.pid == os.getpid():
+        conn.close()
+    _thread_local.conn = None
+
 
 @contextmanager
-def get_db():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(DB_PATH)
+def get_db(persistent=False, write=False):
+    """Context manager for database connections
+    
+    persistent=True reuses one connection per thread instead of opening a new one,
+    so its prepared statements and page cache survive between requests. Only for
+    short request-path work - anything left uncommitted is rolled back on exit, and
+    connection-level PRAGMAs would leak into later callers.
+    write=True (persistent only) holds the process-wide writer lock for the block.
+    """
+    if persistent:
+        conn = _thread_connection()
+        conn.row_factory = sqlite3.Row
+        if write:
+            _write_lock.acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if write:
+                _write_lock.release()
+        return
+    
+    conn = sqlite3.connect(DB_PATH, cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row  # Return dicts instead of tuples
     try:
         yield conn
@@ -95,14 +285,9 @@ def init_db():
         ''')
         
         # Indexes for fast searching
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_company_number ON companies(company_number)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_company_name ON companies(company_name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_postcode ON companies(postcode)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_incorporation_year ON companies(incorporation_year)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_company_status ON companies(company_status)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_enrichment_status ON companies(enrichment_status)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sic_code_1 ON companies(sic_code_1)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sic_code_2 ON companies(sic_code_2)')
+        # company_number lookups use the UNIQUE constraint's sqlite_autoindex_companies_1
+        cursor.execute('DROP INDEX IF EXISTS idx_company_number')
+        create_company_indexes(cursor)
         
         # Directors table
         cursor.execute('''
@@ -123,8 +308,15 @@ def init_db():
                 FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
             )
         ''')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_directors_company ON directors(company_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_directors_company_number ON directors(company_number)')
+        # Covers the current-director reads (search page, company lookup) without touching
+        # the table, already in the search's appointed_on DESC order; it replaces the plain
+        # company_id index, whose lookups it serves through its leading column
+        cursor.execute('DROP INDEX IF EXISTS idx_directors_company')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_directors_current
+            ON directors(company_id, resigned_on, appointed_on DESC, name, officer_role)
+        ''')
         
         # Emails table
         cursor.execute('''
@@ -135,6 +327,7 @@ def init_db():
                 director_id INTEGER,  -- NULL if general company email
                 
                 email TEXT NOT NULL,
+                email_norm TEXT GENERATED ALWAYS AS (lower(trim(email))) VIRTUAL,  -- Dedup/lookup key
                 source TEXT NOT NULL,  -- 'website_scrape', 'hunter', 'imported'
                 source_label TEXT,
                 match_type TEXT,  -- 'company', 'auditor', 'agent', 'other'
@@ -157,9 +350,30 @@ def init_db():
                 FOREIGN KEY (director_id) REFERENCES directors(id) ON DELETE SET NULL
             )
         ''')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_emails_company ON emails(company_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_emails_company_number ON emails(company_number)')
-        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_emails_unique ON emails(company_number, email)')
+        # Older databases predate the generated email_norm column
+        cursor.execute('PRAGMA table_xinfo(emails)')
+        if 'email_norm' not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute(
+                'ALTER TABLE emails ADD COLUMN email_norm TEXT GENERATED ALWAYS AS (lower(trim(email))) VIRTUAL'
+            )
+            # One-time migration: they could hold the same address in different case or
+            # whitespace, which the unique index below rejects - keep the first of each
+            cursor.execute('''
+                DELETE FROM emails WHERE id NOT IN (
+                    SELECT MIN(id) FROM emails GROUP BY company_number, email_norm
+                )
+            ''')
+            # Emails are stored normalised; tidy any saved with stray case or whitespace
+            cursor.execute('UPDATE emails SET email = email_norm WHERE email <> email_norm')
+        # (company_id, email) also covers the company lookup's DISTINCT email list
+        cursor.execute('DROP INDEX IF EXISTS idx_emails_company')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_emails_company_email ON emails(company_id, email)')
+        # company_number lookups are served by the leading column of idx_emails_norm_unique
+        cursor.execute('DROP INDEX IF EXISTS idx_emails_company_number')
+        cursor.execute('DROP INDEX IF EXISTS idx_emails_unique')
+        cursor.execute('DROP INDEX IF EXISTS idx_emails_email')
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_emails_norm_unique ON emails(company_number, email_norm)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_emails_norm ON emails(email_norm)')  # Verification lookups
         
         # Phones table
         cursor.execute('''
@@ -178,8 +392,13 @@ def init_db():
                 FOREIGN KEY (company_id) REFERENCES companies(id) ON DELETE CASCADE
             )
         ''')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_phones_company ON phones(company_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_phones_company_number ON phones(company_number)')
+        # Covering index for every per-company phone read
+        cursor.execute('DROP INDEX IF EXISTS idx_phones_company')
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_phones_company_phone ON phones(company_id, phone, phone_type, source)'
+        )
+        # company_number lookups are served by the leading column of idx_phones_unique
+        cursor.execute('DROP INDEX IF EXISTS idx_phones_company_number')
         cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_phones_unique ON phones(company_number, phone)')
         
         # Enrichment log - for tracking what we've tried
@@ -201,27 +420,206 @@ def init_db():
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_enrichment_log_company ON enrichment_log(company_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_enrichment_log_action ON enrichment_log(action)')
         
+        # Company counts per (status, enrichment status) - kept current by triggers
+        # so the unfiltered dashboard count doesn't scan 5.6M rows
+        # NULL enrichment_status is stored as '' (treated as not attempted)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS companies_stats (
+                company_status TEXT NOT NULL,
+                enrichment_status TEXT NOT NULL,
+                cnt INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (company_status, enrichment_status)
+            )
+        ''')
+        create_companies_stats_triggers(cursor)
+        
+        # Backfill once for databases created before the summary table existed
+        cursor.execute('SELECT EXISTS(SELECT 1 FROM companies_stats)')
+        if not cursor.fetchone()[0]:
+            rebuild_companies_stats(cursor)
+        
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
         conn.commit()
         print("✅ Database initialized successfully")
 
 
+def schema_is_current():
+    """
+    False for a database from an older version, which `python database.py` must migrate
+    
+    A database locked by a running import counts as current - import_csv migrates it first.
+    """
+    try:
+        with get_db() as conn:
+            return conn.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION
+    except sqlite3.OperationalError:
+        return True
+
+
+def create_company_indexes(cursor):
+    """Create the secondary indexes on companies (no-op for existing ones)"""
+    for name, target in COMPANY_INDEXES.items():
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {target}')
+
+
+def drop_company_indexes(cursor):
+    """Drop the secondary indexes on companies ahead of a bulk load"""
+    for name in COMPANY_INDEXES:
+        cursor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def create_companies_stats_triggers(cursor):
+    """Create the triggers that keep companies_stats current (no-op for existing ones)"""
+    for name, body in COMPANIES_STATS_TRIGGERS.items():
+        cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+
+
+def drop_companies_stats_triggers(cursor):
+    """Drop the companies_stats triggers ahead of a bulk load (rebuild the table after)"""
+    for name in COMPANIES_STATS_TRIGGERS:
+        cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+
+
+def rebuild_companies_stats(cursor):
+    """Recompute the companies_stats summary table from scratch"""
+    cursor.execute('DELETE FROM companies_stats')
+    cursor.execute('''
+        INSERT INTO companies_stats (company_status, enrichment_status, cnt)
+        SELECT IFNULL(company_status, ''), IFNULL(enrichment_status, ''), COUNT(*)
+        FROM companies
+        GROUP BY 1, 2
+    ''')
+
+
+# One statement for the company and its child lists - correlated subqueries on the
+# company_id indexes, since a 3-way JOIN would multiply directors x emails x phones
+COMPANY_BY_NUMBER_SQL = '''
+    SELECT c.*,
+        (SELECT group_concat(name, ',') FROM (
+            SELECT DISTINCT name FROM directors WHERE company_id = c.id AND resigned_on IS NULL
+        )) AS director_names,
+        (SELECT group_concat(email, ',') FROM (
+            SELECT DISTINCT email FROM emails WHERE company_id = c.id
+        )) AS email_list,
+        (SELECT group_concat(phone, ',') FROM (
+            SELECT DISTINCT phone FROM phones WHERE company_id = c.id
+        )) AS phone_list
+    FROM companies c
+    WHERE c.company_number = ?
+'''
+
+
 def get_company_by_number(company_number):
     """Get a single company by company number"""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT c.*, 
-                   GROUP_CONCAT(DISTINCT d.name) as director_names,
-                   GROUP_CONCAT(DISTINCT e.email) as email_list,
-                   GROUP_CONCAT(DISTINCT p.phone) as phone_list
-            FROM companies c
-            LEFT JOIN directors d ON c.id = d.company_id AND d.resigned_on IS NULL
-            LEFT JOIN emails e ON c.id = e.company_id
-            LEFT JOIN phones p ON c.id = p.company_id
-            WHERE c.company_number = ?
-            GROUP BY c.id
-        ''', (company_number,))
-        return cursor.fetchone()
+    with get_db(persistent=True) as conn:
+        row = conn.execute(COMPANY_BY_NUMBER_SQL, (company_number,)).fetchone()
+        return dict(row) if row else None
+
+
+# Exact name matches (upper-cased names as a JSON array), served by idx_company_name_upper.
+# sic_code is the first SIC code the company has, like the CSV's first SicText column.
+COMPANIES_BY_NAME_SQL = '''
+    SELECT upper(company_name) AS name_key, company_name, company_number,
+           address_line1, address_line2, post_town, county, postcode, company_status,
+           COALESCE(NULLIF(sic_code_1, ''), NULLIF(sic_code_2, ''),
+                    NULLIF(sic_code_3, ''), NULLIF(sic_code_4, '')) AS sic_code,
+           incorporation_date
+    FROM companies
+    WHERE upper(company_name) IN (SELECT value FROM json_each(?))
+    ORDER BY id
+'''
+
+
+def find_companies_by_names(names):
+    """{upper-cased name: company} for the names found - the earliest imported company wins"""
+    with get_db(persistent=True) as conn:
+        matches = {}
+        for row in conn.execute(COMPANIES_BY_NAME_SQL, (json.dumps(names),)):
+            matches.setdefault(row['name_key'], row)
+        return matches
+
+
+# Company columns a search result carries - the listing fields, not the bookkeeping
+# ones (*_fetched flags, timestamps, csv source), so wide pages decode less per row
+SEARCH_COLUMNS = ', '.join(f'c.{column}' for column in (
+    'id', 'company_number', 'company_name',
+    'address_line1', 'address_line2', 'post_town', 'county', 'postcode',
+    'company_status', 'incorporation_date', 'incorporation_year',
+    'sic_code_1', 'sic_code_2', 'sic_code_3', 'sic_code_4',
+    'website', 'website_source', 'main_phone', 'phone_source', 'enrichment_status',
+))
+
+
+@lru_cache(maxsize=64)
+def _build_search_sql(n_sic_codes, has_postcode, year_mode, has_status,
+                      enrichment_filter, include_enriched, has_after):
+    """Build the search_companies SQL for one filter signature (values are bound by the caller)"""
+    conditions = []
+    
+    # Status filter (Active by default)
+    if has_status:
+        conditions.append("c.company_status = ?")
+    
+    # SIC code filter
+    if n_sic_codes:
+        sic_condition = (
+            "((c.sic_code_1 >= ? AND c.sic_code_1 < ?) OR (c.sic_code_2 >= ? AND c.sic_code_2 < ?) OR "
+            "(c.sic_code_3 >= ? AND c.sic_code_3 < ?) OR (c.sic_code_4 >= ? AND c.sic_code_4 < ?))"
+        )
+        conditions.append(f"({' OR '.join([sic_condition] * n_sic_codes)})")
+    
+    # Postcode filter
+    if has_postcode:
+        conditions.append("c.postcode >= ? AND c.postcode < ?")
+    
+    # Year filter
+    if year_mode == 'pre':
+        conditions.append("c.incorporation_year < 2022")
+    elif year_mode == 'eq':
+        conditions.append("c.incorporation_year = ?")
+    
+    # Enrichment filter - KEY LOGIC
+    if not include_enriched:
+        if enrichment_filter == 'not_attempted':
+            conditions.append("(c.enrichment_status = 'not_attempted' OR c.enrichment_status IS NULL)")
+        elif enrichment_filter == 'failed':
+            conditions.append("c.enrichment_status = 'failed'")
+        elif enrichment_filter == 'retry':
+            # Both not_attempted and failed
+            conditions.append("(c.enrichment_status IN ('not_attempted', 'failed') OR c.enrichment_status IS NULL)")
+    
+    # Keyset pagination - seek past the last row instead of reading and discarding OFFSET rows
+    if has_after:
+        conditions.append("(IFNULL(c.enrichment_status, ''), c.company_name, c.id) > (?, ?, ?)")
+    
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+    
+    # Related rows are aggregated to JSON per company, so one query returns the whole page
+    return f'''
+        SELECT {SEARCH_COLUMNS},
+               (SELECT json_group_array(json_object(
+                           'name', name, 'officer_role', officer_role, 'appointed_on', appointed_on))
+                FROM (SELECT name, officer_role, appointed_on FROM directors
+                      WHERE company_id = c.id AND resigned_on IS NULL
+                      ORDER BY appointed_on DESC)) AS directors_json,
+               (SELECT json_group_array(json_object(
+                           'email', email, 'source', source, 'source_label', source_label,
+                           'match_type', match_type, 'confidence', confidence,
+                           'verified', verified, 'verification_status', verification_status,
+                           'verification_score', verification_score, 'first_name', first_name,
+                           'last_name', last_name, 'position', position))
+                FROM (SELECT email, source, source_label, match_type, confidence, verified,
+                             verification_status, verification_score, first_name, last_name, position
+                      FROM emails WHERE company_id = c.id
+                      ORDER BY verification_status = 'valid' DESC, confidence DESC)) AS emails_json,
+               (SELECT json_group_array(json_object(
+                           'phone', phone, 'phone_type', phone_type, 'source', source))
+                FROM phones WHERE company_id = c.id) AS phones_json
+        FROM companies c
+        {where_clause}
+        ORDER BY IFNULL(c.enrichment_status, '') ASC, c.company_name ASC, c.id ASC
+        LIMIT ? OFFSET ?
+    '''
 
 
 def search_companies(
@@ -232,161 +630,139 @@ def search_companies(
     enrichment_filter='not_attempted',  # 'not_attempted', 'failed', 'all'
     include_enriched=False,  # Override to include already enriched
     limit=500,
-    offset=0
+    offset=0,
+    after=None  # Keyset cursor: (enrichment_status, company_name, id) of the last row seen
 ):
     """
     Search companies with filters
     
     Default behavior: Returns unattempted records first
     Override (include_enriched=True): Also returns failed records for retry
+    Pagination: pass `after` (see page_cursor) instead of a large offset
     """
-    with get_db() as conn:
+    sic_codes = _sic_prefixes(sic_codes)
+    
+    params = []
+    if status_filter:
+        params.append(status_filter)
+    for sic in sic_codes:
+        params.extend(_prefix_range(sic) * 4)
+    if postcode_prefix:
+        params.extend(_prefix_range(postcode_prefix.upper()))
+    if year_filter and year_filter != 'pre2022':
+        params.append(int(year_filter))
+    if after:
+        params.extend(after)
+    params.extend([limit, offset])
+    
+    year_mode = ('pre' if year_filter == 'pre2022' else 'eq') if year_filter else None
+    query = _build_search_sql(
+        len(sic_codes), bool(postcode_prefix), year_mode, bool(status_filter),
+        enrichment_filter, bool(include_enriched), bool(after)
+    )
+    
+    with get_db(persistent=True) as conn:
         cursor = conn.cursor()
-        
-        conditions = []
-        params = []
-        
-        # Status filter (Active by default)
-        if status_filter:
-            conditions.append("c.company_status = ?")
-            params.append(status_filter)
-        
-        # SIC code filter
-        if sic_codes:
-            if isinstance(sic_codes, str):
-                sic_codes = [sic_codes]
-            sic_conditions = []
-            for sic in sic_codes:
-                sic_conditions.append("(c.sic_code_1 LIKE ? OR c.sic_code_2 LIKE ? OR c.sic_code_3 LIKE ? OR c.sic_code_4 LIKE ?)")
-                params.extend([f"{sic}%"] * 4)
-            conditions.append(f"({' OR '.join(sic_conditions)})")
-        
-        # Postcode filter
-        if postcode_prefix:
-            conditions.append("c.postcode LIKE ?")
-            params.append(f"{postcode_prefix.upper()}%")
-        
-        # Year filter
-        if year_filter:
-            if year_filter == 'pre2022':
-                conditions.append("c.incorporation_year < 2022")
-            else:
-                conditions.append("c.incorporation_year = ?")
-                params.append(int(year_filter))
-        
-        # Enrichment filter - KEY LOGIC
-        if not include_enriched:
-            if enrichment_filter == 'not_attempted':
-                conditions.append("(c.enrichment_status = 'not_attempted' OR c.enrichment_status IS NULL)")
-            elif enrichment_filter == 'failed':
-                conditions.append("c.enrichment_status = 'failed'")
-            elif enrichment_filter == 'retry':
-                # Both not_attempted and failed
-                conditions.append("(c.enrichment_status IN ('not_attempted', 'failed') OR c.enrichment_status IS NULL)")
-        
-        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
-        
-        # Build query with LEFT JOINs for related data
-        query = f'''
-            SELECT c.*,
-                   COUNT(DISTINCT d.id) as director_count,
-                   COUNT(DISTINCT e.id) as email_count,
-                   COUNT(DISTINCT p.id) as phone_count
-            FROM companies c
-            LEFT JOIN directors d ON c.id = d.company_id AND d.resigned_on IS NULL
-            LEFT JOIN emails e ON c.id = e.company_id
-            LEFT JOIN phones p ON c.id = p.company_id
-            {where_clause}
-            GROUP BY c.id
-            ORDER BY c.enrichment_status ASC, c.company_name ASC
-            LIMIT ? OFFSET ?
-        '''
-        
-        params.extend([limit, offset])
+        # Plain tuples zipped with the column names - sqlite3.Row looks every key up by
+        # a linear, case-insensitive scan of the ~30 column names
+        cursor.row_factory = None
         cursor.execute(query, params)
+        columns = [description[0] for description in cursor.description]
         
         results = []
-        for row in cursor.fetchall():
-            company = dict(row)
-            
-            # Get directors for this company
-            cursor.execute('''
-                SELECT name, officer_role, appointed_on 
-                FROM directors 
-                WHERE company_id = ? AND resigned_on IS NULL
-                ORDER BY appointed_on DESC
-            ''', (company['id'],))
-            company['directors'] = [dict(d) for d in cursor.fetchall()]
-            
-            # Get emails
-            cursor.execute('''
-                SELECT email, source, source_label, match_type, confidence,
-                       verified, verification_status, verification_score,
-                       first_name, last_name, position
-                FROM emails 
-                WHERE company_id = ?
-                ORDER BY verification_status = 'valid' DESC, confidence DESC
-            ''', (company['id'],))
-            company['emails'] = [dict(e) for e in cursor.fetchall()]
-            
-            # Get phones
-            cursor.execute('''
-                SELECT phone, phone_type, source
-                FROM phones 
-                WHERE company_id = ?
-            ''', (company['id'],))
-            company['phones'] = [dict(p) for p in cursor.fetchall()]
-            
+        for row in cursor:
+            company = dict(zip(columns, row))
+            company['directors'] = json.loads(company.pop('directors_json'))
+            company['emails'] = json.loads(company.pop('emails_json'))
+            company['phones'] = json.loads(company.pop('phones_json'))
+            company['director_count'] = len(company['directors'])
+            company['email_count'] = len(company['emails'])
+            company['phone_count'] = len(company['phones'])
             results.append(company)
         
         return results
 
 
+def page_cursor(company):
+    """Keyset cursor for search_companies(after=...) from the last company of a page"""
+    return (company.get('enrichment_status') or '', company['company_name'], company['id'])
+
+
+# Extra companies_stats condition per enrichment_filter (anything else counts every bucket)
+_STATS_BUCKET_CONDITIONS = {
+    'not_attempted': "AND enrichment_status IN ('not_attempted', '')",
+    'failed': "AND enrichment_status = 'failed'",
+}
+
+_COUNT_FROM_STATS_SQL = '''
+    SELECT IFNULL(SUM(cnt), 0) as total,
+           SUM(CASE WHEN enrichment_status = 'success' THEN cnt ELSE 0 END) as enriched,
+           SUM(CASE WHEN enrichment_status = 'failed' THEN cnt ELSE 0 END) as failed,
+           SUM(CASE WHEN enrichment_status IN ('not_attempted', '') THEN cnt ELSE 0 END) as unattempted
+    FROM companies_stats
+    WHERE company_status = 'Active' {bucket_condition}
+'''
+
+
+@lru_cache(maxsize=64)
+def _build_count_sql(n_sic_codes, has_postcode, year_mode, enrichment_filter):
+    """Build the count_companies SQL for one filter signature (values are bound by the caller)"""
+    conditions = ["c.company_status = 'Active'"]
+    
+    if n_sic_codes:
+        sic_condition = "((c.sic_code_1 >= ? AND c.sic_code_1 < ?) OR (c.sic_code_2 >= ? AND c.sic_code_2 < ?))"
+        conditions.append(f"({' OR '.join([sic_condition] * n_sic_codes)})")
+    
+    if has_postcode:
+        conditions.append("c.postcode >= ? AND c.postcode < ?")
+    
+    if year_mode == 'pre':
+        conditions.append("c.incorporation_year < 2022")
+    elif year_mode == 'eq':
+        conditions.append("c.incorporation_year = ?")
+    
+    if enrichment_filter == 'not_attempted':
+        conditions.append("(c.enrichment_status = 'not_attempted' OR c.enrichment_status IS NULL)")
+    elif enrichment_filter == 'failed':
+        conditions.append("c.enrichment_status = 'failed'")
+    
+    where_clause = "WHERE " + " AND ".join(conditions)
+    
+    return f'''
+        SELECT COUNT(*) as total,
+               SUM(CASE WHEN enrichment_status = 'success' THEN 1 ELSE 0 END) as enriched,
+               SUM(CASE WHEN enrichment_status = 'failed' THEN 1 ELSE 0 END) as failed,
+               SUM(CASE WHEN enrichment_status = 'not_attempted' OR enrichment_status IS NULL THEN 1 ELSE 0 END) as unattempted
+        FROM companies c
+        {where_clause}
+    '''
+
+
 def count_companies(sic_codes=None, postcode_prefix=None, year_filter=None, enrichment_filter='all'):
     """Get count of companies matching filters"""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        conditions = ["c.company_status = 'Active'"]
-        params = []
-        
-        if sic_codes:
-            if isinstance(sic_codes, str):
-                sic_codes = [sic_codes]
-            sic_conditions = []
-            for sic in sic_codes:
-                sic_conditions.append("(c.sic_code_1 LIKE ? OR c.sic_code_2 LIKE ?)")
-                params.extend([f"{sic}%"] * 2)
-            conditions.append(f"({' OR '.join(sic_conditions)})")
-        
-        if postcode_prefix:
-            conditions.append("c.postcode LIKE ?")
-            params.append(f"{postcode_prefix.upper()}%")
-        
-        if year_filter:
-            if year_filter == 'pre2022':
-                conditions.append("c.incorporation_year < 2022")
-            else:
-                conditions.append("c.incorporation_year = ?")
-                params.append(int(year_filter))
-        
-        if enrichment_filter == 'not_attempted':
-            conditions.append("(c.enrichment_status = 'not_attempted' OR c.enrichment_status IS NULL)")
-        elif enrichment_filter == 'failed':
-            conditions.append("c.enrichment_status = 'failed'")
-        
-        where_clause = "WHERE " + " AND ".join(conditions)
-        
-        cursor.execute(f'''
-            SELECT COUNT(*) as total,
-                   SUM(CASE WHEN enrichment_status = 'success' THEN 1 ELSE 0 END) as enriched,
-                   SUM(CASE WHEN enrichment_status = 'failed' THEN 1 ELSE 0 END) as failed,
-                   SUM(CASE WHEN enrichment_status = 'not_attempted' OR enrichment_status IS NULL THEN 1 ELSE 0 END) as unattempted
-            FROM companies c
-            {where_clause}
-        ''', params)
-        
-        return dict(cursor.fetchone())
+    sic_codes = _sic_prefixes(sic_codes)
+    
+    # No row-level filters: answer from the trigger-maintained summary table
+    if not sic_codes and not postcode_prefix and not year_filter:
+        query = _COUNT_FROM_STATS_SQL.format(
+            bucket_condition=_STATS_BUCKET_CONDITIONS.get(enrichment_filter, '')
+        )
+        with get_db(persistent=True) as conn:
+            return dict(conn.execute(query).fetchone())
+    
+    params = []
+    for sic in sic_codes:
+        params.extend(_prefix_range(sic) * 2)
+    if postcode_prefix:
+        params.extend(_prefix_range(postcode_prefix.upper()))
+    if year_filter and year_filter != 'pre2022':
+        params.append(int(year_filter))
+    
+    year_mode = ('pre' if year_filter == 'pre2022' else 'eq') if year_filter else None
+    query = _build_count_sql(len(sic_codes), bool(postcode_prefix), year_mode, enrichment_filter)
+    
+    with get_db(persistent=True) as conn:
+        return dict(conn.execute(query, params).fetchone())
 
 
 def upsert_company(company_data, csv_source=None):
@@ -394,7 +770,7 @@ def upsert_company(company_data, csv_source=None):
     Insert or update a company
     For monthly CSV updates: only updates non-enriched fields, preserves enrichment data
     """
-    with get_db() as conn:
+    with get_db(persistent=True, write=True) as conn:
         cursor = conn.cursor()
         
         # Check if company exists
@@ -472,160 +848,323 @@ def upsert_company(company_data, csv_source=None):
             return cursor.lastrowid
 
 
+def company_row(company_data, csv_source):
+    """Flatten a company dict into UPSERT_COMPANY_SQL parameter order"""
+    return (
+        company_data['company_number'],
+        company_data.get('company_name'),
+        company_data.get('address_line1'),
+        company_data.get('address_line2'),
+        company_data.get('post_town'),
+        company_data.get('county'),
+        company_data.get('postcode'),
+        company_data.get('company_status'),
+        company_data.get('incorporation_date'),
+        company_data.get('incorporation_year'),
+        company_data.get('sic_code_1'),
+        company_data.get('sic_code_2'),
+        company_data.get('sic_code_3'),
+        company_data.get('sic_code_4'),
+        csv_source
+    )
+
+
+# First name token after the comma in 'LASTNAME, Firstname Middle'
+_FIRST_NAME_RE = re.compile(r'[^\s,]+')
+
+INSERT_DIRECTOR_SQL = '''
+    INSERT OR IGNORE INTO directors (
+        company_id, company_number, name, first_name, last_name,
+        officer_role, appointed_on, resigned_on
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def split_director_name(name):
+    """Split 'LASTNAME, Firstname Middle' or 'Firstname Lastname' into (first_name, last_name)"""
+    last_name, comma, rest = name.partition(',')
+    if comma:
+        match = _FIRST_NAME_RE.search(rest)
+        return (match.group(0) if match else ''), last_name.strip()
+    parts = name.split()
+    return (parts[0] if parts else ''), (parts[-1] if len(parts) > 1 else '')
+
+
+def _director_row(company_id, company_number, director_data):
+    """Flatten a director dict into INSERT_DIRECTOR_SQL parameter order"""
+    name = director_data.get('name', '')
+    first_name, last_name = split_director_name(name)
+    return (
+        company_id,
+        company_number,
+        name,
+        first_name,
+        last_name,
+        director_data.get('role', director_data.get('officer_role')),
+        director_data.get('appointed', director_data.get('appointed_on')),
+        director_data.get('resigned_on')
+    )
+
+
 def add_director(company_id, company_number, director_data):
     """Add a director to a company"""
-    with get_db() as conn:
+    with get_db(persistent=True, write=True) as conn:
         cursor = conn.cursor()
-        
-        # Parse name into first/last
-        name = director_data.get('name', '')
-        if ',' in name:
-            parts = name.split(',')
-            last_name = parts[0].strip()
-            first_name = parts[1].strip().split()[0] if len(parts) > 1 else ''
-        else:
-            parts = name.split()
-            first_name = parts[0] if parts else ''
-            last_name = parts[-1] if len(parts) > 1 else ''
-        
-        cursor.execute('''
-            INSERT OR IGNORE INTO directors (
-                company_id, company_number, name, first_name, last_name,
-                officer_role, appointed_on, resigned_on
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            company_id,
-            company_number,
-            name,
-            first_name,
-            last_name,
-            director_data.get('role', director_data.get('officer_role')),
-            director_data.get('appointed', director_data.get('appointed_on')),
-            director_data.get('resigned_on')
-        ))
+        cursor.execute(INSERT_DIRECTOR_SQL, _director_row(company_id, company_number, director_data))
         conn.commit()
         return cursor.lastrowid
 
 
+def add_directors(company_id, company_number, directors):
+    """Add several directors to a company in one transaction"""
+    with get_db(persistent=True, write=True) as conn:
+        cursor = conn.cursor()
+        cursor.executemany(INSERT_DIRECTOR_SQL, [
+            _director_row(company_id, company_number, director_data)
+            for director_data in directors
+        ])
+        conn.commit()
+        return cursor.rowcount
+
+
+COMPANY_IDS_SQL = '''
+    SELECT company_number, id FROM companies
+    WHERE company_number IN (SELECT value FROM json_each(?))
+'''
+
+
+def add_directors_bulk(directors_by_company):
+    """
+    Add directors for many companies in one transaction
+    
+    directors_by_company: {company_number: [director dicts]}
+    Returns the company numbers found in the database (the ones directors were added to)
+    """
+    with get_db(persistent=True, write=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute(COMPANY_IDS_SQL, (json.dumps(list(directors_by_company)),))
+        ids = dict(cursor.fetchall())
+        cursor.executemany(INSERT_DIRECTOR_SQL, [
+            _director_row(ids[company_number], company_number, director_data)
+            for company_number, directors in directors_by_company.items() if company_number in ids
+            for director_data in directors
+        ])
+        conn.commit()
+    return set(ids)
+
+
+# Duplicates (same company + email/phone) are skipped by SQLite via the unique indexes.
+# Emails are stored lowercased and trimmed (as displayed, exported and matched by the UI);
+# the generated email_norm column is the indexed dedup key.
+INSERT_EMAIL_SQL = '''
+    INSERT INTO emails (
+        company_id, company_number, director_id,
+        email, source, source_label, match_type, confidence,
+        verified, verification_status, verification_score,
+        first_name, last_name, position
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(company_number, email_norm) DO NOTHING
+'''
+
+INSERT_PHONE_SQL = '''
+    INSERT INTO phones (
+        company_id, company_number,
+        phone, phone_type, source, source_url
+    ) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(company_number, phone) DO NOTHING
+'''
+
+
+def _email_row(company_id, company_number, email_data, director_id=None):
+    """Flatten an email dict into INSERT_EMAIL_SQL parameter order"""
+    return (
+        company_id,
+        company_number,
+        director_id,
+        email_data.get('email', '').lower().strip(),
+        email_data.get('source'),
+        email_data.get('source_label'),
+        email_data.get('match_type'),
+        email_data.get('confidence'),
+        email_data.get('verified', 0),
+        email_data.get('verification_status'),
+        email_data.get('verification_score'),
+        email_data.get('first_name'),
+        email_data.get('last_name'),
+        email_data.get('position')
+    )
+
+
+def _phone_row(company_id, company_number, phone_data):
+    """Flatten a phone dict into INSERT_PHONE_SQL parameter order"""
+    return (
+        company_id,
+        company_number,
+        phone_data.get('phone', '').strip(),
+        phone_data.get('phone_type', 'main'),
+        phone_data.get('source'),
+        phone_data.get('source_url')
+    )
+
+
 def add_email(company_id, company_number, email_data, director_id=None):
     """Add an email to a company (deduplicates automatically)"""
-    with get_db() as conn:
+    with get_db(persistent=True, write=True) as conn:
         cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
-                INSERT INTO emails (
-                    company_id, company_number, director_id,
-                    email, source, source_label, match_type, confidence,
-                    verified, verification_status, verification_score,
-                    first_name, last_name, position
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                company_id,
-                company_number,
-                director_id,
-                email_data.get('email', '').lower().strip(),
-                email_data.get('source'),
-                email_data.get('source_label'),
-                email_data.get('match_type'),
-                email_data.get('confidence'),
-                email_data.get('verified', 0),
-                email_data.get('verification_status'),
-                email_data.get('verification_score'),
-                email_data.get('first_name'),
-                email_data.get('last_name'),
-                email_data.get('position')
-            ))
-            conn.commit()
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            # Email already exists for this company
-            return None
+        cursor.execute(INSERT_EMAIL_SQL, _email_row(company_id, company_number, email_data, director_id))
+        conn.commit()
+        # rowcount is 0 when the email already exists for this company
+        return cursor.lastrowid if cursor.rowcount else None
+
+
+def add_emails(company_id, company_number, emails):
+    """Add several emails to a company in one transaction, returns how many were new"""
+    with get_db(persistent=True, write=True) as conn:
+        cursor = conn.cursor()
+        cursor.executemany(INSERT_EMAIL_SQL, [
+            _email_row(company_id, company_number, email_data) for email_data in emails
+        ])
+        conn.commit()
+        return cursor.rowcount
 
 
 def add_phone(company_id, company_number, phone_data):
     """Add a phone number to a company (deduplicates automatically)"""
-    with get_db() as conn:
+    with get_db(persistent=True, write=True) as conn:
         cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
-                INSERT INTO phones (
-                    company_id, company_number,
-                    phone, phone_type, source, source_url
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                company_id,
-                company_number,
-                phone_data.get('phone', '').strip(),
-                phone_data.get('phone_type', 'main'),
-                phone_data.get('source'),
-                phone_data.get('source_url')
-            ))
-            conn.commit()
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            # Phone already exists for this company
-            return None
+        cursor.execute(INSERT_PHONE_SQL, _phone_row(company_id, company_number, phone_data))
+        conn.commit()
+        # rowcount is 0 when the phone already exists for this company
+        return cursor.lastrowid if cursor.rowcount else None
+
+
+def add_phones(company_id, company_number, phones):
+    """Add several phone numbers to a company in one transaction, returns how many were new"""
+    with get_db(persistent=True, write=True) as conn:
+        cursor = conn.cursor()
+        cursor.executemany(INSERT_PHONE_SQL, [
+            _phone_row(company_id, company_number, phone_data) for phone_data in phones
+        ])
+        conn.commit()
+        return cursor.rowcount
+
+
+# Which *_fetched flag each enrichment action sets
+_ACTION_FETCHED_COLUMN = {
+    'fetch_directors': 'directors_fetched',
+    'find_website': 'website_fetched',
+    'scrape_emails': 'website_fetched',
+    'hunter_emails': 'emails_fetched',
+    'scrape_phones': 'phones_fetched',
+    'hunter_phones': 'phones_fetched',
+}
+
+_UPDATE_STATUS_SQL = '''
+    UPDATE companies SET enrichment_status = ?, last_enrichment_attempt = ?{fetched}
+    WHERE company_number = ?
+    RETURNING id
+'''
+
+# Status UPDATE statements precomputed per action (None = no fetched flag)
+_UPDATE_STATUS_SQL_BY_ACTION = {
+    action: _UPDATE_STATUS_SQL.format(fetched=f', {column} = 1')
+    for action, column in _ACTION_FETCHED_COLUMN.items()
+}
+_UPDATE_STATUS_SQL_BY_ACTION[None] = _UPDATE_STATUS_SQL.format(fetched='')
+
+INSERT_ENRICHMENT_LOG_SQL = '''
+    INSERT INTO enrichment_log (company_id, company_number, action, status, details)
+    VALUES (?, ?, ?, ?, ?)
+'''
 
 
 def update_enrichment_status(company_number, status, action=None, details=None):
     """Update enrichment status and log the action"""
-    with get_db() as conn:
+    with get_db(persistent=True, write=True) as conn:
         cursor = conn.cursor()
         
-        # Get company ID
-        cursor.execute('SELECT id FROM companies WHERE company_number = ?', (company_number,))
+        sql = _UPDATE_STATUS_SQL_BY_ACTION.get(action, _UPDATE_STATUS_SQL_BY_ACTION[None])
+        cursor.execute(sql, (status, datetime.now().isoformat(), company_number))
         row = cursor.fetchone()
         if not row:
             return False
         
-        company_id = row['id']
-        
-        # Determine what fields to mark as fetched
-        updates = {
-            'enrichment_status': status,
-            'last_enrichment_attempt': datetime.now().isoformat()
-        }
-        
-        if action == 'fetch_directors':
-            updates['directors_fetched'] = 1
-        elif action in ('find_website', 'scrape_emails'):
-            updates['website_fetched'] = 1
-        elif action in ('scrape_emails', 'hunter_emails'):
-            updates['emails_fetched'] = 1
-        elif action in ('scrape_phones', 'hunter_phones'):
-            updates['phones_fetched'] = 1
-        
-        # Build update query
-        set_clause = ', '.join(f"{k} = ?" for k in updates.keys())
-        cursor.execute(f'''
-            UPDATE companies SET {set_clause} WHERE company_number = ?
-        ''', list(updates.values()) + [company_number])
-        
         # Log the action
         if action:
-            cursor.execute('''
-                INSERT INTO enrichment_log (company_id, company_number, action, status, details)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (company_id, company_number, action, status, details))
+            cursor.execute(INSERT_ENRICHMENT_LOG_SQL, (row['id'], company_number, action, status, details))
         
         conn.commit()
         return True
 
 
+# ?1 is a JSON array of [company_number, status] pairs, so the statement text is the
+# same whatever the batch size and stays in the connection's statement cache
+_UPDATE_STATUS_BULK_SQL = '''
+    UPDATE companies SET enrichment_status = json_extract(v.value, '$[1]'), last_enrichment_attempt = ?2{fetched}
+    FROM json_each(?1) AS v
+    WHERE companies.company_number = json_extract(v.value, '$[0]')
+    RETURNING companies.id, companies.company_number
+'''
+
+# Bulk status UPDATE statements precomputed per action (None = no fetched flag)
+_UPDATE_STATUS_BULK_SQL_BY_ACTION = {
+    action: _UPDATE_STATUS_BULK_SQL.format(fetched=f', {column} = 1')
+    for action, column in _ACTION_FETCHED_COLUMN.items()
+}
+_UPDATE_STATUS_BULK_SQL_BY_ACTION[None] = _UPDATE_STATUS_BULK_SQL.format(fetched='')
+
+
+def update_enrichment_status_bulk(updates, batch_size=500):
+    """
+    Update enrichment status for many companies in one transaction
+    
+    updates: iterable of (company_number, status, action[, details]) tuples
+    Returns the number of companies updated
+    """
+    # One UPDATE ... FROM json_each per action, since the action decides the *_fetched flag
+    by_action = {}
+    for update in updates:
+        company_number, status, action = update[:3]
+        details = update[3] if len(update) > 3 else None
+        by_action.setdefault(action, {})[company_number] = (status, details)
+    
+    attempted = datetime.now().isoformat()
+    updated = 0
+    with get_db(persistent=True, write=True) as conn:
+        cursor = conn.cursor()
+        for action, statuses in by_action.items():
+            sql = _UPDATE_STATUS_BULK_SQL_BY_ACTION.get(action, _UPDATE_STATUS_BULK_SQL_BY_ACTION[None])
+            items = iter(statuses.items())
+            while batch := list(islice(items, batch_size)):
+                pairs = json.dumps([(number, status) for number, (status, _) in batch])
+                # RETURNING rows unpacked by position, streamed straight off the cursor
+                ids = {number: company_id for company_id, number in cursor.execute(sql, (pairs, attempted))}
+                updated += len(ids)
+                
+                if action:
+                    cursor.executemany(INSERT_ENRICHMENT_LOG_SQL, [
+                        (ids[number], number, action, status, details)
+                        for number, (status, details) in batch if number in ids
+                    ])
+        conn.commit()
+    return updated
+
+
+UPDATE_EMAIL_VERIFICATION_SQL = '''
+    UPDATE emails SET
+        verified = 1,
+        verification_status = ?,
+        verification_score = ?,
+        verified_at = CURRENT_TIMESTAMP
+    WHERE email_norm = lower(trim(?))
+'''
+
+
 def update_email_verification(email, verification_result):
     """Update email verification status"""
-    with get_db() as conn:
+    with get_db(persistent=True, write=True) as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE emails SET
-                verified = 1,
-                verification_status = ?,
-                verification_score = ?,
-                verified_at = CURRENT_TIMESTAMP
-            WHERE email = ?
-        ''', (
+        cursor.execute(UPDATE_EMAIL_VERIFICATION_SQL, (
             verification_result.get('status'),
             verification_result.get('score'),
             email
@@ -634,25 +1173,66 @@ def update_email_verification(email, verification_result):
         return cursor.rowcount > 0
 
 
+def update_email_verifications(verification_results):
+    """Update verification status for many emails in one transaction (results carry 'email')"""
+    with get_db(persistent=True, write=True) as conn:
+        cursor = conn.cursor()
+        cursor.executemany(UPDATE_EMAIL_VERIFICATION_SQL, [
+            (result.get('status'), result.get('score'), result['email'])
+            for result in verification_results
+        ])
+        conn.commit()
+        return cursor.rowcount
+
+
+UPDATE_COMPANY_WEBSITE_SQL = '''
+    UPDATE companies SET
+        website = ?,
+        website_source = ?,
+        website_fetched = 1,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE company_number = ?
+'''
+
+
 def update_company_website(company_number, website, source):
     """Update company website"""
-    with get_db() as conn:
+    with get_db(persistent=True, write=True) as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE companies SET
-                website = ?,
-                website_source = ?,
-                website_fetched = 1,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE company_number = ?
-        ''', (website, source, company_number))
+        cursor.execute(UPDATE_COMPANY_WEBSITE_SQL, (website, source, company_number))
         conn.commit()
         return cursor.rowcount > 0
 
 
+def save_company_contacts(company_number, emails, phones, website=None, website_source=None):
+    """
+    Save scraped emails, phones and (optionally) a website for one company in one transaction
+    
+    Returns False if the company isn't in the database
+    """
+    with get_db(persistent=True, write=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT id FROM companies WHERE company_number = ?', (company_number,))
+        row = cursor.fetchone()
+        if not row:
+            return False
+        
+        company_id = row['id']
+        if website:
+            cursor.execute(UPDATE_COMPANY_WEBSITE_SQL, (website, website_source, company_number))
+        cursor.executemany(INSERT_EMAIL_SQL, [
+            _email_row(company_id, company_number, email_data) for email_data in emails
+        ])
+        cursor.executemany(INSERT_PHONE_SQL, [
+            _phone_row(company_id, company_number, phone_data) for phone_data in phones
+        ])
+        conn.commit()
+        return True
+
+
 def update_company_phone(company_number, phone, source):
     """Update main company phone"""
-    with get_db() as conn:
+    with get_db(persistent=True, write=True) as conn:
         cursor = conn.cursor()
         cursor.execute('''
             UPDATE companies SET
@@ -666,28 +1246,33 @@ def update_company_phone(company_number, phone, source):
         return cursor.rowcount > 0
 
 
+# Row counts from the trigger-maintained summary table instead of COUNT(*) over companies
+COUNT_COMPANIES_SQL = 'SELECT IFNULL(SUM(cnt), 0) FROM companies_stats'
+COUNT_ACTIVE_COMPANIES_SQL = COUNT_COMPANIES_SQL + " WHERE company_status = 'Active'"
+ENRICHMENT_BREAKDOWN_SQL = '''
+    SELECT enrichment_status, SUM(cnt) FROM companies_stats
+    GROUP BY enrichment_status HAVING SUM(cnt) > 0
+'''
+
+
 def get_db_stats():
     """Get database statistics"""
-    with get_db() as conn:
+    with get_db(persistent=True) as conn:
         cursor = conn.cursor()
         
         stats = {}
         
         # Total companies
-        cursor.execute('SELECT COUNT(*) FROM companies')
+        cursor.execute(COUNT_COMPANIES_SQL)
         stats['total_companies'] = cursor.fetchone()[0]
         
         # Active companies
-        cursor.execute("SELECT COUNT(*) FROM companies WHERE company_status = 'Active'")
+        cursor.execute(COUNT_ACTIVE_COMPANIES_SQL)
         stats['active_companies'] = cursor.fetchone()[0]
         
-        # Enrichment status breakdown
-        cursor.execute('''
-            SELECT enrichment_status, COUNT(*) as count
-            FROM companies
-            GROUP BY enrichment_status
-        ''')
-        stats['enrichment_breakdown'] = dict(cursor.fetchall())
+        # Enrichment status breakdown (companies_stats stores NULL as '')
+        cursor.execute(ENRICHMENT_BREAKDOWN_SQL)
+        stats['enrichment_breakdown'] = {status or None: count for status, count in cursor.fetchall()}
         
         # Directors count
         cursor.execute('SELECT COUNT(*) FROM directors WHERE resigned_on IS NULL')
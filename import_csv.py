@@ -6,7 +6,10 @@ This script handles the initial import of the large Companies House CSV file (~2
 into the SQLite database. It's designed for efficiency with:
 - Batch inserts (10,000 records at a time)
 - Progress reporting
-- Memory-efficient streaming (no pandas)
+- Memory-efficient streaming with the csv module by default
+- Optional pandas C parser in large chunks (--fast)
+- Optional parsing in worker processes while this one writes (--workers)
+- Single-statement upserts via executemany
 - Resume capability (skips existing records)
 
 Usage:
@@ -14,76 +17,324 @@ Usage:
     python import_csv.py /path/to/companies.csv            # Custom CSV path
     python import_csv.py --resume                          # Resume interrupted import
     python import_csv.py --sic 69201,69203,82990,82110,70229  # Import only specific SIC codes
+    python import_csv.py --fast                            # Parse with pandas (C parser, big chunks)
+    python import_csv.py --workers 4                       # Parse in 4 processes, write in this one
 """
 
 import csv
+import io
+import json
 import os
 import sys
 import time
 import sqlite3
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 
 # Import our database module
-from database import init_db, get_db, DB_PATH
+from database import (
+    init_db, get_db, DB_PATH, create_company_indexes, drop_company_indexes,
+    create_companies_stats_triggers, drop_companies_stats_triggers, rebuild_companies_stats,
+    UPSERT_COMPANY_SQL, INSERT_COMPANY_IF_NEW_SQL, COUNT_EXISTING_COMPANIES_SQL
+)
 
 # Default CSV path
 DEFAULT_CSV = 'BasicCompanyDataAsOneFile-2025-11-01.csv'
 BATCH_SIZE = 10000
+PROGRESS_INTERVAL = 2.0  # Seconds between progress lines
+PANDAS_CHUNK_SIZE = 200000  # Rows per pandas chunk with --fast
+SPAN_BYTES = 32 * 1024 * 1024  # Bytes of CSV per worker task with --workers
+
+# Connection settings for the bulk load: WAL avoids rollback-journal double writes,
+# NORMAL sync skips the fsync per commit and the exclusive lock is taken once.
+IMPORT_PRAGMAS = '''
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -262144;
+    PRAGMA mmap_size = 30000000000;
+    PRAGMA locking_mode = EXCLUSIVE;
+    PRAGMA wal_autocheckpoint = 10000;
+'''
 
 
 def extract_year_from_date(date_str):
     """Extract year from DD/MM/YYYY format"""
-    if not date_str or '/' not in date_str:
-        return None
-    try:
-        parts = date_str.split('/')
-        if len(parts) == 3:
-            return int(parts[2])
-    except (ValueError, IndexError):
-        pass
-    return None
+    _, slash, year = date_str.rpartition('/')
+    # isdigit() alone also accepts digits like '²' that int() rejects
+    return int(year) if slash and year.isascii() and year.isdigit() else None
 
 
 def extract_sic_code(sic_text):
     """Extract just the numeric SIC code from 'CODE - Description' format"""
-    if not sic_text:
-        return None
-    sic_text = sic_text.strip().strip('"')
-    if ' - ' in sic_text:
-        return sic_text.split(' - ')[0].strip()
-    return sic_text.strip()
+    code = sic_text.partition(' - ')[0].strip(' "\t\r\n')
+    return code or None
+
 
+# Columns read from the Companies House CSV, in parse_row's unpacking order
+CSV_COLUMNS = (
+    'CompanyNumber', 'CompanyName',
+    'RegAddress.AddressLine1', 'RegAddress.AddressLine2', 'RegAddress.PostTown',
+    'RegAddress.County', 'RegAddress.PostCode',
+    'CompanyStatus', 'IncorporationDate',
+    'SICCode.SicText_1', 'SICCode.SicText_2', 'SICCode.SicText_3', 'SICCode.SicText_4',
+)
 
-def parse_row(row):
-    """Parse a CSV row into a company data dict"""
-    # Handle the weird column name with leading space
-    company_number = row.get(' CompanyNumber', row.get('CompanyNumber', '')).strip().strip('"')
+
+def column_positions(header):
+    """Resolve CSV_COLUMNS to positions in the header row (names may have a leading space)"""
+    positions = {name.strip(): i for i, name in enumerate(header)}
+    missing = [name for name in CSV_COLUMNS if name not in positions]
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+    return [positions[name] for name in CSV_COLUMNS]
+
+
+def parse_row(row, columns, csv_source):
+    """Parse a CSV row (list) into a tuple in company_row order (columns: itemgetter of column_positions)"""
+    try:
+        (company_number, company_name, address_line1, address_line2, post_town, county, postcode,
+         company_status, incorporation_date, sic_1, sic_2, sic_3, sic_4) = columns(row)
+    except IndexError:
+        return None  # Truncated row
     
+    # csv has already removed the quoting, so only whitespace needs stripping
+    company_number = company_number.strip()
     if not company_number:
         return None
     
-    incorporation_date = row.get('IncorporationDate', '').strip().strip('"')
-    
-    return {
-        'company_number': company_number,
-        'company_name': row.get('CompanyName', '').strip().strip('"'),
-        'address_line1': row.get('RegAddress.AddressLine1', row.get(' RegAddress.AddressLine1', '')).strip().strip('"'),
-        'address_line2': row.get(' RegAddress.AddressLine2', row.get('RegAddress.AddressLine2', '')).strip().strip('"'),
-        'post_town': row.get('RegAddress.PostTown', '').strip().strip('"'),
-        'county': row.get('RegAddress.County', '').strip().strip('"'),
-        'postcode': row.get('RegAddress.PostCode', '').strip().strip('"'),
-        'company_status': row.get('CompanyStatus', '').strip().strip('"'),
-        'incorporation_date': incorporation_date,
-        'incorporation_year': extract_year_from_date(incorporation_date),
-        'sic_code_1': extract_sic_code(row.get('SICCode.SicText_1', '')),
-        'sic_code_2': extract_sic_code(row.get('SICCode.SicText_2', '')),
-        'sic_code_3': extract_sic_code(row.get('SICCode.SicText_3', '')),
-        'sic_code_4': extract_sic_code(row.get('SICCode.SicText_4', '')),
-    }
-
-
-def import_csv(csv_path, sic_filter=None, resume=False):
+    incorporation_date = incorporation_date.strip()
+    
+    return (
+        company_number,
+        company_name.strip(),
+        address_line1.strip(),
+        address_line2.strip(),
+        post_town.strip(),
+        county.strip(),
+        postcode.strip(),
+        company_status.strip(),
+        incorporation_date,
+        extract_year_from_date(incorporation_date),
+        extract_sic_code(sic_1),
+        extract_sic_code(sic_2),
+        extract_sic_code(sic_3),
+        extract_sic_code(sic_4),
+        csv_source,
+    )
+
+
+def parse_csv_batches(reader, header, csv_source, sic_filter=None, batch_size=BATCH_SIZE):
+    """
+    Parse CSV rows one at a time with the csv module
+    
+    Yields (rows_read, errors, filtered_out, rows) per batch, where rows are
+    tuples in company_row order ready for insert_batch.
+    """
+    positions = column_positions(header)
+    columns = itemgetter(*positions)
+    # Just the four SIC columns, so filtered-out rows are rejected before parse_row
+    sic_columns = itemgetter(*positions[CSV_COLUMNS.index('SICCode.SicText_1'):])
+    sic_filter = frozenset(sic_filter) if sic_filter else None
+    rows_read = errors = filtered_out = 0
+    batch = []
+    
+    for row in reader:
+        rows_read += 1
+        
+        # Apply SIC filter if specified
+        if sic_filter:
+            try:
+                sics = sic_columns(row)
+            except IndexError:
+                errors += 1  # Truncated row
+                continue
+            if sic_filter.isdisjoint(map(extract_sic_code, sics)):
+                filtered_out += 1
+                continue
+        
+        # Parse the row
+        company = parse_row(row, columns, csv_source)
+        if not company:
+            errors += 1
+            continue
+        
+        batch.append(company)
+        
+        if len(batch) >= batch_size:
+            yield rows_read, errors, filtered_out, batch
+            rows_read = errors = filtered_out = 0
+            batch = []
+    
+    if rows_read:
+        yield rows_read, errors, filtered_out, batch
+
+
+def record_spans(csv_path, span_bytes=SPAN_BYTES):
+    """
+    Split the CSV's data rows into (start, end) byte spans of roughly span_bytes
+    
+    Each span ends where a record ends, never inside a quoted multi-line field. Escaped
+    quotes come in pairs, so a newline ends a record exactly when the number of '"'
+    bytes since the header is even - a cheap count, not a second CSV parse.
+    """
+    with open(csv_path, 'rb') as f:
+        f.readline()  # Header
+        start = position = f.tell()
+        quotes = 0
+        while True:
+            block = f.read(span_bytes)
+            if not block:
+                break
+            quotes += block.count(b'"')
+            position += len(block)
+            # Finish the line the block stopped in, then any lines still inside quotes
+            while True:
+                line = f.readline()
+                quotes += line.count(b'"')
+                position += len(line)
+                if not line or quotes % 2 == 0:
+                    break
+            yield start, position
+            start = position
+
+
+def parse_csv_span(csv_path, start, end, header, csv_source, sic_filter=None):
+    """
+    Parse the records in bytes [start, end) of the CSV (--workers)
+    
+    start and end come from record_spans, so they fall on record boundaries.
+    Runs in a worker process; returns (rows_read, errors, filtered_out, rows)
+    like one parse_csv_batches batch.
+    """
+    with open(csv_path, 'rb') as f:
+        f.seek(start)
+        lines = [line.decode('utf-8', 'ignore') for line in io.BytesIO(f.read(end - start))]
+    
+    batches = parse_csv_batches(csv.reader(lines), header, csv_source,
+                                sic_filter, batch_size=len(lines) + 1)
+    return next(batches, (0, 0, 0, []))
+
+
+def parse_csv_parallel(csv_path, header, csv_source, sic_filter=None, workers=None,
+                       span_bytes=SPAN_BYTES):
+    """
+    Parse the CSV in record-aligned byte spans across worker processes
+    
+    Yields (rows_read, errors, filtered_out, rows) per span in file order, with at
+    most two spans per worker in flight so memory stays bounded while the caller writes.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        max_pending = 2 * workers
+        for start, end in record_spans(csv_path, span_bytes):
+            pending.append(pool.submit(parse_csv_span, csv_path, start, end, header, csv_source, sic_filter))
+            if len(pending) >= max_pending:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def short_records(csv_path, width, span_bytes=SPAN_BYTES):
+    """
+    Numbers of the data records with fewer than width fields, counted as pandas numbers rows
+    
+    pandas pads a short row with empty fields, so --fast can't tell a truncated record from
+    one whose trailing fields are blank. Like record_spans this counts '"' bytes: a ',' or
+    newline separates fields when an even number of quotes come before it. Blank lines are
+    skipped, as pandas skips them.
+    """
+    import numpy as np  # Only needed for --fast
+    
+    short = []
+    first_record = 0
+    with open(csv_path, 'rb') as f:
+        for start, end in record_spans(csv_path, span_bytes):
+            f.seek(start)
+            data = np.frombuffer(f.read(end - start), np.uint8)
+            unquoted = np.cumsum(data == ord('"'), dtype=np.uint8) % 2 == 0
+            ends = np.flatnonzero(unquoted & (data == ord('\n')))
+            if data[-1] != ord('\n'):
+                ends = np.append(ends, len(data))  # Last record, without a trailing newline
+            
+            bounds = np.concatenate(([-1], ends))
+            fields = np.diff(np.searchsorted(np.flatnonzero(unquoted & (data == ord(','))), bounds)) + 1
+            visible = np.concatenate(([0], np.cumsum(~np.isin(data, list(b' \t\r\n')))))
+            fields = fields[np.diff(visible[np.minimum(bounds + 1, len(data))]) > 0]
+            
+            short.extend(first_record + np.flatnonzero(fields < width))
+            first_record += len(fields)
+    return short
+
+
+def read_csv_batches(csv_path, header, csv_source, sic_filter=None, chunksize=PANDAS_CHUNK_SIZE):
+    """
+    Parse the CSV column-wise with pandas (--fast)
+    
+    Yields (rows_read, errors, filtered_out, rows) per chunk, where rows are
+    tuples in company_row order ready for insert_batch.
+    """
+    import pandas as pd  # Only needed for --fast
+    
+    positions = column_positions(header)
+    # Records too short to reach every column are errors, as they are for parse_csv_batches
+    truncated = short_records(csv_path, max(positions) + 1)
+    
+    chunks = pd.read_csv(
+        csv_path, usecols=positions, dtype=str, na_filter=False,
+        chunksize=chunksize, engine='c', encoding='utf-8', encoding_errors='ignore'
+    )
+    for chunk in chunks:
+        chunk.columns = chunk.columns.str.strip()
+        df = chunk[list(CSV_COLUMNS)].apply(lambda column: column.str.strip())
+        rows_read = len(df)
+        
+        df = df[(df['CompanyNumber'] != '') & ~df.index.isin(truncated)]
+        errors = rows_read - len(df)
+        
+        # 'CODE - Description' -> 'CODE', blank -> None
+        sic_columns = ['sic_code_1', 'sic_code_2', 'sic_code_3', 'sic_code_4']
+        for i, column in enumerate(sic_columns, 1):
+            codes = df[f'SICCode.SicText_{i}'].str.partition(' - ')[0].str.strip()
+            df[column] = codes.where(codes != '', None)
+        
+        filtered_out = 0
+        if sic_filter:
+            keep = df[sic_columns].isin(sic_filter).any(axis=1)
+            filtered_out = len(df) - int(keep.sum())
+            df = df[keep]
+        
+        # DD/MM/YYYY -> 'YYYY'; the INTEGER column affinity stores it as a number
+        dates = df['IncorporationDate']
+        years = dates.str.rpartition('/')[2]
+        
+        out = pd.DataFrame({
+            'company_number': df['CompanyNumber'],
+            'company_name': df['CompanyName'],
+            'address_line1': df['RegAddress.AddressLine1'],
+            'address_line2': df['RegAddress.AddressLine2'],
+            'post_town': df['RegAddress.PostTown'],
+            'county': df['RegAddress.County'],
+            'postcode': df['RegAddress.PostCode'],
+            'company_status': df['CompanyStatus'],
+            'incorporation_date': dates,
+            'incorporation_year': years.where((dates.str.count('/') == 2) & years.str.fullmatch('[0-9]+'), None),
+            'sic_code_1': df['sic_code_1'],
+            'sic_code_2': df['sic_code_2'],
+            'sic_code_3': df['sic_code_3'],
+            'sic_code_4': df['sic_code_4'],
+            'csv_source': csv_source,
+        }).astype(object)
+        out = out.where(out.notna(), None)
+        
+        yield rows_read, errors, filtered_out, list(out.itertuples(index=False, name=None))
+
+
+def import_csv(csv_path, sic_filter=None, resume=False, fast=False, workers=1):
     """
     Import companies from CSV into database
     
@@ -91,6 +342,8 @@ def import_csv(csv_path, sic_filter=None, resume=False):
         csv_path: Path to the Companies House CSV file
         sic_filter: Optional list of SIC codes to filter by (e.g., ['69201', '69203'])
         resume: If True, skip existing records (for resuming interrupted import)
+        fast: If True, parse the CSV column-wise with pandas instead of row by row
+        workers: Parse with this many processes (this process only writes to SQLite)
     """
     print(f"\n📊 Company Data Import Tool")
     print(f"=" * 50)
@@ -101,6 +354,10 @@ def import_csv(csv_path, sic_filter=None, resume=False):
         print(f"SIC Filter: {', '.join(sic_filter)}")
     if resume:
         print(f"Resume Mode: ON (skipping existing records)")
+    if fast:
+        print(f"Fast Mode: ON (pandas chunks of {PANDAS_CHUNK_SIZE:,})")
+    elif workers > 1:
+        print(f"Parser Workers: {workers}")
     print(f"=" * 50)
     
     # Check if CSV exists
@@ -116,7 +373,7 @@ def import_csv(csv_path, sic_filter=None, resume=False):
     init_db()
     
     # Track progress
-    start_time = time.time()
+    start_time = last_print = time.monotonic()
     processed = 0
     inserted = 0
     updated = 0
@@ -124,50 +381,54 @@ def import_csv(csv_path, sic_filter=None, resume=False):
     filtered_out = 0
     errors = 0
     
-    # Prepare batch insert
-    batch = []
     csv_source = os.path.basename(csv_path)
     
     try:
         with open(csv_path, 'r', encoding='utf-8', errors='ignore') as f:
-            reader = csv.DictReader(f)
+            # One front-to-back pass over a multi-GB file: ask the kernel for aggressive read-ahead
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            reader = csv.reader(f)
+            try:
+                header = next(reader)
+                column_positions(header)  # Fail early on an unexpected header
+            except (StopIteration, ValueError) as e:
+                print(f"❌ Unrecognised CSV header: {str(e) or 'file is empty'}")
+                sys.exit(1)
+            
+            if fast:
+                batches = read_csv_batches(csv_path, header, csv_source, sic_filter)
+            elif workers > 1:
+                batches = parse_csv_parallel(csv_path, header, csv_source, sic_filter, workers)
+            else:
+                batches = parse_csv_batches(reader, header, csv_source, sic_filter)
             
             with get_db() as conn:
+                conn.executescript(IMPORT_PRAGMAS)
+                conn.isolation_level = None  # insert_batch runs one explicit transaction per batch
                 cursor = conn.cursor()
                 
-                for row in reader:
-                    processed += 1
-                    
-                    # Parse the row
-                    company = parse_row(row)
-                    if not company:
-                        errors += 1
-                        continue
-                    
-                    # Apply SIC filter if specified
-                    if sic_filter:
-                        sics = [company['sic_code_1'], company['sic_code_2'], 
-                                company['sic_code_3'], company['sic_code_4']]
-                        if not any(sic in sic_filter for sic in sics if sic):
-                            filtered_out += 1
-                            continue
-                    
-                    # Add to batch
-                    batch.append(company)
-                    
-                    # Process batch when full
-                    if len(batch) >= BATCH_SIZE:
-                        batch_inserted, batch_updated, batch_skipped = insert_batch(
-                            cursor, batch, csv_source, resume
-                        )
+                # Only the PK/UNIQUE B-trees are maintained while loading; the rest are rebuilt
+                # once, and companies_stats is recounted once instead of by a trigger per row
+                drop_company_indexes(cursor)
+                drop_companies_stats_triggers(cursor)
+                try:
+                    for rows_read, batch_errors, batch_filtered, batch in batches:
+                        processed += rows_read
+                        errors += batch_errors
+                        filtered_out += batch_filtered
+                        
+                        batch_inserted, batch_updated, batch_skipped = insert_batch(cursor, batch, resume)
                         inserted += batch_inserted
                         updated += batch_updated
                         skipped += batch_skipped
-                        conn.commit()
-                        batch = []
                         
-                        # Progress update
-                        elapsed = time.time() - start_time
+                        # Progress update, at most once every PROGRESS_INTERVAL seconds
+                        now = time.monotonic()
+                        if now - last_print < PROGRESS_INTERVAL:
+                            continue
+                        last_print = now
+                        elapsed = now - start_time
                         rate = processed / elapsed if elapsed > 0 else 0
                         # Estimate ~5.6M records total for Companies House CSV
                         estimated_total = 5600000
@@ -177,30 +438,31 @@ def import_csv(csv_path, sic_filter=None, resume=False):
                         print(f"\r⏳ Processed: {processed:,} | Inserted: {inserted:,} | "
                               f"Updated: {updated:,} | Skipped: {skipped:,} | "
                               f"Rate: {rate:,.0f}/sec | ETA: {eta/60:.1f}min", end='')
-                
-                # Insert remaining batch
-                if batch:
-                    batch_inserted, batch_updated, batch_skipped = insert_batch(
-                        cursor, batch, csv_source, resume
-                    )
-                    inserted += batch_inserted
-                    updated += batch_updated
-                    skipped += batch_skipped
-                    conn.commit()
+                finally:
+                    if conn.in_transaction:
+                        cursor.execute('ROLLBACK')
+                    print(f"\n🔨 Rebuilding indexes...")
+                    create_company_indexes(cursor)
+                    cursor.execute('ANALYZE companies')
+                    create_companies_stats_triggers(cursor)
+                    rebuild_companies_stats(cursor)
+                    
+                    # Fold the WAL back into the main database file
+                    cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
     
     except KeyboardInterrupt:
         print("\n\n⚠️  Import interrupted by user")
         print(f"   Progress saved. Use --resume to continue.")
     
     # Final stats
-    elapsed = time.time() - start_time
+    elapsed = time.monotonic() - start_time
     print(f"\n\n{'=' * 50}")
     print(f"✅ Import Complete!")
     print(f"=" * 50)
     print(f"📊 Total processed: {processed:,}")
     print(f"➕ Inserted: {inserted:,}")
     print(f"🔄 Updated: {updated:,}")
-    print(f"⏭️  Skipped (existing): {skipped:,}")
+    print(f"⏭️  Skipped (existing/unchanged): {skipped:,}")
     if sic_filter:
         print(f"🚫 Filtered out: {filtered_out:,}")
     print(f"⚠️  Errors: {errors:,}")
@@ -208,95 +470,50 @@ def import_csv(csv_path, sic_filter=None, resume=False):
     print(f"💾 Database size: {os.path.getsize(DB_PATH) / (1024**2):.1f} MB")
 
 
-def insert_batch(cursor, batch, csv_source, resume=False):
-    """Insert a batch of companies using INSERT OR IGNORE / UPDATE"""
-    inserted = 0
-    updated = 0
-    skipped = 0
+def insert_batch(cursor, rows, resume=False):
+    """Insert a batch of company_row tuples with one executemany (upsert, or insert-if-new on resume)"""
+    if not rows:
+        return 0, 0, 0
     
-    for company in batch:
-        try:
-            if resume:
-                # Check if exists
-                cursor.execute('SELECT id FROM companies WHERE company_number = ?', 
-                               (company['company_number'],))
-                if cursor.fetchone():
-                    skipped += 1
-                    continue
-            
-            # Try insert first
-            cursor.execute('''
-                INSERT OR IGNORE INTO companies (
-                    company_number, company_name,
-                    address_line1, address_line2, post_town, county, postcode,
-                    company_status, incorporation_date, incorporation_year,
-                    sic_code_1, sic_code_2, sic_code_3, sic_code_4,
-                    enrichment_status, csv_source, csv_import_date
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'not_attempted', ?, CURRENT_TIMESTAMP)
-            ''', (
-                company['company_number'],
-                company['company_name'],
-                company['address_line1'],
-                company['address_line2'],
-                company['post_town'],
-                company['county'],
-                company['postcode'],
-                company['company_status'],
-                company['incorporation_date'],
-                company['incorporation_year'],
-                company['sic_code_1'],
-                company['sic_code_2'],
-                company['sic_code_3'],
-                company['sic_code_4'],
-                csv_source
-            ))
-            
-            if cursor.rowcount > 0:
-                inserted += 1
-            else:
-                # Record exists, update basic fields (preserve enrichment data)
-                cursor.execute('''
-                    UPDATE companies SET
-                        company_name = ?,
-                        address_line1 = ?,
-                        address_line2 = ?,
-                        post_town = ?,
-                        county = ?,
-                        postcode = ?,
-                        company_status = ?,
-                        incorporation_date = ?,
-                        incorporation_year = ?,
-                        sic_code_1 = ?,
-                        sic_code_2 = ?,
-                        sic_code_3 = ?,
-                        sic_code_4 = ?,
-                        updated_at = CURRENT_TIMESTAMP,
-                        csv_source = ?,
-                        csv_import_date = CURRENT_TIMESTAMP
-                    WHERE company_number = ?
-                ''', (
-                    company['company_name'],
-                    company['address_line1'],
-                    company['address_line2'],
-                    company['post_town'],
-                    company['county'],
-                    company['postcode'],
-                    company['company_status'],
-                    company['incorporation_date'],
-                    company['incorporation_year'],
-                    company['sic_code_1'],
-                    company['sic_code_2'],
-                    company['sic_code_3'],
-                    company['sic_code_4'],
-                    csv_source,
-                    company['company_number']
-                ))
-                updated += 1
-                
-        except sqlite3.Error as e:
-            print(f"\n⚠️  Error inserting {company['company_number']}: {e}")
+    # Take the write lock once for the whole batch
+    cursor.execute('BEGIN IMMEDIATE')
+    if resume:
+        sql = INSERT_COMPANY_IF_NEW_SQL
+        existing = 0
+    else:
+        # Existing records get changed basic fields updated (enrichment data preserved)
+        sql = UPSERT_COMPANY_SQL
+        cursor.execute(COUNT_EXISTING_COMPANIES_SQL, (json.dumps([row[0] for row in rows]),))
+        existing = cursor.fetchone()[0]
+    
+    failed_new = 0
+    cursor.execute('SAVEPOINT insert_batch')
+    try:
+        cursor.executemany(sql, rows)
+        written = cursor.rowcount
+    except sqlite3.Error:
+        # Undo the rows executemany wrote before it failed, then re-run the batch
+        # row by row so one bad record doesn't lose the rest
+        cursor.execute('ROLLBACK TO insert_batch')
+        written = 0
+        for row in rows:
+            try:
+                cursor.execute(sql, row)
+                written += cursor.rowcount
+            except sqlite3.Error as e:
+                print(f"\n⚠️  Error inserting {row[0]}: {e}")
+        if not resume:
+            # Rows that failed weren't inserted, so count what actually landed
+            cursor.execute(COUNT_EXISTING_COMPANIES_SQL, (json.dumps([row[0] for row in rows]),))
+            failed_new = len(rows) - cursor.fetchone()[0]
+    cursor.execute('RELEASE insert_batch')
+    cursor.execute('COMMIT')
     
-    return inserted, updated, skipped
+    if resume:
+        return written, 0, len(rows) - written
+    # Existing rows whose basic fields are unchanged aren't rewritten, so count them as skipped
+    inserted = len(rows) - existing - failed_new
+    return inserted, written - inserted, existing - (written - inserted)
 
 
 def main():
@@ -310,6 +527,10 @@ def main():
                         help='Resume interrupted import (skip existing records)')
     parser.add_argument('--sic', type=str,
                         help='Comma-separated SIC codes to filter (e.g., 69201,69203)')
+    parser.add_argument('--fast', action='store_true',
+                        help='Parse the CSV with pandas in large chunks (requires pandas)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parse the CSV with this many processes (e.g., 4)')
     
     args = parser.parse_args()
     
@@ -317,7 +538,8 @@ def main():
     if args.sic:
         sic_filter = [s.strip() for s in args.sic.split(',')]
     
-    import_csv(args.csv_path, sic_filter=sic_filter, resume=args.resume)
+    import_csv(args.csv_path, sic_filter=sic_filter, resume=args.resume, fast=args.fast,
+               workers=args.workers)
 
 
 if __name__ == '__main__':
@@ -11,10 +11,53 @@ Usage:
 """
 
 import csv
+import json
 import os
 import sys
 import glob
-from database import get_db, add_director, add_email, update_company_website
+from database import init_db, get_db, split_director_name
+
+# Look up every company in a file at once (numbers passed as a JSON array)
+LOOKUP_COMPANIES_SQL = '''
+    SELECT company_number, id, website
+    FROM companies WHERE company_number IN (SELECT value FROM json_each(?))
+'''
+
+# Emails already stored for the file's companies, so new ones can be told apart up front
+EXISTING_EMAILS_SQL = '''
+    SELECT company_number, email_norm
+    FROM emails WHERE company_number IN (SELECT value FROM json_each(?))
+'''
+
+UPDATE_WEBSITE_SQL = '''
+    UPDATE companies SET website = ?, website_source = ?, website_fetched = 1
+    WHERE id = ?
+'''
+
+INSERT_DIRECTOR_SQL = '''
+    INSERT OR IGNORE INTO directors 
+    (company_id, company_number, name, first_name, last_name, officer_role)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_EMAIL_SQL = '''
+    INSERT OR IGNORE INTO emails 
+    (company_id, company_number, email, source, source_label, 
+     verified, verification_status, verification_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# One set-based update per file; the three parameters are JSON arrays of company ids
+# (updated, got directors, got emails), so no EXISTS lookups are needed
+UPDATE_STATUS_SQL = '''
+    UPDATE companies SET 
+        enrichment_status = 'success',
+        directors_fetched = CASE WHEN id IN (SELECT value FROM json_each(?2)) THEN 1 ELSE directors_fetched END,
+        emails_fetched = CASE WHEN id IN (SELECT value FROM json_each(?3)) THEN 1 ELSE emails_fetched END,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id IN (SELECT value FROM json_each(?1))
+'''
+
 
 def parse_director_name(name_str):
     """Parse director name from 'LASTNAME, Firstname' format"""
@@ -22,158 +65,147 @@ def parse_director_name(name_str):
         return None
     
     name = name_str.strip()
-    if ',' in name:
-        parts = name.split(',')
-        last_name = parts[0].strip()
-        first_name = parts[1].strip().split()[0] if len(parts) > 1 else ''
-        return {
-            'name': name,
-            'first_name': first_name,
-            'last_name': last_name,
-            'role': 'director'
-        }
-    else:
-        parts = name.split()
-        return {
-            'name': name,
-            'first_name': parts[0] if parts else '',
-            'last_name': parts[-1] if len(parts) > 1 else '',
-            'role': 'director'
-        }
+    first_name, last_name = split_director_name(name)
+    return {
+        'name': name,
+        'first_name': first_name,
+        'last_name': last_name,
+        'role': 'director'
+    }
 
 
 def import_enriched_csv(csv_path):
     """Import enriched data from a single CSV file"""
     print(f"\n📄 Importing: {os.path.basename(csv_path)}")
     
-    companies_updated = 0
-    directors_added = 0
-    emails_added = 0
-    websites_added = 0
     not_found = 0
     
+    # Rows are collected for the whole file and written with one executemany each
+    website_rows = []
+    director_rows = []
+    email_rows = []
+    updated_ids = set()
+    director_ids = set()
+    email_ids = set()
+    
     with get_db() as conn:
+        conn.row_factory = None  # Plain tuples - rows are only read by position here
         cursor = conn.cursor()
         
         with open(csv_path, 'r', encoding='utf-8', errors='ignore') as f:
-            reader = csv.DictReader(f)
+            rows = list(csv.DictReader(f))
+        
+        # Find all of the file's companies (and their stored emails) with one query each
+        numbers = json.dumps(list({row.get('Company Number', '').strip() for row in rows}))
+        cursor.execute(LOOKUP_COMPANIES_SQL, (numbers,))
+        # company_number -> [id, website]; website is kept current as rows fill it in
+        companies = {number: [company_id, website] for number, company_id, website in cursor.fetchall()}
+        cursor.execute(EXISTING_EMAILS_SQL, (numbers,))
+        known_emails = set(cursor.fetchall())
+        
+        for row in rows:
+            company_number = row.get('Company Number', '').strip()
+            if not company_number:
+                continue
+            
+            company = companies.get(company_number)
+            if not company:
+                not_found += 1
+                continue
+            
+            company_id, current_website = company
+            added_website = added_directors = added_emails = False
             
-            for row in reader:
-                company_number = row.get('Company Number', '').strip()
-                if not company_number:
-                    continue
-                
-                # Find company in database
-                cursor.execute('''
-                    SELECT id, website, enrichment_status 
-                    FROM companies WHERE company_number = ?
-                ''', (company_number,))
-                company = cursor.fetchone()
-                
-                if not company:
-                    not_found += 1
-                    continue
-                
-                company_id = company['id']
-                updated = False
-                
-                # Import website if we have one and database doesn't
-                website = row.get('Website', '').strip()
-                website_source = row.get('Website Source', '').strip()
-                if website and not company['website']:
-                    cursor.execute('''
-                        UPDATE companies SET website = ?, website_source = ?, website_fetched = 1
-                        WHERE id = ?
-                    ''', (website, website_source or 'imported', company_id))
-                    websites_added += 1
-                    updated = True
-                
-                # Import directors
-                for i in range(1, 4):  # Director 1, 2, 3
-                    director_name = row.get(f'Director {i}', '').strip()
-                    if director_name:
-                        director = parse_director_name(director_name)
-                        if director:
-                            cursor.execute('''
-                                INSERT OR IGNORE INTO directors 
-                                (company_id, company_number, name, first_name, last_name, officer_role)
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            ''', (
-                                company_id, company_number,
-                                director['name'], director['first_name'], 
-                                director['last_name'], director['role']
-                            ))
-                            if cursor.rowcount > 0:
-                                directors_added += 1
-                                updated = True
-                
-                # Import emails (up to 5)
-                for i in range(1, 6):
-                    email = row.get(f'Email {i}', '').strip()
-                    if email and '@' in email:
-                        source = row.get(f'Email {i} Source', 'imported').strip()
-                        verified = row.get(f'Email {i} Verified', '').strip()
-                        score = row.get(f'Email {i} Score', '').strip()
-                        
-                        # Determine verification status
-                        is_verified = 0
-                        verification_status = None
-                        verification_score = None
-                        
-                        if verified and verified.lower() not in ['not verified', '']:
-                            is_verified = 1
-                            if 'valid' in verified.lower():
-                                verification_status = 'valid'
-                            elif 'invalid' in verified.lower():
-                                verification_status = 'invalid'
-                            elif 'accept' in verified.lower() or 'risky' in verified.lower():
-                                verification_status = 'accept_all'
-                        
-                        if score and score.isdigit():
-                            verification_score = int(score)
-                        
-                        # Map source labels back to source codes
-                        source_code = source.lower()
-                        if 'hunter' in source_code:
-                            source_code = 'hunter'
-                        elif 'website' in source_code:
-                            source_code = 'website_scrape'
-                        elif 'import' in source_code:
-                            source_code = 'imported'
-                        else:
-                            source_code = 'imported'
-                        
-                        cursor.execute('''
-                            INSERT OR IGNORE INTO emails 
-                            (company_id, company_number, email, source, source_label, 
-                             verified, verification_status, verification_score)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            company_id, company_number, email.lower(),
-                            source_code, source,
-                            is_verified, verification_status, verification_score
+            # Import website if we have one and database doesn't
+            website = row.get('Website', '').strip()
+            website_source = row.get('Website Source', '').strip()
+            if website and not current_website:
+                website_rows.append((website, website_source or 'imported', company_id))
+                company[1] = website
+                added_website = True
+            
+            # Import directors
+            for i in range(1, 4):  # Director 1, 2, 3
+                director_name = row.get(f'Director {i}', '').strip()
+                if director_name:
+                    director = parse_director_name(director_name)
+                    if director:
+                        director_rows.append((
+                            company_id, company_number,
+                            director['name'], director['first_name'], 
+                            director['last_name'], director['role']
                         ))
-                        if cursor.rowcount > 0:
-                            emails_added += 1
-                            updated = True
-                
-                # Update enrichment status if we added data
-                if updated:
-                    cursor.execute('''
-                        UPDATE companies SET 
-                            enrichment_status = 'success',
-                            directors_fetched = CASE WHEN EXISTS(
-                                SELECT 1 FROM directors WHERE company_id = ?
-                            ) THEN 1 ELSE directors_fetched END,
-                            emails_fetched = CASE WHEN EXISTS(
-                                SELECT 1 FROM emails WHERE company_id = ?
-                            ) THEN 1 ELSE emails_fetched END,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                    ''', (company_id, company_id, company_id))
-                    companies_updated += 1
+                        added_directors = True
+            
+            # Import emails (up to 5)
+            for i in range(1, 6):
+                email = row.get(f'Email {i}', '').strip()
+                if email and '@' in email:
+                    email = email.lower()
+                    if (company_number, email) in known_emails:
+                        continue  # Already stored (or earlier in this file)
+                    known_emails.add((company_number, email))
+                    
+                    source = row.get(f'Email {i} Source', 'imported').strip()
+                    verified = row.get(f'Email {i} Verified', '').strip()
+                    score = row.get(f'Email {i} Score', '').strip()
+                    
+                    # Determine verification status
+                    is_verified = 0
+                    verification_status = None
+                    verification_score = None
+                    
+                    verified = verified.lower()
+                    if verified and verified != 'not verified':
+                        is_verified = 1
+                        if 'valid' in verified:
+                            verification_status = 'valid'
+                        elif 'invalid' in verified:
+                            verification_status = 'invalid'
+                        elif 'accept' in verified or 'risky' in verified:
+                            verification_status = 'accept_all'
+                    
+                    if score and score.isdigit():
+                        verification_score = int(score)
+                    
+                    # Map source labels back to source codes
+                    source_code = source.lower()
+                    if 'hunter' in source_code:
+                        source_code = 'hunter'
+                    elif 'website' in source_code:
+                        source_code = 'website_scrape'
+                    elif 'import' in source_code:
+                        source_code = 'imported'
+                    else:
+                        source_code = 'imported'
+                    
+                    email_rows.append((
+                        company_id, company_number, email,
+                        source_code, source,
+                        is_verified, verification_status, verification_score
+                    ))
+                    added_emails = True
             
-            conn.commit()
+            # Update enrichment status if we added data
+            if added_website or added_directors or added_emails:
+                updated_ids.add(company_id)
+            if added_directors:
+                director_ids.add(company_id)
+            if added_emails:
+                email_ids.add(company_id)
+        
+        cursor.executemany(UPDATE_WEBSITE_SQL, website_rows)
+        cursor.executemany(INSERT_DIRECTOR_SQL, director_rows)
+        directors_added = cursor.rowcount
+        cursor.executemany(INSERT_EMAIL_SQL, email_rows)
+        emails_added = cursor.rowcount
+        cursor.execute(UPDATE_STATUS_SQL, (
+            json.dumps(list(updated_ids)), json.dumps(list(director_ids)), json.dumps(list(email_ids))
+        ))
+        conn.commit()
+    
+    companies_updated = len(updated_ids)
+    websites_added = len(website_rows)
     
     print(f"   ✅ Companies updated: {companies_updated}")
     print(f"   👤 Directors added: {directors_added}")
@@ -212,6 +244,9 @@ def main():
     
     print(f"Found {len(files)} file(s) to import")
     
+    # Bring an older database up to the current schema (email_norm, summary table) first
+    init_db()
+    
     # Track totals
     totals = {
         'companies': 0,
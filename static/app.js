@@ -0,0 +1,1126 @@
+let companies = [];
+let companyIndexByNumber = new Map();  // company_number -> index in companies
+let enrichedCount = 0;
+let totalDirectors = 0;
+let totalDomains = 0;
+let totalEmails = 0;
+let totalPhones = 0;
+
+// Index the results by company number once per search/import, so applying each enrichment
+// result is a map lookup instead of a scan of up to 5000 companies
+function setCompanies(list) {
+    companies = list;
+    companyIndexByNumber = new Map();
+    companies.forEach((c, index) => {
+        if (!companyIndexByNumber.has(c.company_number)) companyIndexByNumber.set(c.company_number, index);
+    });
+}
+
+function findCompanyIndex(companyNumber) {
+    const index = companyIndexByNumber.get(companyNumber);
+    return index === undefined ? -1 : index;
+}
+
+// Load SIC codes on page load
+async function loadSicCodes() {
+    try {
+        const response = await fetch('/api/sic-codes');
+        const data = await response.json();
+        
+        // Load favorites
+        const favGroup = document.getElementById('favorites-group');
+        if (favGroup && data.favorites) {
+            favGroup.replaceChildren();
+            data.favorites.forEach((fav, index) => {
+                const option = document.createElement('option');
+                option.value = fav.id;
+                option.textContent = fav.name;
+                if (index === 0) option.selected = true;
+                favGroup.appendChild(option);
+            });
+        }
+        
+        // Load all SIC codes with descriptions
+        const sicGroup = document.getElementById('all-sics-group');
+        if (sicGroup && data.all_sics) {
+            // Options are built off-DOM and swapped in with one call (no HTML parsing involved)
+            const options = document.createDocumentFragment();
+            data.all_sics.forEach(sic => {
+                const option = document.createElement('option');
+                option.value = sic.code;
+                // Format: "69201 - Accounting & Auditing (12,345)"
+                const desc = sic.description !== 'Unknown' ? sic.description : '';
+                option.textContent = desc 
+                    ? `${sic.code} - ${desc} (${sic.count.toLocaleString()})`
+                    : `${sic.code} (${sic.count.toLocaleString()})`;
+                options.appendChild(option);
+            });
+            sicGroup.replaceChildren(options);
+            
+            console.log(`Loaded ${data.total_sic_codes} SIC codes`);
+        }
+    } catch (error) {
+        console.error('Error loading SIC codes:', error);
+    }
+}
+
+// Load SIC codes when page loads
+document.addEventListener('DOMContentLoaded', loadSicCodes);
+
+async function importCSV(event) {
+    const file = event.target.files[0];
+    if (!file) return;
+    
+    const reader = new FileReader();
+    reader.onload = async function(e) {
+        const text = e.target.result;
+        const lines = text.split('\n').filter(line => line.trim());
+        
+        if (lines.length < 2) {
+            showToast('CSV must have a header row and at least one data row', 'error');
+            return;
+        }
+        
+        // Parse header to find column indices
+        const header = lines[0].toLowerCase().split(',').map(h => h.trim().replace(/"/g, ''));
+        const nameIdx = header.findIndex(h => h.includes('name') || h.includes('company'));
+        const emailIdx = header.findIndex(h => h.includes('email'));
+        const locationIdx = header.findIndex(h => h.includes('location') || h.includes('address') || h.includes('postcode'));
+        const websiteIdx = header.findIndex(h => h.includes('website') || h.includes('domain') || h.includes('url'));
+        
+        if (nameIdx === -1) {
+            showToast('CSV must have a column containing "name" or "company"', 'error');
+            return;
+        }
+        
+        // Parse data rows
+        const importedCompanies = [];
+        for (let i = 1; i < lines.length; i++) {
+            const cols = parseCSVLine(lines[i]);
+            if (cols.length > nameIdx && cols[nameIdx].trim()) {
+                importedCompanies.push({
+                    import_name: cols[nameIdx].trim().replace(/"/g, ''),
+                    import_email: emailIdx !== -1 && cols[emailIdx] ? cols[emailIdx].trim().replace(/"/g, '') : '',
+                    import_location: locationIdx !== -1 && cols[locationIdx] ? cols[locationIdx].trim().replace(/"/g, '') : '',
+                    import_website: websiteIdx !== -1 && cols[websiteIdx] ? cols[websiteIdx].trim().replace(/"/g, '') : ''
+                });
+            }
+        }
+        
+        if (importedCompanies.length === 0) {
+            showToast('No valid company names found in CSV', 'error');
+            return;
+        }
+        
+        // Show processing status
+        showProcessing('Matching Companies', importedCompanies.length);
+        updateProcessing(0, importedCompanies.length, 'Searching Companies House...', 0);
+        
+        // Send to backend to match against Companies House data
+        try {
+            const response = await fetch('/api/import-match', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ companies: importedCompanies })
+            });
+            
+            const data = await response.json();
+            hideProcessing();
+            
+            if (data.error) {
+                showToast(data.error, 'error');
+                return;
+            }
+            
+            setCompanies(data.companies.map(c => ({
+                ...c,
+                phones: c.phones || [],
+                emails: c.emails || [],
+                directors: c.directors || []
+            })));
+            enrichedCount = 0;
+            totalDirectors = 0;
+            totalDomains = 0;
+            totalEmails = 0;
+            totalPhones = 0;
+            
+            // Count pre-existing data
+            companies.forEach(c => {
+                if (c.emails && c.emails.length) totalEmails += c.emails.length;
+                if (c.phones && c.phones.length) totalPhones += c.phones.length;
+                if (c.domain) totalDomains++;
+            });
+            
+            renderResults();
+            updateStats();
+            
+            document.getElementById('stats-bar').style.display = 'flex';
+            document.getElementById('empty-state').style.display = companies.length ? 'none' : 'block';
+            document.getElementById('enrich-btn').disabled = !companies.length;
+            document.getElementById('domain-btn').disabled = !companies.length;
+            document.getElementById('email-free-btn').disabled = !companies.length;
+            document.getElementById('email-btn').disabled = !companies.length;
+            document.getElementById('verify-btn').disabled = true;  // Enable only after finding emails
+            document.getElementById('export-btn').disabled = !companies.length;
+            document.getElementById('export-clean-btn').disabled = !companies.length;
+            
+            let msg = `Matched ${data.matched} of ${data.total} companies`;
+            if (data.matched_via_api > 0) {
+                msg += ` (${data.matched_via_api} via API search)`;
+            }
+            if (data.not_found > 0) {
+                msg += ` - ${data.not_found} not found`;
+            }
+            showToast(msg, 'success');
+            
+        } catch (error) {
+            hideProcessing();
+            showToast('Error importing: ' + error.message, 'error');
+        }
+    };
+    
+    reader.readAsText(file);
+    event.target.value = ''; // Reset file input
+}
+
+function parseCSVLine(line) {
+    // Simple CSV parser that handles quoted fields
+    const result = [];
+    let current = '';
+    let inQuotes = false;
+    
+    for (let i = 0; i < line.length; i++) {
+        const char = line[i];
+        if (char === '"') {
+            inQuotes = !inQuotes;
+        } else if (char === ',' && !inQuotes) {
+            result.push(current);
+            current = '';
+        } else {
+            current += char;
+        }
+    }
+    result.push(current);
+    return result;
+}
+
+async function searchCompanies() {
+    const sic = document.getElementById('sic-filter').value;
+    const postcode = document.getElementById('postcode-filter').value;
+    const yearFilter = document.getElementById('year-filter').value;
+    const limit = parseInt(document.getElementById('limit').value) || 300;
+    
+    const searchBtn = document.getElementById('search-btn');
+    searchBtn.disabled = true;
+    searchBtn.innerHTML = '<span class="loading-spinner"></span> Searching...';
+    
+    try {
+        const response = await fetch('/api/filter', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ sic, postcode, year: yearFilter, limit })
+        });
+        
+        const data = await response.json();
+        
+        if (data.error) {
+            showToast(data.error, 'error');
+            return;
+        }
+        
+        setCompanies(data.companies.map(c => ({
+            ...c,
+            phones: c.phones || [],
+            emails: c.emails || [],
+            directors: c.directors || []
+        })));
+        enrichedCount = 0;
+        totalDirectors = 0;
+        totalDomains = 0;
+        totalEmails = 0;
+        totalPhones = 0;
+        
+        renderResults();
+        updateStats();
+        
+        document.getElementById('stats-bar').style.display = 'flex';
+        document.getElementById('empty-state').style.display = companies.length ? 'none' : 'block';
+        document.getElementById('enrich-btn').disabled = !companies.length;
+        document.getElementById('domain-btn').disabled = !companies.length;
+        document.getElementById('email-free-btn').disabled = !companies.length;
+        document.getElementById('email-btn').disabled = !companies.length;
+        document.getElementById('verify-btn').disabled = true;  // Enable only after finding emails
+        document.getElementById('export-btn').disabled = !companies.length;
+        document.getElementById('export-clean-btn').disabled = !companies.length;
+        
+        showToast(`Found ${companies.length} companies`, 'success');
+        
+    } catch (error) {
+        showToast('Error searching companies: ' + error.message, 'error');
+    } finally {
+        searchBtn.disabled = false;
+        searchBtn.innerHTML = `
+            <svg width="18" height="18" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M21 21l-6-6m2-5a7 7 0 11-14 0 7 7 0 0114 0z"/>
+            </svg>
+            Search Companies`;
+    }
+}
+
+function renderRow(company, index) {
+    return `
+    <tr>
+        <td>
+            <input type="checkbox" class="company-checkbox" data-index="${index}" checked>
+        </td>
+        <td>
+            <div class="company-name">${escapeHtml(company.company_name)}</div>
+            <div class="company-number">${company.company_number}</div>
+        </td>
+        <td>
+            <div>${escapeHtml(company.address_line1)}</div>
+            <div style="color: var(--text-dim); font-size: 0.9rem;">
+                ${escapeHtml(company.town)} ${escapeHtml(company.postcode)}
+            </div>
+        </td>
+        <td>
+            <span class="sic-badge">${company.sic_code}</span>
+        </td>
+        <td>
+            <span class="${company.status === 'Active' ? 'status-active' : 'status-inactive'}">
+                ${escapeHtml(company.status)}
+            </span>
+        </td>
+        <td class="website-cell" id="website-${index}">
+            ${company.domain ? 
+                `<a href="https://${escapeHtml(company.domain)}" target="_blank" class="website-link">${escapeHtml(company.domain)}</a>
+                 <span class="domain-source ${company.domain_source === 'inferred' ? 'source-free' : 'source-verified'}">${company.domain_source === 'hunter' ? '💰' : '✓'}</span>` : 
+                '<span style="color: var(--text-dim);">—</span>'
+            }
+        </td>
+        <td class="phone-cell" id="phone-${index}">
+            ${company.phones && company.phones.length ? 
+                `<a href="tel:${escapeHtml(company.phones[0].phone)}" class="phone-link">${escapeHtml(company.phones[0].phone)}</a>
+                 <div class="phone-source">${company.phones[0].source === 'hunter' ? '💰' : '🌐'}</div>` : 
+                '<span style="color: var(--text-dim);">—</span>'
+            }
+        </td>
+        <td class="directors-cell" id="directors-${index}">
+            ${company.directors.length ? 
+                company.directors.map(d => `
+                    <div class="director-item">${escapeHtml(d.name)}</div>
+                `).join('') : 
+                '<span style="color: var(--text-dim);">—</span>'
+            }
+        </td>
+        <td class="emails-cell" id="emails-${index}">
+            ${company.emails && company.emails.length ? 
+                company.emails.map(e => `
+                    <div class="email-item">
+                        <a href="mailto:${escapeHtml(e.email)}" class="email-link">${escapeHtml(e.email)}</a>
+                        <div class="email-meta">
+                            <span class="email-source ${getSourceClass(e.source)}">${getSourceLabel(e.source)}</span>
+                            ${e.verified ? `<span class="verification-badge ${getVerificationClass(e.verification_status)}">${getVerificationLabel(e.verification_status, e.verification_score)}</span>` : ''}
+                            ${e.match_type ? `<span class="email-match-type">${e.match_type === 'company' ? '✓ Company' : e.match_type === 'auditor' ? '📊 Auditor' : e.match_type === 'agent' ? '📝 Agent' : '❓ Other'}</span>` : ''}
+                            ${e.confidence ? `<span class="email-confidence">${e.confidence}%</span>` : ''}
+                        </div>
+                    </div>
+                `).join('') : 
+                '<span style="color: var(--text-dim);">—</span>'
+            }
+        </td>
+    </tr>
+    `;
+}
+
+function renderResults(changedIndices) {
+    const tbody = document.getElementById('results-body');
+    
+    // Enrichment passes the rows it touched - only those are rebuilt (keeping their
+    // checkbox state) rather than re-rendering a result set of up to 5000 rows per batch
+    if (changedIndices && tbody.rows.length === companies.length) {
+        const template = document.createElement('template');
+        changedIndices.forEach(index => {
+            const row = tbody.rows[index];
+            template.innerHTML = renderRow(companies[index], index);
+            const freshRow = template.content.firstElementChild;
+            freshRow.querySelector('.company-checkbox').checked = row.querySelector('.company-checkbox').checked;
+            row.replaceWith(freshRow);
+        });
+        return;
+    }
+    
+    tbody.innerHTML = companies.map(renderRow).join('');
+}
+
+async function enrichSelected() {
+    const checkboxes = document.querySelectorAll('.company-checkbox:checked');
+    const selectedIndices = Array.from(checkboxes).map(cb => parseInt(cb.dataset.index));
+    
+    if (selectedIndices.length === 0) {
+        showToast('Please select companies to enrich', 'error');
+        return;
+    }
+    
+    const enrichBtn = document.getElementById('enrich-btn');
+    enrichBtn.disabled = true;
+    enrichBtn.innerHTML = '<span class="loading-spinner"></span> Enriching...';
+    
+    const progressBar = document.getElementById('progress-bar');
+    const progressFill = document.getElementById('progress-fill');
+    progressBar.style.display = 'block';
+    
+    // Show processing status
+    showProcessing('Fetching Directors', selectedIndices.length);
+    
+    const companyNumbers = selectedIndices.map(i => companies[i].company_number);
+    const batchSize = 50;
+    let processed = 0;
+    
+    try {
+        for (let i = 0; i < companyNumbers.length; i += batchSize) {
+            const batch = companyNumbers.slice(i, i + batchSize);
+            const currentCompany = companies[findCompanyIndex(batch[0])];
+            
+            // Update status before request
+            updateProcessing(processed, companyNumbers.length, 
+                currentCompany ? currentCompany.company_name.substring(0, 25) + '...' : 'Batch ' + (i/batchSize + 1),
+                totalDirectors);
+            
+            const response = await fetch('/api/enrich', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ company_numbers: batch })
+            });
+            
+            const data = await response.json();
+            
+            // Update companies with director data
+            const changed = new Set();
+            data.enriched.forEach(enriched => {
+                const companyIndex = findCompanyIndex(enriched.company_number);
+                if (companyIndex !== -1 && enriched.directors.length > 0) {
+                    companies[companyIndex].directors = enriched.directors;
+                    changed.add(companyIndex);
+                    enrichedCount++;
+                    totalDirectors += enriched.directors.length;
+                }
+            });
+            
+            processed += batch.length;
+            progressFill.style.transform = `scaleX(${processed / companyNumbers.length})`;
+            updateProcessing(processed, companyNumbers.length, 'Processing results...', totalDirectors);
+            
+            renderResults(changed);
+            updateStats();
+        }
+        
+        showToast(`Found ${totalDirectors} directors for ${enrichedCount} companies`, 'success');
+        
+    } catch (error) {
+        showToast('Error enriching companies: ' + error.message, 'error');
+    } finally {
+        hideProcessing();
+        enrichBtn.disabled = false;
+        enrichBtn.innerHTML = `
+            <svg width="18" height="18" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M17 20h5v-2a3 3 0 00-5.356-1.857M17 20H7m10 0v-2c0-.656-.126-1.283-.356-1.857M7 20H2v-2a3 3 0 015.356-1.857M7 20v-2c0-.656.126-1.283.356-1.857m0 0a5.002 5.002 0 019.288 0M15 7a3 3 0 11-6 0 3 3 0 016 0z"/>
+            </svg>
+            Enrich Directors`;
+        
+        setTimeout(() => {
+            progressBar.style.display = 'none';
+            progressFill.style.transform = 'scaleX(0)';
+        }, 1000);
+    }
+}
+
+async function enrichDomains(useHunter = false) {
+    const checkboxes = document.querySelectorAll('.company-checkbox:checked');
+    const selectedIndices = Array.from(checkboxes).map(cb => parseInt(cb.dataset.index));
+    
+    if (selectedIndices.length === 0) {
+        showToast('Please select companies to find websites for', 'error');
+        return;
+    }
+    
+    const domainBtn = document.getElementById('domain-btn');
+    domainBtn.disabled = true;
+    const methodText = useHunter ? 'Finding (with Hunter.io)...' : 'Finding (Free)...';
+    domainBtn.innerHTML = `<span class="loading-spinner"></span> ${methodText}`;
+    
+    const progressBar = document.getElementById('progress-bar');
+    const progressFill = document.getElementById('progress-fill');
+    progressBar.style.display = 'block';
+    
+    const selectedCompanies = selectedIndices.map(i => companies[i]);
+    const batchSize = useHunter ? 50 : 100;  // Can do more with free method
+    let processed = 0;
+    let freeFound = 0;
+    let hunterFound = 0;
+    
+    try {
+        for (let i = 0; i < selectedCompanies.length; i += batchSize) {
+            const batch = selectedCompanies.slice(i, i + batchSize);
+            
+            // Only the fields the endpoint reads - not each row's directors/emails
+            const payload = batch.map(c => ({
+                company_name: c.company_name,
+                company_number: c.company_number
+            }));
+            
+            const response = await fetch('/api/enrich-domains', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ companies: payload, use_hunter: useHunter })
+            });
+            
+            const data = await response.json();
+            freeFound += data.free_found || 0;
+            hunterFound += data.hunter_found || 0;
+            
+            // Update companies with domain data
+            const changed = new Set();
+            data.enriched.forEach(enriched => {
+                const companyIndex = findCompanyIndex(enriched.company_number);
+                if (companyIndex !== -1 && enriched.domain) {
+                    companies[companyIndex].domain = enriched.domain;
+                    companies[companyIndex].domain_source = enriched.source;
+                    changed.add(companyIndex);
+                    totalDomains++;
+                }
+            });
+            
+            processed += batch.length;
+            progressFill.style.transform = `scaleX(${processed / selectedCompanies.length})`;
+            
+            renderResults(changed);
+            updateStats();
+        }
+        
+        let message = `Found ${totalDomains} websites`;
+        if (freeFound > 0) message += ` (${freeFound} free)`;
+        if (hunterFound > 0) message += ` (${hunterFound} via Hunter)`;
+        showToast(message, 'success');
+        
+    } catch (error) {
+        showToast('Error finding websites: ' + error.message, 'error');
+    } finally {
+        domainBtn.disabled = false;
+        domainBtn.innerHTML = `
+            <svg width="18" height="18" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M21 12a9 9 0 01-9 9m9-9a9 9 0 00-9-9m9 9H3m9 9a9 9 0 01-9-9m9 9c1.657 0 3-4.03 3-9s-1.343-9-3-9m0 18c-1.657 0-3-4.03-3-9s1.343-9 3-9m-9 9a9 9 0 019-9"/>
+            </svg>
+            Find Websites (Free)`;
+        
+        setTimeout(() => {
+            progressBar.style.display = 'none';
+            progressFill.style.transform = 'scaleX(0)';
+        }, 1000);
+    }
+}
+
+async function enrichEmailsFree() {
+    const checkboxes = document.querySelectorAll('.company-checkbox:checked');
+    const selectedIndices = Array.from(checkboxes).map(cb => parseInt(cb.dataset.index));
+    
+    if (selectedIndices.length === 0) {
+        showToast('Please select companies to find emails for', 'error');
+        return;
+    }
+    
+    const emailFreeBtn = document.getElementById('email-free-btn');
+    emailFreeBtn.disabled = true;
+    emailFreeBtn.innerHTML = '<span class="loading-spinner"></span> Finding Emails...';
+    
+    const progressBar = document.getElementById('progress-bar');
+    const progressFill = document.getElementById('progress-fill');
+    progressBar.style.display = 'block';
+    
+    // Show processing status
+    showProcessing('Finding Emails (Free)', selectedIndices.length);
+    
+    const selectedCompanies = selectedIndices.map(i => companies[i]);
+    const batchSize = 20;  // Smaller batches for more frequent updates
+    let processed = 0;
+    let companyEmails = 0;
+    let otherEmails = 0;
+    let emailsFound = 0;
+    
+    try {
+        for (let i = 0; i < selectedCompanies.length; i += batchSize) {
+            const batch = selectedCompanies.slice(i, i + batchSize);
+            const currentCompany = batch[0];
+            
+            // Update status before request
+            updateProcessing(processed, selectedCompanies.length, 
+                currentCompany ? currentCompany.company_name.substring(0, 25) + '...' : 'Processing...',
+                emailsFound);
+            
+            // Only the fields the endpoint reads - not each row's directors/emails
+            const payload = batch.map(c => ({
+                company_name: c.company_name,
+                company_number: c.company_number,
+                domain: c.domain || ''
+            }));
+            
+            const response = await fetch('/api/enrich-emails-free', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ companies: payload })
+            });
+            
+            const data = await response.json();
+            companyEmails += data.company_emails || 0;
+            otherEmails += data.other_emails || 0;
+            emailsFound += data.emails_found || 0;
+            
+            // Update companies with email AND phone data
+            const changed = new Set();
+            data.enriched.forEach(enriched => {
+                const companyIndex = findCompanyIndex(enriched.company_number);
+                if (companyIndex !== -1) {
+                    changed.add(companyIndex);
+                    // Handle emails
+                    if (enriched.emails && enriched.emails.length > 0) {
+                        // Replace inferred emails with real Hunter ones
+                        if (enriched.replaces_inferred) {
+                            const realEmails = (companies[companyIndex].emails || []).filter(
+                                e => e.source !== 'inferred'
+                            );
+                            companies[companyIndex].emails = [...realEmails, ...enriched.emails];
+                        } else {
+                            if (!companies[companyIndex].emails) {
+                                companies[companyIndex].emails = [];
+                            }
+                            companies[companyIndex].emails = [...companies[companyIndex].emails, ...enriched.emails];
+                        }
+                    }
+                    
+                    // Handle phones
+                    if (enriched.phones && enriched.phones.length > 0) {
+                        if (!companies[companyIndex].phones) {
+                            companies[companyIndex].phones = [];
+                        }
+                        companies[companyIndex].phones = [...companies[companyIndex].phones, ...enriched.phones];
+                    }
+                }
+            });
+            
+            totalEmails = companies.reduce((sum, c) => sum + (c.emails?.length || 0), 0);
+            totalPhones = companies.reduce((sum, c) => sum + (c.phones?.length || 0), 0);
+            
+            processed += batch.length;
+            progressFill.style.transform = `scaleX(${processed / selectedCompanies.length})`;
+            updateProcessing(processed, selectedCompanies.length, 'Processing results...', totalEmails);
+            
+            renderResults(changed);
+            updateStats();
+        }
+        
+        let message = `Found ${totalEmails} emails`;
+        showToast(message, 'success');
+        
+        // Enable verify button if we found emails
+        if (totalEmails > 0) {
+            document.getElementById('verify-btn').disabled = false;
+        }
+        
+    } catch (error) {
+        showToast('Error finding emails: ' + error.message, 'error');
+    } finally {
+        hideProcessing();
+        emailFreeBtn.disabled = false;
+        emailFreeBtn.innerHTML = `
+            <svg width="18" height="18" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M3 8l7.89 5.26a2 2 0 002.22 0L21 8M5 19h14a2 2 0 002-2V7a2 2 0 00-2-2H5a2 2 0 00-2 2v10a2 2 0 002 2z"/>
+            </svg>
+            Find Emails (Free)`;
+        
+        setTimeout(() => {
+            progressBar.style.display = 'none';
+            progressFill.style.transform = 'scaleX(0)';
+        }, 1000);
+    }
+}
+
+async function enrichEmails() {
+    const checkboxes = document.querySelectorAll('.company-checkbox:checked');
+    const selectedIndices = Array.from(checkboxes).map(cb => parseInt(cb.dataset.index));
+    
+    if (selectedIndices.length === 0) {
+        showToast('Please select companies first', 'error');
+        return;
+    }
+    
+    // Generic email prefixes - inboxes, not personal emails
+    const GENERIC_PREFIXES = [
+        'info@', 'office@', 'contact@', 'hello@', 'enquiries@', 'enquiry@',
+        'admin@', 'accounts@', 'finance@', 'sales@', 'support@', 'help@',
+        'mail@', 'email@', 'general@', 'reception@', 'team@', 'company@'
+    ];
+    
+    function isPersonalEmail(email) {
+        if (!email) return false;
+        const emailLower = email.toLowerCase();
+        // Check if generic
+        for (const prefix of GENERIC_PREFIXES) {
+            if (emailLower.startsWith(prefix)) return false;
+        }
+        // Check for firstname.lastname pattern
+        const localPart = emailLower.split('@')[0];
+        if (localPart.includes('.') && localPart.length > 3) return true;
+        if (/^[a-z]+$/.test(localPart) && localPart.length > 2) return true;
+        return false;
+    }
+    
+    // Filter to companies that need Hunter (only have generic emails or no emails)
+    const companiesNeedingHunter = selectedIndices.filter(i => {
+        const emails = companies[i].emails || [];
+        const hasPersonalEmails = emails.some(e => 
+            (e.source === 'website_scrape' || e.source === 'website_mailto' || e.source === 'imported')
+            && isPersonalEmail(e.email)
+        );
+        return !hasPersonalEmails;  // Include if no PERSONAL emails (generic ok)
+    });
+    
+    if (companiesNeedingHunter.length === 0) {
+        showToast('All selected companies already have personal emails - no Hunter needed!', 'success');
+        return;
+    }
+    
+    const skippedCount = selectedIndices.length - companiesNeedingHunter.length;
+    
+    const emailBtn = document.getElementById('email-btn');
+    emailBtn.disabled = true;
+    emailBtn.innerHTML = '<span class="loading-spinner"></span> Hunter Lookup...';
+    
+    const selectedCompanies = companiesNeedingHunter.map(i => companies[i]);
+    const batchSize = 10;  // Smaller batches for better real-time updates
+    let processed = 0;
+    let hunterFound = 0;
+    
+    // Show processing panel
+    showProcessing('🔍 Hunter Email Lookup', selectedCompanies.length);
+    
+    try {
+        for (let i = 0; i < selectedCompanies.length; i += batchSize) {
+            const batch = selectedCompanies.slice(i, i + batchSize);
+            const currentCompany = batch[0]?.company_name || 'Processing...';
+            
+            // Update processing panel
+            updateProcessing(processed, selectedCompanies.length, currentCompany, hunterFound);
+            
+            const response = await fetch('/api/enrich-emails', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ companies: batch })
+            });
+            
+            const data = await response.json();
+            hunterFound += data.emails_found || 0;
+            
+            // Update companies - replace inferred emails with Hunter ones
+            const changed = new Set();
+            data.enriched.forEach(enriched => {
+                const companyIndex = findCompanyIndex(enriched.company_number);
+                if (companyIndex !== -1 && enriched.emails && enriched.emails.length > 0) {
+                    companies[companyIndex].emails = enriched.emails;
+                    changed.add(companyIndex);
+                }
+            });
+            
+            processed += batch.length;
+            updateProcessing(processed, selectedCompanies.length, currentCompany, hunterFound);
+            
+            renderResults(changed);
+            totalEmails = companies.reduce((sum, c) => sum + (c.emails?.length || 0), 0);
+            updateStats();
+        }
+        
+        let msg = `Hunter found ${hunterFound} emails`;
+        if (skippedCount > 0) msg += ` (${skippedCount} skipped - already have real emails)`;
+        showToast(msg, 'success');
+        
+        // Enable verify button if we have emails
+        if (totalEmails > 0) {
+            document.getElementById('verify-btn').disabled = false;
+        }
+        
+    } catch (error) {
+        showToast('Error with Hunter: ' + error.message, 'error');
+    } finally {
+        emailBtn.disabled = false;
+        emailBtn.innerHTML = `
+            <svg width="18" height="18" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M3 8l7.89 5.26a2 2 0 002.22 0L21 8M5 19h14a2 2 0 002-2V7a2 2 0 00-2-2H5a2 2 0 00-2 2v10a2 2 0 002 2z"/>
+            </svg>
+            Enrich Emails (Hunter 💰)`;
+        
+        setTimeout(() => hideProcessing(), 1500);
+    }
+}
+
+async function verifyEmails() {
+    const checkboxes = document.querySelectorAll('.company-checkbox:checked');
+    const selectedIndices = Array.from(checkboxes).map(cb => parseInt(cb.dataset.index));
+    
+    if (selectedIndices.length === 0) {
+        showToast('Please select companies first', 'error');
+        return;
+    }
+    
+    // Collect all emails from selected companies
+    const emailsToVerify = [];
+    selectedIndices.forEach(i => {
+        const company = companies[i];
+        if (company.emails && company.emails.length > 0) {
+            company.emails.forEach(emailData => {
+                // Skip already verified emails
+                if (!emailData.verified) {
+                    emailsToVerify.push({
+                        email: emailData.email,
+                        company_number: company.company_number,
+                        company_name: company.company_name,
+                        first_name: emailData.first_name || '',
+                        last_name: emailData.last_name || ''
+                    });
+                }
+            });
+        }
+    });
+    
+    if (emailsToVerify.length === 0) {
+        showToast('No unverified emails found. Find emails first!', 'error');
+        return;
+    }
+    
+    const verifyBtn = document.getElementById('verify-btn');
+    verifyBtn.disabled = true;
+    verifyBtn.innerHTML = '<span class="loading-spinner"></span> Verifying...';
+    
+    const progressBar = document.getElementById('progress-bar');
+    const progressFill = document.getElementById('progress-fill');
+    progressBar.style.display = 'block';
+    
+    // Show processing status
+    showProcessing('Verifying Emails (Hunter)', emailsToVerify.length);
+    
+    const batchSize = 20;  // Smaller batches for more updates
+    let processed = 0;
+    let validCount = 0;
+    let invalidCount = 0;
+    let riskyCount = 0;
+    
+    try {
+        for (let i = 0; i < emailsToVerify.length; i += batchSize) {
+            const batch = emailsToVerify.slice(i, i + batchSize);
+            const currentEmail = batch[0];
+            
+            // Update status
+            updateProcessing(processed, emailsToVerify.length, 
+                currentEmail ? currentEmail.email.substring(0, 25) + '...' : 'Verifying...',
+                validCount);
+            
+            const response = await fetch('/api/verify-emails', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ emails: batch })
+            });
+            
+            const data = await response.json();
+            validCount += data.valid_count || 0;
+            invalidCount += data.invalid_count || 0;
+            riskyCount += data.risky_count || 0;
+            
+            // Update emails with verification status
+            const changed = new Set();
+            data.results.forEach(result => {
+                const companyIndex = findCompanyIndex(result.company_number);
+                if (companyIndex !== -1) {
+                    const emailIndex = companies[companyIndex].emails.findIndex(e => e.email === result.email);
+                    if (emailIndex !== -1) {
+                        companies[companyIndex].emails[emailIndex].verified = true;
+                        companies[companyIndex].emails[emailIndex].verification_status = result.status;
+                        companies[companyIndex].emails[emailIndex].verification_score = result.score;
+                        changed.add(companyIndex);
+                    }
+                }
+            });
+            
+            processed += batch.length;
+            progressFill.style.transform = `scaleX(${processed / emailsToVerify.length})`;
+            
+            renderResults(changed);
+        }
+        
+        showToast(`Verified ${processed} emails: ✅ ${validCount} valid, ❌ ${invalidCount} invalid, ⚠️ ${riskyCount} risky`, 'success');
+        
+    } catch (error) {
+        showToast('Error verifying emails: ' + error.message, 'error');
+    } finally {
+        hideProcessing();
+        verifyBtn.disabled = false;
+        verifyBtn.innerHTML = `
+            <svg width="18" height="18" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"/>
+            </svg>
+            Verify Emails (Hunter 💰)`;
+        
+        setTimeout(() => {
+            progressBar.style.display = 'none';
+            progressFill.style.transform = 'scaleX(0)';
+        }, 1000);
+    }
+}
+
+async function exportData() {
+    const checkboxes = document.querySelectorAll('.company-checkbox:checked');
+    const selectedIndices = Array.from(checkboxes).map(cb => parseInt(cb.dataset.index));
+    const selectedCompanies = selectedIndices.map(i => companies[i]);
+    
+    if (selectedCompanies.length === 0) {
+        showToast('Please select companies to export', 'error');
+        return;
+    }
+    
+    const exportBtn = document.getElementById('export-btn');
+    exportBtn.disabled = true;
+    exportBtn.innerHTML = '<span class="loading-spinner"></span> Exporting...';
+    
+    try {
+        const sic = document.getElementById('sic-filter').value;
+        const postcode = document.getElementById('postcode-filter').value || 'all';
+        const filename = `enriched_${sic}_${postcode}_${Date.now()}.csv`;
+        
+        const response = await fetch('/api/export', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ companies: selectedCompanies, filename })
+        });
+        
+        const data = await response.json();
+        
+        if (data.success) {
+            showToast(`Exported ${data.count} companies to ${filename}`, 'success');
+        } else {
+            showToast('Export failed', 'error');
+        }
+        
+    } catch (error) {
+        showToast('Error exporting: ' + error.message, 'error');
+    } finally {
+        exportBtn.disabled = false;
+        exportBtn.innerHTML = `
+            <svg width="18" height="18" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16v1a3 3 0 003 3h10a3 3 0 003-3v-1m-4-4l-4 4m0 0l-4-4m4 4V4"/>
+            </svg>
+            Export Full CSV`;
+    }
+}
+
+async function exportCleanData() {
+    const checkboxes = document.querySelectorAll('.company-checkbox:checked');
+    const selectedIndices = Array.from(checkboxes).map(cb => parseInt(cb.dataset.index));
+    const selectedCompanies = selectedIndices.map(i => companies[i]);
+    
+    if (selectedCompanies.length === 0) {
+        showToast('Please select companies to export', 'error');
+        return;
+    }
+    
+    const exportBtn = document.getElementById('export-clean-btn');
+    exportBtn.disabled = true;
+    exportBtn.innerHTML = '<span class="loading-spinner"></span> Exporting...';
+    
+    try {
+        const filename = `clean_emails_${Date.now()}.csv`;
+        
+        const response = await fetch('/api/export-clean', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ companies: selectedCompanies, filename })
+        });
+        
+        const data = await response.json();
+        
+        if (data.success) {
+            let msg = `Exported ${data.total_emails} clean emails to ${filename}`;
+            if (data.skipped_invalid > 0) {
+                msg += ` (${data.skipped_invalid} invalid skipped)`;
+            }
+            showToast(msg, 'success');
+        } else {
+            showToast('Export failed', 'error');
+        }
+        
+    } catch (error) {
+        showToast('Error exporting: ' + error.message, 'error');
+    } finally {
+        exportBtn.disabled = false;
+        exportBtn.innerHTML = `
+            <svg width="18" height="18" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"/>
+            </svg>
+            Export Clean Emails`;
+    }
+}
+
+function toggleSelectAll() {
+    const selectAll = document.getElementById('select-all').checked;
+    document.querySelectorAll('.company-checkbox').forEach(cb => cb.checked = selectAll);
+}
+
+// Stats bar counters, looked up once - updateStats runs after every enrichment batch
+const statEls = {
+    total: document.getElementById('stat-total'),
+    directors: document.getElementById('stat-directors'),
+    domains: document.getElementById('stat-domains'),
+    phones: document.getElementById('stat-phones'),
+    emails: document.getElementById('stat-emails'),
+    valid: document.getElementById('stat-valid'),
+    invalid: document.getElementById('stat-invalid'),
+    risky: document.getElementById('stat-risky')
+};
+
+function updateStats() {
+    // Calculate email verification stats
+    let validCount = 0;
+    let invalidCount = 0;
+    let riskyCount = 0;
+    let totalEmailCount = 0;
+    let totalPhoneCount = 0;
+    
+    companies.forEach(c => {
+        if (c.emails) {
+            c.emails.forEach(e => {
+                totalEmailCount++;
+                const status = (e.verification_status || '').toLowerCase();
+                if (status === 'valid') {
+                    validCount++;
+                } else if (status === 'invalid') {
+                    invalidCount++;
+                } else if (status === 'accept_all' || status === 'webmail' || status === 'unknown') {
+                    riskyCount++;
+                }
+            });
+        }
+        if (c.phones) {
+            totalPhoneCount += c.phones.length;
+        }
+    });
+    
+    statEls.total.textContent = companies.length.toLocaleString();
+    statEls.directors.textContent = totalDirectors.toLocaleString();
+    statEls.domains.textContent = totalDomains.toLocaleString();
+    statEls.phones.textContent = totalPhoneCount.toLocaleString();
+    statEls.emails.textContent = totalEmailCount.toLocaleString();
+    statEls.valid.textContent = validCount.toLocaleString();
+    statEls.invalid.textContent = invalidCount.toLocaleString();
+    statEls.risky.textContent = riskyCount.toLocaleString();
+}
+
+const toast = document.getElementById('toast');
+const toastMessage = document.getElementById('toast-message');
+
+function showToast(message, type = 'success') {
+    // Drop the show class, then re-add it two frames later so the slide-in replays.
+    // Reading offsetWidth here instead would force a synchronous layout of the whole
+    // page (results table included) on every toast
+    toast.className = `toast ${type}`;
+    toastMessage.textContent = message;
+    requestAnimationFrame(() => requestAnimationFrame(() => toast.classList.add('show')));
+    
+    // Clear any existing timeout
+    if (toast.hideTimeout) clearTimeout(toast.hideTimeout);
+    toast.hideTimeout = setTimeout(() => {
+        toast.classList.remove('show');
+    }, 4000);
+}
+
+// Processing status helpers - the panel's elements are static (the script runs after
+// them), so they are looked up once rather than on every progress update
+const processingPanel = {
+    panel: document.getElementById('processing-status'),
+    title: document.getElementById('processing-title'),
+    progress: document.getElementById('processing-progress'),
+    current: document.getElementById('processing-current'),
+    found: document.getElementById('processing-found'),
+    fill: document.getElementById('processing-fill')
+};
+
+function showProcessing(title, total = 0) {
+    processingPanel.title.textContent = title;
+    processingPanel.progress.textContent = `0 / ${total}`;
+    processingPanel.current.textContent = 'Starting...';
+    processingPanel.found.textContent = '0';
+    processingPanel.fill.style.transform = 'scaleX(0)';
+    processingPanel.panel.classList.add('show');
+}
+
+function updateProcessing(current, total, currentItem = '', found = 0) {
+    processingPanel.progress.textContent = `${current} / ${total}`;
+    processingPanel.current.textContent = currentItem || `Processing ${current}...`;
+    processingPanel.found.textContent = String(found);
+    const fraction = total > 0 ? current / total : 0;
+    processingPanel.fill.style.transform = `scaleX(${fraction})`;
+}
+
+function hideProcessing() {
+    processingPanel.panel.classList.remove('show');
+}
+
+// Plain string escaping - no throwaway DOM node per value, and quotes are escaped
+// too, since values are also interpolated into href="..." attributes
+const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+
+function escapeHtml(text) {
+    if (!text) return '';
+    return String(text).replace(/[&<>"']/g, ch => HTML_ESCAPES[ch]);
+}
+
+// Built once - getSourceLabel runs for every email of every rendered row
+const SOURCE_LABELS = Object.freeze({
+    'email_finder': '💰 Hunter',
+    'domain_search': '💰 Hunter',
+    'website_scrape': '🌐 Website',
+    'website_mailto': '🌐 Website',
+    'hunter': '💰 Hunter',
+    'imported': '📥 Imported'
+});
+
+function getSourceLabel(source) {
+    if (!source) return '';
+    return SOURCE_LABELS[source.toLowerCase()] || source;
+}
+
+function getSourceClass(source) {
+    if (!source) return 'source-other';
+    const s = source.toLowerCase();
+    if (s.includes('website')) return 'source-website';
+    if (s.includes('hunter') || s === 'email_finder' || s === 'domain_search') return 'source-hunter';
+    if (s.includes('ch_') || s.includes('companies')) return 'source-ch';
+    if (s.includes('imported')) return 'source-imported';
+    return 'source-other';
+}
+
+function getVerificationClass(status) {
+    if (!status) return 'verification-unknown';
+    const s = status.toLowerCase();
+    if (s === 'valid') return 'verification-valid';
+    if (s === 'invalid') return 'verification-invalid';
+    if (s === 'accept_all' || s === 'webmail' || s === 'unknown') return 'verification-risky';
+    return 'verification-unknown';
+}
+
+function getVerificationLabel(status, score) {
+    if (!status) return '❓ Unknown';
+    const s = status.toLowerCase();
+    const scoreText = score ? ` ${score}%` : '';
+    if (s === 'valid') return `✅ Valid${scoreText}`;
+    if (s === 'invalid') return '❌ Invalid';
+    if (s === 'accept_all') return `⚠️ Accept-All${scoreText}`;
+    if (s === 'webmail') return `📧 Webmail${scoreText}`;
+    if (s === 'unknown') return `❓ Unknown${scoreText}`;
+    return `❓ ${status}${scoreText}`;
+}
@@ -0,0 +1,156 @@
+"""Tests for the company search helpers in database"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+
+
+class TempDbTestCase(unittest.TestCase):
+    """Points database.DB_PATH at a fresh file in a temporary directory"""
+    
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.dir.name, 'test.db')
+        patcher = mock.patch.object(database, 'DB_PATH', self.db_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.dir.cleanup)
+        self.addCleanup(database.close_thread_db)
+
+
+class EmptySicFilterTest(TempDbTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        
+        database.init_db()
+        with database.get_db() as conn:
+            conn.executemany(
+                "INSERT INTO companies (company_number, company_name, company_status, sic_code_1) "
+                "VALUES (?, ?, 'Active', ?)",
+                [('00000001', 'ALPHA LTD', '69201'), ('00000002', 'BETA LTD', '70229'),
+                 ('00000003', 'GAMMA LTD', None)]
+            )
+            conn.commit()
+    
+    def test_blank_sic_code_adds_no_filter(self):
+        everything = database.count_companies()['total']
+        self.assertEqual(database.count_companies(sic_codes=[''])['total'], everything)
+        self.assertEqual(database.count_companies(sic_codes='')['total'], everything)
+        self.assertEqual(len(database.search_companies(sic_codes=[''])), everything)
+    
+    def test_blank_sic_code_is_ignored_next_to_real_ones(self):
+        self.assertEqual(database.count_companies(sic_codes=['', '692'])['total'], 1)
+        self.assertEqual(len(database.search_companies(sic_codes=['', '692'])), 1)
+
+
+class SchemaVersionTest(TempDbTestCase):
+    
+    def test_only_a_migrated_database_is_current(self):
+        sqlite3.connect(self.db_path).close()  # A database from before the version stamp
+        self.assertFalse(database.schema_is_current())
+        
+        database.init_db()
+        self.assertTrue(database.schema_is_current())
+
+
+class DbStatsTest(TempDbTestCase):
+    
+    def test_enrichment_breakdown_comes_from_companies_stats(self):
+        database.init_db()
+        with database.get_db() as conn:
+            conn.executemany(
+                "INSERT INTO companies (company_number, company_name, enrichment_status) VALUES (?, ?, ?)",
+                [('00000001', 'ALPHA LTD', 'success'), ('00000002', 'BETA LTD', None),
+                 ('00000003', 'GAMMA LTD', 'success')]
+            )
+            conn.execute("UPDATE companies SET enrichment_status = 'failed' WHERE company_number = '00000003'")
+            conn.commit()
+        
+        stats = database.get_db_stats()
+        self.assertEqual(stats['total_companies'], 3)
+        self.assertEqual(stats['enrichment_breakdown'], {'success': 1, 'failed': 1, None: 1})
+
+
+class EmailStorageTest(TempDbTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        
+        database.init_db()
+        with database.get_db() as conn:
+            conn.execute("INSERT INTO companies (company_number, company_name) VALUES ('00000001', 'ALPHA LTD')")
+            conn.commit()
+            self.company_id = conn.execute('SELECT id FROM companies').fetchone()[0]
+    
+    def stored_emails(self):
+        with database.get_db() as conn:
+            return [row[0] for row in conn.execute('SELECT email FROM emails ORDER BY id')]
+    
+    def test_emails_are_stored_lowercased_and_trimmed(self):
+        database.add_emails(self.company_id, '00000001', [
+            {'email': ' Jane.Doe@Example.COM ', 'source': 'hunter'},
+            {'email': 'jane.doe@example.com', 'source': 'website_scrape'},  # Same address
+        ])
+        self.assertEqual(self.stored_emails(), ['jane.doe@example.com'])
+
+
+class LegacyEmailMigrationTest(TempDbTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        
+        # An emails table as created before email_norm, with addresses differing only by case
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript('''
+            CREATE TABLE emails (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                company_id INTEGER NOT NULL,
+                company_number TEXT NOT NULL,
+                director_id INTEGER,
+                email TEXT NOT NULL,
+                source TEXT NOT NULL,
+                source_label TEXT,
+                match_type TEXT,
+                confidence INTEGER,
+                verified INTEGER DEFAULT 0,
+                verification_status TEXT,
+                verification_score INTEGER,
+                verified_at TIMESTAMP,
+                first_name TEXT,
+                last_name TEXT,
+                position TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE UNIQUE INDEX idx_emails_unique ON emails(company_number, email);
+            INSERT INTO emails (company_id, company_number, email, source) VALUES
+                (1, '00000001', 'Info@x.com', 'hunter'),
+                (1, '00000001', 'info@x.com', 'website_scrape'),
+                (1, '00000001', ' bob@x.com', 'hunter'),
+                (2, '00000002', 'info@x.com', 'hunter');
+        ''')
+        conn.commit()
+        conn.close()
+    
+    def stored_emails(self):
+        with database.get_db() as conn:
+            return [tuple(row) for row in conn.execute('SELECT id, company_number, email FROM emails ORDER BY id')]
+    
+    def test_init_db_merges_case_duplicates_and_normalises(self):
+        database.init_db()
+        expected = [(1, '00000001', 'info@x.com'), (3, '00000001', 'bob@x.com'), (4, '00000002', 'info@x.com')]
+        self.assertEqual(self.stored_emails(), expected)
+        
+        database.init_db()  # Already migrated - a second run changes nothing
+        self.assertEqual(self.stored_emails(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
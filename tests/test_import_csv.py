@@ -0,0 +1,131 @@
+"""Tests for the --workers CSV span splitting in import_csv"""
+
+import contextlib
+import csv
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from import_csv import (
+    CSV_COLUMNS, extract_year_from_date, insert_batch, parse_csv_batches, parse_csv_parallel,
+    parse_csv_span, read_csv_batches, record_spans
+)
+
+
+def company(i):
+    """One CSV record; every third name is a quoted multi-line field with escaped quotes"""
+    name = f'CO {i}\nMULTI, "LINE" LTD' if i % 3 == 0 else f'COMPANY {i} LTD'
+    return [f'{i:08d}' if column == 'CompanyNumber' else name if column == 'CompanyName'
+            else '01/02/2003' if column == 'IncorporationDate'
+            else '69201 - Accounting' if column == 'SICCode.SicText_1' else ''
+            for column in CSV_COLUMNS]
+
+
+# One record the database refuses, standing in for any per-row failure
+REJECT_COMPANY_TRIGGER = '''
+    CREATE TRIGGER reject_company BEFORE INSERT ON companies
+    WHEN NEW.company_number = '00000015'
+    BEGIN SELECT RAISE(ABORT, 'rejected'); END
+'''
+
+
+class ExtractYearTest(unittest.TestCase):
+    
+    def test_only_ascii_years_are_parsed(self):
+        self.assertEqual(extract_year_from_date('01/02/2003'), 2003)
+        self.assertIsNone(extract_year_from_date('01/02/²'))
+        self.assertIsNone(extract_year_from_date(''))
+
+
+class RecordSpansTest(unittest.TestCase):
+    
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows(company(i) for i in range(1, 41))
+        with open(self.path, newline='') as f:
+            reader = csv.reader(f)
+            self.header = next(reader)
+            self.expected = next(parse_csv_batches(reader, self.header, 'test.csv', batch_size=1000))[3]
+    
+    def tearDown(self):
+        os.remove(self.path)
+    
+    def test_spans_match_serial_parse_at_every_boundary(self):
+        # Every span size puts boundaries in different places, including inside multi-line names
+        for span_bytes in range(1, 400):
+            rows = []
+            for start, end in record_spans(self.path, span_bytes):
+                rows += parse_csv_span(self.path, start, end, self.header, 'test.csv')[3]
+            self.assertEqual(rows, self.expected, f'span_bytes={span_bytes}')
+    
+    def test_fast_parse_matches_serial_parse(self):
+        # A truncated record between the multi-line names, and a blank line
+        with open(self.path, 'a', newline='') as f:
+            f.write('00000099,CUT OFF LTD,1 HIGH ST\r\n\r\n')
+            csv.writer(f).writerows(company(i) for i in range(41, 47))
+        with open(self.path, newline='') as f:
+            reader = csv.reader(f)
+            expected = next(parse_csv_batches(reader, next(reader), 'test.csv', batch_size=1000))[3]
+        
+        fast = list(read_csv_batches(self.path, self.header, 'test.csv', chunksize=7))
+        # pandas skips the blank line; the truncated record is the one error
+        self.assertEqual((sum(batch[0] for batch in fast), sum(batch[1] for batch in fast)), (47, 1))
+        self.assertEqual([row[:2] for batch in fast for row in batch[3]], [row[:2] for row in expected])
+        self.assertEqual(len(expected), 46)
+    
+    def test_parallel_parse_matches_serial_parse(self):
+        rows = []
+        for _, _, _, batch in parse_csv_parallel(self.path, self.header, 'test.csv',
+                                                 workers=2, span_bytes=97):
+            rows += batch
+        self.assertEqual(rows, self.expected)
+        self.assertEqual(len(rows), 40)
+
+
+class InsertBatchErrorTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        db_path = os.path.join(self.dir.name, 'test.db')
+        with mock.patch.object(database, 'DB_PATH', db_path), contextlib.redirect_stdout(io.StringIO()):
+            database.init_db()
+        
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self.addCleanup(self.conn.close)
+        self.conn.execute(REJECT_COMPANY_TRIGGER)
+        self.cursor = self.conn.cursor()
+    
+    def rows(self, numbers, renamed=()):
+        records = [company(i) for i in numbers]
+        for i, record in zip(numbers, records):
+            if i in renamed:
+                record[CSV_COLUMNS.index('CompanyName')] = f'RENAMED {i} LTD'
+        return next(parse_csv_batches(records, CSV_COLUMNS, 'test.csv', batch_size=1000))[3]
+    
+    def test_bad_row_only_loses_itself(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = insert_batch(self.cursor, self.rows(range(1, 11)))
+            second = insert_batch(self.cursor, self.rows([*range(11, 21), 3, 4], renamed={3}))
+        
+        self.assertEqual(first, (10, 0, 0))
+        # 9 new, company 3 renamed, company 4 unchanged; the rejected record is not counted as inserted
+        self.assertEqual(second, (9, 1, 1))
+        self.assertEqual(self.conn.execute('SELECT COUNT(*) FROM companies').fetchone()[0], 19)
+        self.assertEqual(self.conn.execute(
+            "SELECT company_name FROM companies WHERE company_number = '00000003'"
+        ).fetchone()[0], 'RENAMED 3 LTD')
+
+
+if __name__ == '__main__':
+    unittest.main()
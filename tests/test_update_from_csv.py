@@ -0,0 +1,128 @@
+"""Tests for the monthly update's --workers path in update_from_csv"""
+
+import contextlib
+import csv
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(TESTS_DIR), TESTS_DIR]
+
+import database
+import import_csv
+import update_from_csv
+from test_import_csv import REJECT_COMPANY_TRIGGER, company
+
+
+def write_csv(path, numbers, renamed=()):
+    """Companies House-style CSV; companies in `renamed` get a changed (multi-line) name"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(import_csv.CSV_COLUMNS)
+        for i in numbers:
+            row = company(i)
+            if i in renamed:
+                row[import_csv.CSV_COLUMNS.index('CompanyName')] = f'RENAMED {i}\n"NEW" LTD'
+            writer.writerow(row)
+
+
+class UpdateWorkersTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.initial = os.path.join(self.dir.name, 'initial.csv')
+        self.monthly = os.path.join(self.dir.name, 'monthly.csv')
+        write_csv(self.initial, range(1, 31))
+        write_csv(self.monthly, range(1, 41), renamed=range(2, 41, 4))
+    
+    def tearDown(self):
+        self.dir.cleanup()
+    
+    def run_update(self, db_name, **kwargs):
+        """Load the initial CSV into a fresh database, apply the monthly CSV and return its companies"""
+        db_path = os.path.join(self.dir.name, db_name)
+        with mock.patch.object(database, 'DB_PATH', db_path), \
+                mock.patch.object(update_from_csv, 'DB_PATH', db_path), \
+                contextlib.redirect_stdout(io.StringIO()):
+            database.init_db()
+            with open(self.initial, newline='') as f, database.get_db() as conn:
+                reader = csv.reader(f)
+                rows = next(import_csv.parse_csv_batches(reader, next(reader), 'initial.csv'))[3]
+                conn.executemany(update_from_csv.INSERT_COMPANY_SQL, rows)
+                conn.commit()
+            update_from_csv.update_from_csv(self.monthly, **kwargs)
+        
+        conn = sqlite3.connect(db_path)
+        try:
+            return conn.execute(
+                'SELECT company_number, company_name, csv_source FROM companies ORDER BY company_number'
+            ).fetchall()
+        finally:
+            conn.close()
+    
+    def test_workers_match_serial_update(self):
+        expected = self.run_update('serial.db')
+        self.assertEqual(len(expected), 40)
+        
+        # Small spans put boundaries inside the multi-line names
+        small_spans = lambda *args: import_csv.parse_csv_parallel(*args, span_bytes=150)
+        with mock.patch.object(update_from_csv, 'parse_csv_parallel', small_spans):
+            self.assertEqual(self.run_update('workers.db', workers=2), expected)
+    
+    def test_drop_indexes_recounts_companies_stats(self):
+        self.assertEqual(len(self.run_update('drop.db', drop_indexes=True)), 40)
+        conn = sqlite3.connect(os.path.join(self.dir.name, 'drop.db'))
+        try:
+            self.assertEqual(conn.execute(database.COUNT_COMPANIES_SQL).fetchone()[0], 40)
+            triggers = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0]
+            self.assertEqual(triggers, len(database.COMPANIES_STATS_TRIGGERS))
+        finally:
+            conn.close()
+
+
+def company_row(i, name=None):
+    """A parsed company_row tuple as update_batch receives it"""
+    return (f'{i:08d}', name or f'COMPANY {i} LTD', '', '', '', '', 'SW1A 1AA', 'Active',
+            '01/02/2003', 2003, '69201', None, None, None, 'monthly.csv')
+
+
+class UpdateBatchErrorTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        db_path = os.path.join(self.dir.name, 'test.db')
+        with mock.patch.object(database, 'DB_PATH', db_path), contextlib.redirect_stdout(io.StringIO()):
+            database.init_db()
+        
+        self.conn = sqlite3.connect(db_path, isolation_level='IMMEDIATE')
+        self.addCleanup(self.conn.close)
+        self.conn.execute(REJECT_COMPANY_TRIGGER)
+        self.cursor = self.conn.cursor()
+    
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM companies').fetchone()[0]
+    
+    def test_bad_row_only_loses_itself(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = update_from_csv.update_batch(self.cursor, [company_row(i) for i in range(1, 11)])
+            second = update_from_csv.update_batch(
+                self.cursor, [company_row(i) for i in range(11, 21)] + [company_row(3, 'RENAMED LTD')]
+            )
+        self.conn.commit()
+        
+        self.assertEqual(first, (10, 0, 0))
+        self.assertEqual(second, (9, 1, 0))
+        self.assertEqual(self.count(), 19)
+        self.assertEqual(self.conn.execute(
+            "SELECT company_name FROM companies WHERE company_number = '00000003'"
+        ).fetchone()[0], 'RENAMED LTD')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,75 +13,86 @@ Usage:
     python update_from_csv.py /path/to/new/companies_house.csv
     python update_from_csv.py --dry-run /path/to/new/companies_house.csv  # Preview changes
     python update_from_csv.py --sic 69201,69203 /path/to/file.csv         # Filter by SIC
+    python update_from_csv.py --fast /path/to/file.csv                    # Parse with pandas (C parser)
+    python update_from_csv.py --workers 4 /path/to/file.csv               # Parse in 4 processes, write in this one
+    python update_from_csv.py --drop-indexes /path/to/file.csv            # Rebuild indexes once at the end
 """
 
 import csv
+import json
 import os
+import sqlite3
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
 
-from database import init_db, get_db, DB_PATH
+from database import (
+    init_db, get_db, DB_PATH, COUNT_COMPANIES_SQL, INSERT_COMPANY_SQL, create_company_indexes,
+    drop_company_indexes, create_companies_stats_triggers, drop_companies_stats_triggers,
+    rebuild_companies_stats
+)
+# Rows are parsed exactly as the initial import parses them, into company_row tuples
+from import_csv import column_positions, parse_csv_batches, parse_csv_parallel, read_csv_batches
 
 BATCH_SIZE = 10000
+COMMIT_INTERVAL = 1.0  # Seconds between commits - releases the write lock so app writes get a turn
+PROGRESS_INTERVAL = 2.0  # Seconds between progress lines
+READ_BUFFER_SIZE = 4 * 1024 * 1024  # Bytes per read() on the CSV instead of the 8 KiB default
 
+# WAL + relaxed fsync for the update run; unlike import_csv this keeps normal locking,
+# so the app can keep reading the database while the monthly update runs, and its writes
+# only wait for the current commit interval. The default wal_autocheckpoint keeps the WAL
+# small between the frequent commits
+UPDATE_PRAGMAS = '''
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -262144;
+    PRAGMA mmap_size = 268435456;
+'''
 
-def extract_year_from_date(date_str):
-    """Extract year from DD/MM/YYYY format"""
-    if not date_str or '/' not in date_str:
-        return None
-    try:
-        parts = date_str.split('/')
-        if len(parts) == 3:
-            return int(parts[2])
-    except (ValueError, IndexError):
-        pass
-    return None
-
-
-def extract_sic_code(sic_text):
-    """Extract just the numeric SIC code"""
-    if not sic_text:
-        return None
-    sic_text = sic_text.strip().strip('"')
-    if ' - ' in sic_text:
-        return sic_text.split(' - ')[0].strip()
-    return sic_text.strip()
+# Current basic fields for a whole batch at once (company numbers passed as a JSON array)
+SELECT_EXISTING_SQL = '''
+    SELECT company_number, company_name, postcode, company_status
+    FROM companies WHERE company_number IN (SELECT value FROM json_each(?))
+'''
 
+# Update only basic fields, preserve enrichment. Numbered parameters follow company_row
+# order, so the parsed tuple binds as-is (?1 is company_number, ?15 is csv_source)
+UPDATE_COMPANY_SQL = '''
+    UPDATE companies SET
+        company_name = ?2,
+        address_line1 = ?3,
+        address_line2 = ?4,
+        post_town = ?5,
+        county = ?6,
+        postcode = ?7,
+        company_status = ?8,
+        incorporation_date = ?9,
+        incorporation_year = ?10,
+        sic_code_1 = ?11,
+        sic_code_2 = ?12,
+        sic_code_3 = ?13,
+        sic_code_4 = ?14,
+        updated_at = CURRENT_TIMESTAMP,
+        csv_source = ?15,
+        csv_import_date = CURRENT_TIMESTAMP
+    WHERE company_number = ?1
+'''
 
-def parse_row(row):
-    """Parse a CSV row into a company data dict"""
-    company_number = row.get(' CompanyNumber', row.get('CompanyNumber', '')).strip().strip('"')
-    
-    if not company_number:
-        return None
-    
-    incorporation_date = row.get('IncorporationDate', '').strip().strip('"')
-    
-    return {
-        'company_number': company_number,
-        'company_name': row.get('CompanyName', '').strip().strip('"'),
-        'address_line1': row.get('RegAddress.AddressLine1', row.get(' RegAddress.AddressLine1', '')).strip().strip('"'),
-        'address_line2': row.get(' RegAddress.AddressLine2', row.get('RegAddress.AddressLine2', '')).strip().strip('"'),
-        'post_town': row.get('RegAddress.PostTown', '').strip().strip('"'),
-        'county': row.get('RegAddress.County', '').strip().strip('"'),
-        'postcode': row.get('RegAddress.PostCode', '').strip().strip('"'),
-        'company_status': row.get('CompanyStatus', '').strip().strip('"'),
-        'incorporation_date': incorporation_date,
-        'incorporation_year': extract_year_from_date(incorporation_date),
-        'sic_code_1': extract_sic_code(row.get('SICCode.SicText_1', '')),
-        'sic_code_2': extract_sic_code(row.get('SICCode.SicText_2', '')),
-        'sic_code_3': extract_sic_code(row.get('SICCode.SicText_3', '')),
-        'sic_code_4': extract_sic_code(row.get('SICCode.SicText_4', '')),
-    }
 
-
-def update_from_csv(csv_path, sic_filter=None, dry_run=False):
+def update_from_csv(csv_path, sic_filter=None, dry_run=False, fast=False, workers=1,
+                    drop_indexes=False):
     """
     Update database from a new Companies House CSV
     
     This preserves all enrichment data while updating basic company info.
+    fast=True parses the CSV with pandas (C parser) instead of the csv module.
+    workers > 1 parses in that many processes while this one writes to SQLite.
+    drop_indexes=True drops the secondary indexes and companies_stats triggers for the run
+    and rebuilds them once at the end - faster when most rows change, but app searches slow
+    down and dashboard counts lag meanwhile.
     """
     print(f"\n📅 Monthly CSV Update Tool")
     print(f"=" * 50)
@@ -90,6 +101,12 @@ def update_from_csv(csv_path, sic_filter=None, dry_run=False):
     print(f"Mode: {'DRY RUN (no changes)' if dry_run else 'LIVE UPDATE'}")
     if sic_filter:
         print(f"SIC Filter: {', '.join(sic_filter)}")
+    if fast:
+        print(f"Fast Mode: ON (pandas chunks of {BATCH_SIZE:,})")
+    elif workers > 1:
+        print(f"Parser Workers: {workers}")
+    if drop_indexes and not dry_run:
+        print(f"Drop Indexes: ON (rebuilt after the update)")
     print(f"=" * 50)
     
     if not os.path.exists(csv_path):
@@ -103,15 +120,19 @@ def update_from_csv(csv_path, sic_filter=None, dry_run=False):
     file_size = os.path.getsize(csv_path)
     print(f"📁 File size: {file_size / (1024**3):.2f} GB")
     
+    # Bring an older database up to the current schema (companies_stats, used for the
+    # counts below) - a schema migration only, so dry runs do it too
+    init_db()
+    
     # Get current database stats
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM companies')
+        cursor.execute(COUNT_COMPANIES_SQL)
         initial_count = cursor.fetchone()[0]
         print(f"📊 Current database records: {initial_count:,}")
     
     # Track changes
-    start_time = time.time()
+    start_time = last_print = time.monotonic()
     processed = 0
     new_companies = 0
     updated_companies = 0
@@ -123,75 +144,87 @@ def update_from_csv(csv_path, sic_filter=None, dry_run=False):
     csv_company_numbers = set()  # Track what's in the new CSV
     
     try:
-        with open(csv_path, 'r', encoding='utf-8', errors='ignore') as f:
-            reader = csv.DictReader(f)
+        with open(csv_path, 'r', encoding='utf-8', errors='ignore', buffering=READ_BUFFER_SIZE) as f:
+            # One front-to-back pass over a multi-GB file: ask the kernel for aggressive read-ahead
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            # Plain rows indexed by position - the header is resolved once, not per row
+            reader = csv.reader(f)
+            try:
+                header = next(reader)
+                column_positions(header)  # Fail early on an unexpected header
+            except (StopIteration, ValueError) as e:
+                print(f"❌ Unrecognised CSV header: {str(e) or 'file is empty'}")
+                sys.exit(1)
             
-            batch = []
+            if fast:
+                batches = read_csv_batches(csv_path, header, csv_source, sic_filter, chunksize=BATCH_SIZE)
+            elif workers > 1:
+                # Spans are parsed ahead in other processes, so parsing overlaps the writes below
+                batches = parse_csv_parallel(csv_path, header, csv_source, sic_filter, workers)
+            else:
+                batches = parse_csv_batches(reader, header, csv_source, sic_filter, batch_size=BATCH_SIZE)
             
             with get_db() as conn:
+                conn.executescript(UPDATE_PRAGMAS)
+                conn.isolation_level = 'IMMEDIATE'  # Each transaction takes the write lock up front
+                conn.row_factory = None  # Plain tuples - rows are only read by position here
                 cursor = conn.cursor()
+                last_commit = time.monotonic()
                 
-                for row in reader:
-                    processed += 1
-                    
-                    company = parse_row(row)
-                    if not company:
-                        errors += 1
-                        continue
-                    
-                    # Apply SIC filter if specified
-                    if sic_filter:
-                        sics = [company['sic_code_1'], company['sic_code_2'], 
-                                company['sic_code_3'], company['sic_code_4']]
-                        if not any(sic in sic_filter for sic in sics if sic):
-                            filtered_out += 1
-                            continue
+                try:
+                    if drop_indexes and not dry_run:
+                        drop_company_indexes(cursor)
+                        drop_companies_stats_triggers(cursor)
                     
-                    csv_company_numbers.add(company['company_number'])
-                    batch.append(company)
-                    
-                    if len(batch) >= BATCH_SIZE:
+                    for rows_read, batch_errors, batch_filtered, batch in batches:
+                        processed += rows_read
+                        errors += batch_errors
+                        filtered_out += batch_filtered
+                        csv_company_numbers.update(row[0] for row in batch)
+                        
                         if not dry_run:
-                            new, updated, same = update_batch(cursor, batch, csv_source)
-                            new_companies += new
-                            updated_companies += updated
-                            unchanged += same
-                            conn.commit()
+                            new, updated, same = update_batch(cursor, batch)
+                            if time.monotonic() - last_commit >= COMMIT_INTERVAL and conn.in_transaction:
+                                conn.commit()
+                                last_commit = time.monotonic()
                         else:
                             # In dry run, just count what would happen
                             new, updated, same = preview_batch(cursor, batch)
-                            new_companies += new
-                            updated_companies += updated
-                            unchanged += same
-                        
-                        batch = []
-                        
-                        # Progress update
-                        elapsed = time.time() - start_time
-                        rate = processed / elapsed if elapsed > 0 else 0
-                        print(f"\r⏳ Processed: {processed:,} | New: {new_companies:,} | "
-                              f"Updated: {updated_companies:,} | Unchanged: {unchanged:,} | "
-                              f"Rate: {rate:,.0f}/sec", end='')
-                
-                # Process remaining batch
-                if batch:
-                    if not dry_run:
-                        new, updated, same = update_batch(cursor, batch, csv_source)
                         new_companies += new
                         updated_companies += updated
                         unchanged += same
+                        
+                        # Progress update, at most once every PROGRESS_INTERVAL seconds
+                        now = time.monotonic()
+                        if now - last_print >= PROGRESS_INTERVAL:
+                            last_print = now
+                            elapsed = now - start_time
+                            rate = processed / elapsed if elapsed > 0 else 0
+                            print(f"\r⏳ Processed: {processed:,} | New: {new_companies:,} | "
+                                  f"Updated: {updated_companies:,} | Unchanged: {unchanged:,} | "
+                                  f"Rate: {rate:,.0f}/sec", end='')
+                finally:
+                    # Keep the batches written so far, including when interrupted
+                    if conn.in_transaction:
                         conn.commit()
-                    else:
-                        new, updated, same = preview_batch(cursor, batch)
-                        new_companies += new
-                        updated_companies += updated
-                        unchanged += same
+                    if drop_indexes and not dry_run:
+                        print(f"\n🔨 Rebuilding indexes...")
+                        create_company_indexes(cursor)
+                        cursor.execute('ANALYZE companies')
+                        create_companies_stats_triggers(cursor)
+                        rebuild_companies_stats(cursor)
+                        conn.commit()
+                    if not dry_run:
+                        # Fold the WAL back into the main database file so companies.db is
+                        # complete on its own when copied off the data volume
+                        cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
     
     except KeyboardInterrupt:
         print("\n\n⚠️  Update interrupted by user")
     
     # Final report
-    elapsed = time.time() - start_time
+    elapsed = time.monotonic() - start_time
     print(f"\n\n{'=' * 50}")
     print(f"{'✅ Update Complete!' if not dry_run else '🔍 Dry Run Complete'}")
     print(f"=" * 50)
@@ -208,7 +241,7 @@ def update_from_csv(csv_path, sic_filter=None, dry_run=False):
         # Check for companies in DB but not in new CSV
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM companies')
+            cursor.execute(COUNT_COMPANIES_SQL)
             final_count = cursor.fetchone()[0]
             print(f"\n📈 Database growth: {initial_count:,} → {final_count:,} ({final_count - initial_count:+,})")
     else:
@@ -216,119 +249,87 @@ def update_from_csv(csv_path, sic_filter=None, dry_run=False):
         print(f"   Run without --dry-run to apply these changes.")
 
 
-def update_batch(cursor, batch, csv_source):
-    """Update a batch of companies, preserving enrichment data"""
+def fetch_existing(cursor, batch):
+    """company_number -> (company_name, postcode, company_status) for the batch's known companies"""
+    numbers = json.dumps([row[0] for row in batch])
+    cursor.execute(SELECT_EXISTING_SQL, (numbers,))
+    return {row[0]: row[1:] for row in cursor.fetchall()}
+
+
+def update_batch(cursor, batch):
+    """Update a batch of company_row tuples, preserving enrichment data"""
     new = 0
     updated = 0
     unchanged = 0
     
-    for company in batch:
-        try:
-            # Check if company exists and what its current data is
-            cursor.execute('''
-                SELECT id, company_name, postcode, company_status 
-                FROM companies WHERE company_number = ?
-            ''', (company['company_number'],))
-            existing = cursor.fetchone()
+    existing = fetch_existing(cursor, batch)
+    insert_rows = []
+    update_rows = []
+    
+    for row in batch:
+        number = row[0]
+        basics = (row[1], row[6], row[7])  # company_name, postcode, company_status
+        
+        if number in existing:
+            # Check if anything actually changed
+            if existing[number] == basics:
+                unchanged += 1
+                continue
             
-            if existing:
-                # Check if anything actually changed
-                if (existing['company_name'] == company['company_name'] and
-                    existing['postcode'] == company['postcode'] and
-                    existing['company_status'] == company['company_status']):
-                    unchanged += 1
-                    continue
-                
-                # Update only basic fields, preserve enrichment
-                cursor.execute('''
-                    UPDATE companies SET
-                        company_name = ?,
-                        address_line1 = ?,
-                        address_line2 = ?,
-                        post_town = ?,
-                        county = ?,
-                        postcode = ?,
-                        company_status = ?,
-                        incorporation_date = ?,
-                        incorporation_year = ?,
-                        sic_code_1 = ?,
-                        sic_code_2 = ?,
-                        sic_code_3 = ?,
-                        sic_code_4 = ?,
-                        updated_at = CURRENT_TIMESTAMP,
-                        csv_source = ?,
-                        csv_import_date = CURRENT_TIMESTAMP
-                    WHERE company_number = ?
-                ''', (
-                    company['company_name'],
-                    company['address_line1'],
-                    company['address_line2'],
-                    company['post_town'],
-                    company['county'],
-                    company['postcode'],
-                    company['company_status'],
-                    company['incorporation_date'],
-                    company['incorporation_year'],
-                    company['sic_code_1'],
-                    company['sic_code_2'],
-                    company['sic_code_3'],
-                    company['sic_code_4'],
-                    csv_source,
-                    company['company_number']
-                ))
-                updated += 1
-            else:
-                # Insert new company
-                cursor.execute('''
-                    INSERT INTO companies (
-                        company_number, company_name,
-                        address_line1, address_line2, post_town, county, postcode,
-                        company_status, incorporation_date, incorporation_year,
-                        sic_code_1, sic_code_2, sic_code_3, sic_code_4,
-                        enrichment_status, csv_source, csv_import_date
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'not_attempted', ?, CURRENT_TIMESTAMP)
-                ''', (
-                    company['company_number'],
-                    company['company_name'],
-                    company['address_line1'],
-                    company['address_line2'],
-                    company['post_town'],
-                    company['county'],
-                    company['postcode'],
-                    company['company_status'],
-                    company['incorporation_date'],
-                    company['incorporation_year'],
-                    company['sic_code_1'],
-                    company['sic_code_2'],
-                    company['sic_code_3'],
-                    company['sic_code_4'],
-                    csv_source
-                ))
-                new += 1
-                
-        except Exception as e:
-            print(f"\n⚠️  Error updating {company['company_number']}: {e}")
+            update_rows.append(row)
+            updated += 1
+        else:
+            # Insert new company
+            insert_rows.append(row)
+            new += 1
+        
+        # A company repeated later in the batch compares against this row
+        existing[number] = basics
+    
+    # The savepoint nests inside the run's open transaction, so a failed batch can be
+    # undone without losing the batches written before it
+    if not cursor.connection.in_transaction:
+        cursor.execute('BEGIN IMMEDIATE')
+    cursor.execute('SAVEPOINT update_batch')
+    # Inserts first, so updates to a company first seen in this batch apply on top
+    try:
+        cursor.executemany(INSERT_COMPANY_SQL, insert_rows)
+        cursor.executemany(UPDATE_COMPANY_SQL, update_rows)
+    except sqlite3.Error:
+        # Re-run the batch row by row so one bad record doesn't lose the rest
+        cursor.execute('ROLLBACK TO update_batch')
+        new = write_rows(cursor, INSERT_COMPANY_SQL, insert_rows)
+        updated = write_rows(cursor, UPDATE_COMPANY_SQL, update_rows)
+    cursor.execute('RELEASE update_batch')
     
     return new, updated, unchanged
 
 
+def write_rows(cursor, sql, rows):
+    """Execute sql once per row, reporting and skipping failures; returns rows written"""
+    written = 0
+    for row in rows:
+        try:
+            cursor.execute(sql, row)
+            written += 1
+        except sqlite3.Error as e:
+            print(f"\n⚠️  Error updating {row[0]}: {e}")
+    return written
+
+
 def preview_batch(cursor, batch):
     """Preview what would happen (dry run)"""
     new = 0
     updated = 0
     unchanged = 0
     
-    for company in batch:
-        cursor.execute('''
-            SELECT company_name, postcode, company_status 
-            FROM companies WHERE company_number = ?
-        ''', (company['company_number'],))
-        existing = cursor.fetchone()
+    existing = fetch_existing(cursor, batch)
+    
+    for row in batch:
+        basics = existing.get(row[0])
         
-        if existing:
-            if (existing['company_name'] == company['company_name'] and
-                existing['postcode'] == company['postcode'] and
-                existing['company_status'] == company['company_status']):
+        if basics:
+            if basics == (row[1], row[6], row[7]):
                 unchanged += 1
             else:
                 updated += 1
@@ -347,6 +348,12 @@ def main():
                         help='Preview changes without applying them')
     parser.add_argument('--sic', type=str,
                         help='Comma-separated SIC codes to filter (e.g., 69201,69203)')
+    parser.add_argument('--fast', action='store_true',
+                        help='Parse the CSV with pandas in large chunks (requires pandas)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parse the CSV with this many processes (e.g., 4)')
+    parser.add_argument('--drop-indexes', action='store_true',
+                        help='Drop secondary indexes during the update and rebuild them at the end')
     
     args = parser.parse_args()
     
@@ -354,7 +361,8 @@ def main():
     if args.sic:
         sic_filter = [s.strip() for s in args.sic.split(',')]
     
-    update_from_csv(args.csv_path, sic_filter=sic_filter, dry_run=args.dry_run)
+    update_from_csv(args.csv_path, sic_filter=sic_filter, dry_run=args.dry_run,
+                    fast=args.fast, workers=args.workers, drop_indexes=args.drop_indexes)
 
 
 if __name__ == '__main__':